@@ -30,6 +30,7 @@ from .helpers import (
     entity_registry,
     issue_registry,
     recorder,
+    template,
 )
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.typing import ConfigType
@@ -220,7 +221,7 @@ def open_hass_ui(hass: core.HomeAssistant) -> None:
 
 
 async def load_registries(hass: core.HomeAssistant) -> None:
-    """Load the registries and cache the result of platform.uname().processor."""
+    """Load the registries and template bytecode and cache platform.uname()."""
     if DATA_REGISTRIES_LOADED in hass.data:
         return
     hass.data[DATA_REGISTRIES_LOADED] = None
@@ -235,12 +236,14 @@ async def load_registries(hass: core.HomeAssistant) -> None:
         """
         platform.uname().processor  # pylint: disable=expression-not-assigned
 
-    # Load the registries and cache the result of platform.uname().processor
+    # Load the registries and the template bytecode, and cache the result of
+    # platform.uname().processor
     await asyncio.gather(
         area_registry.async_load(hass),
         device_registry.async_load(hass),
         entity_registry.async_load(hass),
         issue_registry.async_load(hass),
+        template.async_load_bytecode_cache(hass),
         hass.async_add_executor_job(_cache_uname_processor),
     )
 
@@ -1,11 +1,11 @@
 """Allows the creation of a sensor that filters state property."""
 from __future__ import annotations
 
+import asyncio
 from collections import Counter, deque
 from copy import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from functools import partial
 import logging
 from numbers import Number
 import statistics
@@ -15,7 +15,7 @@ import voluptuous as vol
 
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.input_number import DOMAIN as INPUT_NUMBER_DOMAIN
-from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder import history
 from homeassistant.components.sensor import (
     ATTR_STATE_CLASS,
     DEVICE_CLASSES as SENSOR_DEVICE_CLASSES,
@@ -313,35 +313,27 @@ class SensorFilter(SensorEntity):
                     largest_window_time = val
 
             # Retrieve the largest window_size of each type
+            preloads = []
             if largest_window_items > 0:
-                filter_history = await get_instance(self.hass).async_add_executor_job(
-                    partial(
-                        history.get_last_state_changes,
+                preloads.append(
+                    history.async_preload_state_changes(
                         self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
+                        self._entity,
+                        datetime.fromtimestamp(0, tz=dt_util.UTC),
+                        limit=largest_window_items,
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
             if largest_window_time > timedelta(seconds=0):
                 start = dt_util.utcnow() - largest_window_time
-                filter_history = await get_instance(self.hass).async_add_executor_job(
-                    partial(
-                        history.state_changes_during_period,
-                        self.hass,
-                        start,
-                        entity_id=self._entity,
+                preloads.append(
+                    history.async_preload_state_changes(
+                        self.hass, self._entity, start, include_start_time_state=True
                     )
                 )
-                if self._entity in filter_history:
-                    history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
-                    )
+            for filter_history in await asyncio.gather(*preloads):
+                history_list.extend(
+                    [state for state in filter_history if state not in history_list]
+                )
 
             # Sort the window states
             history_list = sorted(history_list, key=lambda s: s.last_updated)
@@ -5,3 +5,7 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# Historical states are sent in messages of about this many bytes
+# as they are read from the database
+STREAM_MESSAGE_SIZE = 1024 * 1024
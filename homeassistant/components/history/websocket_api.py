@@ -6,7 +6,7 @@ from collections.abc import Callable, Iterable, MutableMapping
 from dataclasses import dataclass
 from datetime import datetime as dt
 import logging
-from typing import Any, cast
+from typing import Any
 
 import voluptuous as vol
 
@@ -35,10 +35,15 @@ from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.json import JSON_DUMP, json_bytes
 import homeassistant.util.dt as dt_util
 
-from .const import DOMAIN, EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    DOMAIN,
+    EVENT_COALESCE_TIME,
+    MAX_PENDING_HISTORY_STATES,
+    STREAM_MESSAGE_SIZE,
+)
 from .helpers import entities_may_have_state_changes_after
 from .models import HistoryConfig
 
@@ -74,25 +79,33 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
 ) -> str:
     """Fetch history significant_states and convert them to json in the executor."""
-    return JSON_DUMP(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                filters,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
+    fragments = [
+        fragment
+        for _, fragment, _ in history.stream_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            max_points=max_points,
         )
-    )
+    ]
+    return b"".join(
+        (
+            b'{"id":',
+            json_bytes(msg_id),
+            b',"type":"result","success":true,"result":{',
+            b",".join(fragments),
+            b"}}",
+        )
+    ).decode("utf-8")
 
 
 @websocket_api.websocket_command(
@@ -105,6 +118,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=2)),
     }
 )
 @websocket_api.async_response
@@ -165,6 +179,7 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            msg.get("max_points"),
         )
     )
 
@@ -206,6 +221,85 @@ def _async_send_response(
     connection.send_message(JSON_DUMP(empty_response))
 
 
+def _stream_message_json(
+    msg_id: int, fragments: list[bytes], start_time_ts: float, end_time_ts: float
+) -> str:
+    """Generate a history stream message from compressed states fragments."""
+    return b"".join(
+        (
+            b'{"id":',
+            json_bytes(msg_id),
+            b',"type":"event","event":{"states":{',
+            b",".join(fragments),
+            b'},"start_time":',
+            json_bytes(start_time_ts),
+            b',"end_time":',
+            json_bytes(end_time_ts),
+            b"}}",
+        )
+    ).decode("utf-8")
+
+
+def _stream_historical_states(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    max_points: int | None,
+) -> float:
+    """Fetch history significant_states and send them as they are read.
+
+    The states are sent in messages of about STREAM_MESSAGE_SIZE bytes
+    so the first states are sent before all states have been read, and
+    the states of all entities are never in memory at the same time.
+
+    Returns the last_updated timestamp of the newest state that was
+    sent, or 0 if no states were sent.
+    """
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    last_time = 0.0
+    fragments: list[bytes] = []
+    message_size = 0
+
+    def _send_fragments() -> None:
+        hass.loop.call_soon_threadsafe(
+            connection.send_message,
+            _stream_message_json(msg_id, fragments, start_time_ts, last_time),
+        )
+
+    for _, fragment, state_last_time in history.stream_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        max_points=max_points,
+    ):
+        if state_last_time > last_time:
+            last_time = state_last_time
+        fragments.append(fragment)
+        message_size += len(fragment)
+        if message_size >= STREAM_MESSAGE_SIZE:
+            _send_fragments()
+            fragments = []
+            message_size = 0
+
+    if fragments:
+        _send_fragments()
+    return last_time
+
+
 async def _async_send_historical_states(
     hass: HomeAssistant,
     connection: ActiveConnection,
@@ -218,46 +312,34 @@ async def _async_send_historical_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
     send_empty: bool,
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
-    states = cast(
-        MutableMapping[str, list[dict[str, Any]]],
-        await get_instance(hass).async_add_executor_job(
-            history.get_significant_states,
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            filters,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    last_time = await get_instance(hass).async_add_executor_job(
+        _stream_historical_states,
+        hass,
+        connection,
+        msg_id,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        max_points,
     )
-    last_time = 0
+    if last_time != 0:
+        return dt_util.utc_from_timestamp(last_time)
 
-    for state_list in states.values():
-        if (
-            state_list
-            and (state_last_time := state_list[-1][COMPRESSED_STATE_LAST_UPDATED])
-            > last_time
-        ):
-            last_time = state_last_time
-
-    if last_time == 0:
-        # If we did not send any states ever, we need to send an empty response
-        # so the websocket client knows it should render/process/consume the
-        # data.
-        if not send_empty:
-            return None
-        last_time_dt = end_time
-    else:
-        last_time_dt = dt_util.utc_from_timestamp(last_time)
-    _async_send_response(connection, msg_id, start_time, last_time_dt, states)
-    return last_time_dt if last_time != 0 else None
+    # If we did not send any states ever, we need to send an empty response
+    # so the websocket client knows it should render/process/consume the
+    # data.
+    if send_empty:
+        _async_send_response(connection, msg_id, start_time, end_time, {})
+    return None
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
@@ -384,6 +466,7 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=2)),
     }
 )
 @websocket_api.async_response
@@ -426,6 +509,7 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    max_points: int | None = msg.get("max_points")
 
     if end_time and end_time <= utc_now:
         if (
@@ -452,6 +536,7 @@ async def ws_stream(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            max_points,
             True,
         )
         return
@@ -518,6 +603,7 @@ async def ws_stream(
         significant_changes_only,
         minimal_response,
         no_attributes,
+        max_points,
         True,
     )
 
@@ -560,5 +646,6 @@ async def ws_stream(
         significant_changes_only,
         minimal_response,
         no_attributes,
+        max_points,
         send_empty=not last_event_time,
     )
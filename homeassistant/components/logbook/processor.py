@@ -1,15 +1,19 @@
 """Event parser and human readable log generator."""
 from __future__ import annotations
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterable
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime as dt
+from itertools import islice
 from typing import Any
 
 from sqlalchemy.engine.row import Row
-from sqlalchemy.orm.query import Query
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import CompoundSelect
 
+from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     process_datetime_to_timestamp,
@@ -58,6 +62,11 @@ from .models import EventAsRow, LazyEventPartialState, async_event_to_row
 from .queries import statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
+# Number of rows that are humanified at once when streaming events
+STREAM_CHUNK_SIZE = 1024
+# Number of context origins that are kept when streaming events
+STREAM_CONTEXT_LOOKUP_SIZE = 4096
+
 
 @dataclass
 class LogbookRun:
@@ -132,14 +141,13 @@ class EventProcessor:
         end_day: dt,
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
-
-        def yield_rows(query: Query) -> Generator[Row, None, None]:
-            """Yield rows from the database."""
+        with session_scope(hass=self.hass) as session:
+            result = session.execute(self._events_stmt(session, start_day, end_day))
             # end_day - start_day intentionally checks .days and not .total_seconds()
             # since we don't want to switch over to buffered if they go
             # over one day by a few hours since the UI makes it so easy to do that.
             if self.limited_select or (end_day - start_day).days <= 1:
-                return query.all()  # type: ignore[no-any-return]
+                return self.humanify(result.all())
             # Only buffer rows to reduce memory pressure
             # if we expect the result set is going to be very large.
             # What is considered very large is going to differ
@@ -149,22 +157,76 @@ class EventProcessor:
             # even and RPi3 that number seems higher in testing
             # so we don't switch over until we request > 1 day+ of data.
             #
-            return query.yield_per(1024)  # type: ignore[no-any-return]
+            return self.humanify(result.yield_per(1024))
+
+    def iter_events(
+        self,
+        start_day: dt,
+        end_day: dt,
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        """Get events for a period of time in chunks.
+
+        The rows are read from the database STREAM_CHUNK_SIZE rows at a time and
+        the events of each chunk are yielded as soon as they have been humanified.
 
-        stmt = statement_for_request(
+        Only the most recent context origins and none of the cached events
+        are kept between chunks, so memory use does not grow with the size
+        of the period. Context origins are almost always close in time to
+        the rows that refer to them.
+        """
+        logbook_run = self.logbook_run
+        with session_scope(hass=self.hass) as session:
+            result = session.execute(self._events_stmt(session, start_day, end_day))
+            for rows in result.yield_per(STREAM_CHUNK_SIZE).partitions():
+                yield self.humanify(rows)
+                logbook_run.event_cache.clear()
+                logbook_run.context_lookup.evict_oldest(STREAM_CONTEXT_LOOKUP_SIZE)
+
+    def _events_stmt(
+        self, session: Session, start_day: dt, end_day: dt
+    ) -> StatementLambdaElement | CompoundSelect:
+        """Return the statement to select the rows for a period of time.
+
+        Until the background migration of the event_types or states_meta
+        table is done, the rows are selected by the event_type or entity_id
+        strings since not all rows have their ids yet.
+        """
+        instance = get_instance(self.hass)
+        legacy_event_types = not instance.event_type_manager.active
+        legacy_entity_ids = not instance.states_meta_manager.active
+        event_type_ids: tuple[int, ...] | tuple[str, ...] = self.event_types
+        if not legacy_event_types:
+            event_type_ids = tuple(
+                event_type_id
+                for event_type_id in instance.event_type_manager.get_many(
+                    self.event_types, session
+                ).values()
+                if event_type_id is not None
+            )
+        states_metadata_ids: list[int] | list[str] | None = self.entity_ids
+        if self.entity_ids and not legacy_entity_ids:
+            states_metadata_ids = [
+                metadata_id
+                for metadata_id in instance.states_meta_manager.get_many(
+                    self.entity_ids, session
+                ).values()
+                if metadata_id is not None
+            ]
+        return statement_for_request(
             start_day,
             end_day,
-            self.event_types,
+            event_type_ids,
             self.entity_ids,
+            states_metadata_ids,
             self.device_ids,
             self.filters,
             self.context_id,
+            legacy_event_types,
+            legacy_entity_ids,
         )
-        with session_scope(hass=self.hass) as session:
-            return self.humanify(yield_rows(session.execute(stmt)))
 
     def humanify(
-        self, row_generator: Generator[Row | EventAsRow, None, None]
+        self, row_generator: Iterable[Row | EventAsRow]
     ) -> list[dict[str, str]]:
         """Humanify rows."""
         return list(
@@ -178,7 +240,7 @@ class EventProcessor:
 
 
 def _humanify(
-    rows: Generator[Row | EventAsRow, None, None],
+    rows: Iterable[Row | EventAsRow],
     ent_reg: er.EntityRegistry,
     logbook_run: LogbookRun,
     context_augmenter: ContextAugmenter,
@@ -276,6 +338,14 @@ class ContextLookup:
         self._lookup.clear()
         self._memorize_new = False
 
+    def evict_oldest(self, max_size: int) -> None:
+        """Forget the oldest context origins until at most max_size are left."""
+        if (excess := len(self._lookup) - max_size) <= 0:
+            return
+        for context_id in list(islice(self._lookup, excess)):
+            del self._lookup[context_id]
+        self._lookup.setdefault(None, None)
+
     def get(self, context_id: str) -> Row | None:
         """Get the context origin."""
         return self._lookup.get(context_id)
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from datetime import datetime as dt
 
+from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import CompoundSelect
 
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.helpers.json import json_dumps
@@ -18,27 +20,41 @@ from .entities_and_devices import entities_devices_stmt
 def statement_for_request(
     start_day_dt: dt,
     end_day_dt: dt,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
     entity_ids: list[str] | None = None,
+    states_metadata_ids: list[int] | list[str] | None = None,
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
-) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
+) -> StatementLambdaElement | CompoundSelect:
+    """Generate the logbook statement for a logbook request.
+
+    While the event_types or states_meta tables are being migrated,
+    legacy_event_types or legacy_entity_ids is set and the event_type
+    or entity_id strings are passed instead of their ids.
+    """
     start_day = dt_util.utc_to_timestamp(start_day_dt)
     end_day = dt_util.utc_to_timestamp(end_day_dt)
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids and not device_ids:
-        states_entity_filter = filters.states_entity_filter() if filters else None
+        states_entity_filter: ClauseList | None = None
+        if filters and legacy_entity_ids:
+            states_entity_filter = filters.states_entity_filter()
+        elif filters:
+            states_entity_filter = filters.states_metadata_entity_filter()
         events_entity_filter = filters.events_entity_filter() if filters else None
         return all_stmt(
             start_day,
             end_day,
-            event_types,
+            event_type_ids,
             states_entity_filter,
             events_entity_filter,
             context_id,
+            legacy_event_types,
+            legacy_entity_ids,
         )
 
     # sqlalchemy caches object quoting, the
@@ -48,26 +64,32 @@ def statement_for_request(
 
     # entities and devices: logbook sends everything for the timeframe for the entities and devices
     if entity_ids and device_ids:
+        assert states_metadata_ids is not None
         json_quoted_entity_ids = [json_dumps(entity_id) for entity_id in entity_ids]
         json_quoted_device_ids = [json_dumps(device_id) for device_id in device_ids]
         return entities_devices_stmt(
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
             json_quoted_device_ids,
+            legacy_event_types,
+            legacy_entity_ids,
         )
 
     # entities: logbook sends everything for the timeframe for the entities
     if entity_ids:
+        assert states_metadata_ids is not None
         json_quoted_entity_ids = [json_dumps(entity_id) for entity_id in entity_ids]
         return entities_stmt(
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
+            legacy_event_types,
+            legacy_entity_ids,
         )
 
     # devices: logbook sends everything for the timeframe for the devices
@@ -76,6 +98,8 @@ def statement_for_request(
     return devices_stmt(
         start_day,
         end_day,
-        event_types,
+        event_type_ids,
         json_quoted_device_ids,
+        legacy_event_types,
+        legacy_entity_ids,
     )
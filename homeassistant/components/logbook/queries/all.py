@@ -5,6 +5,7 @@ from sqlalchemy import lambda_stmt
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.selectable import CompoundSelect
 
 from homeassistant.components.recorder.db_schema import (
     LAST_UPDATED_INDEX_TS,
@@ -23,14 +24,27 @@ from .common import (
 def all_stmt(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
     states_entity_filter: ClauseList | None = None,
     events_entity_filter: ClauseList | None = None,
     context_id: str | None = None,
-) -> StatementLambdaElement:
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
+) -> StatementLambdaElement | CompoundSelect:
     """Generate a logbook query for all entities."""
+    if legacy_event_types or legacy_entity_ids:
+        return _all_select_during_migration(
+            start_day,
+            end_day,
+            event_type_ids,
+            states_entity_filter,
+            events_entity_filter,
+            context_id,
+            legacy_event_types,
+            legacy_entity_ids,
+        )
     stmt = lambda_stmt(
-        lambda: select_events_without_states(start_day, end_day, event_types)
+        lambda: select_events_without_states(start_day, end_day, event_type_ids)
     )
     if context_id is not None:
         # Once all the old `state_changed` events
@@ -55,8 +69,58 @@ def all_stmt(
     return stmt
 
 
-def _states_query_for_all(start_day: float, end_day: float) -> Query:
-    return apply_states_filters(_apply_all_hints(select_states()), start_day, end_day)
+def _all_select_during_migration(
+    start_day: float,
+    end_day: float,
+    event_types: tuple[int, ...] | tuple[str, ...],
+    states_entity_filter: ClauseList | None,
+    events_entity_filter: ClauseList | None,
+    context_id: str | None,
+    legacy_event_types: bool,
+    legacy_entity_ids: bool,
+) -> CompoundSelect:
+    """Generate a logbook query for all entities while the ids are migrated.
+
+    The query is not a lambda_stmt since the lookup tables are only
+    migrated once and caching it is not worth the extra lambdas.
+    """
+    query = select_events_without_states(
+        start_day, end_day, event_types, legacy_event_types
+    )
+    if context_id is not None:
+        return (
+            query.where(Events.context_id == context_id)
+            .union_all(
+                _states_query_for_context_id(
+                    start_day, end_day, context_id, legacy_entity_ids
+                ),
+                legacy_select_events_context_id(
+                    start_day,
+                    end_day,
+                    context_id,
+                    legacy_event_types,
+                    legacy_entity_ids,
+                ),
+            )
+            .order_by(Events.time_fired_ts)
+        )
+    if events_entity_filter is not None:
+        query = query.where(events_entity_filter)
+    states_query = _states_query_for_all(start_day, end_day, legacy_entity_ids)
+    if states_entity_filter is not None:
+        states_query = states_query.where(states_entity_filter)
+    return query.union_all(states_query).order_by(Events.time_fired_ts)
+
+
+def _states_query_for_all(
+    start_day: float, end_day: float, legacy_entity_ids: bool = False
+) -> Query:
+    return apply_states_filters(
+        _apply_all_hints(select_states(legacy_entity_ids)),
+        start_day,
+        end_day,
+        legacy_entity_ids,
+    )
 
 
 def _apply_all_hints(query: Query) -> Query:
@@ -67,8 +131,8 @@ def _apply_all_hints(query: Query) -> Query:
 
 
 def _states_query_for_context_id(
-    start_day: float, end_day: float, context_id: str
+    start_day: float, end_day: float, context_id: str, legacy_entity_ids: bool = False
 ) -> Query:
-    return apply_states_filters(select_states(), start_day, end_day).where(
-        States.context_id == context_id
-    )
+    return apply_states_filters(
+        select_states(legacy_entity_ids), start_day, end_day, legacy_entity_ids
+    ).where(States.context_id == context_id)
@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import Final
 
 import sqlalchemy
-from sqlalchemy import select
+from sqlalchemy import Column, select
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.expression import literal
@@ -18,8 +18,10 @@ from homeassistant.components.recorder.db_schema import (
     STATES_CONTEXT_ID_INDEX,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.filters import like_domain_matchers
 
@@ -44,6 +46,18 @@ PSEUDO_EVENT_STATE_CHANGED: Final = None
 # in the payload
 
 EVENT_COLUMNS = (
+    Events.event_id.label("event_id"),
+    EventTypes.event_type.label("event_type"),
+    Events.event_data.label("event_data"),
+    Events.time_fired_ts.label("time_fired_ts"),
+    Events.context_id.label("context_id"),
+    Events.context_user_id.label("context_user_id"),
+    Events.context_parent_id.label("context_parent_id"),
+)
+
+# While the event_types table is being migrated the
+# event_type is read from the events table instead
+LEGACY_EVENT_COLUMNS = (
     Events.event_id.label("event_id"),
     Events.event_type.label("event_type"),
     Events.event_data.label("event_data"),
@@ -54,6 +68,16 @@ EVENT_COLUMNS = (
 )
 
 STATE_COLUMNS = (
+    States.state_id.label("state_id"),
+    States.state.label("state"),
+    StatesMeta.entity_id.label("entity_id"),
+    SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
+    OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
+)
+
+# While the states_meta table is being migrated the
+# entity_id is read from the states table instead
+LEGACY_STATE_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
     States.entity_id.label("entity_id"),
@@ -62,6 +86,14 @@ STATE_COLUMNS = (
 )
 
 STATE_CONTEXT_ONLY_COLUMNS = (
+    States.state_id.label("state_id"),
+    States.state.label("state"),
+    StatesMeta.entity_id.label("entity_id"),
+    literal(value=None, type_=sqlalchemy.String).label("icon"),
+    literal(value=None, type_=sqlalchemy.String).label("old_format_icon"),
+)
+
+LEGACY_STATE_CONTEXT_ONLY_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
     States.entity_id.label("entity_id"),
@@ -101,6 +133,12 @@ EVENT_ROWS_NO_STATES = (
     *EMPTY_STATE_COLUMNS,
 )
 
+LEGACY_EVENT_ROWS_NO_STATES = (
+    *LEGACY_EVENT_COLUMNS,
+    EventData.shared_data.label("shared_data"),
+    *EMPTY_STATE_COLUMNS,
+)
+
 # Virtual column to tell logbook if it should avoid processing
 # the event as its only used to link contexts
 CONTEXT_ONLY = literal("1").label("context_only")
@@ -110,76 +148,103 @@ NOT_CONTEXT_ONLY = literal(None).label("context_only")
 def select_events_context_id_subquery(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    legacy_event_types: bool = False,
 ) -> Select:
     """Generate the select for a context_id subquery."""
     return (
         select(Events.context_id)
         .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
-        .where(Events.event_type.in_(event_types))
+        .where(_event_type_matcher(event_type_ids, legacy_event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
 
 
-def select_events_context_only() -> Select:
+def select_events_context_only(legacy_event_types: bool = False) -> Select:
     """Generate an events query that mark them as for context_only.
 
     By marking them as context_only we know they are only for
     linking context ids and we can avoid processing them.
     """
+    if legacy_event_types:
+        return select(*LEGACY_EVENT_ROWS_NO_STATES, CONTEXT_ONLY)
     return select(*EVENT_ROWS_NO_STATES, CONTEXT_ONLY)
 
 
-def select_states_context_only() -> Select:
+def select_states_context_only(legacy_entity_ids: bool = False) -> Select:
     """Generate an states query that mark them as for context_only.
 
     By marking them as context_only we know they are only for
     linking context ids and we can avoid processing them.
     """
+    if legacy_entity_ids:
+        return select(
+            *EVENT_COLUMNS_FOR_STATE_SELECT,
+            *LEGACY_STATE_CONTEXT_ONLY_COLUMNS,
+            CONTEXT_ONLY,
+        )
     return select(
         *EVENT_COLUMNS_FOR_STATE_SELECT, *STATE_CONTEXT_ONLY_COLUMNS, CONTEXT_ONLY
     )
 
 
 def select_events_without_states(
-    start_day: float, end_day: float, event_types: tuple[str, ...]
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    legacy_event_types: bool = False,
 ) -> Select:
     """Generate an events select that does not join states."""
-    return (
-        select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY)
+    return apply_event_types_join(
+        select(
+            *(
+                LEGACY_EVENT_ROWS_NO_STATES
+                if legacy_event_types
+                else EVENT_ROWS_NO_STATES
+            ),
+            NOT_CONTEXT_ONLY,
+        )
         .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
-        .where(Events.event_type.in_(event_types))
-        .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        .where(_event_type_matcher(event_type_ids, legacy_event_types))
+        .outerjoin(EventData, (Events.data_id == EventData.data_id)),
+        legacy_event_types,
     )
 
 
-def select_states() -> Select:
+def select_states(legacy_entity_ids: bool = False) -> Select:
     """Generate a states select that formats the states table as event rows."""
     return select(
         *EVENT_COLUMNS_FOR_STATE_SELECT,
-        *STATE_COLUMNS,
+        *(LEGACY_STATE_COLUMNS if legacy_entity_ids else STATE_COLUMNS),
         NOT_CONTEXT_ONLY,
     )
 
 
 def legacy_select_events_context_id(
-    start_day: float, end_day: float, context_id: str
+    start_day: float,
+    end_day: float,
+    context_id: str,
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> Select:
     """Generate a legacy events context id select that also joins states."""
     # This can be removed once we no longer have event_ids in the states table
-    return (
+    query = apply_event_types_join(
         select(
-            *EVENT_COLUMNS,
+            *(LEGACY_EVENT_COLUMNS if legacy_event_types else EVENT_COLUMNS),
             literal(value=None, type_=sqlalchemy.String).label("shared_data"),
-            *STATE_COLUMNS,
+            *(LEGACY_STATE_COLUMNS if legacy_entity_ids else STATE_COLUMNS),
             NOT_CONTEXT_ONLY,
-        )
-        .outerjoin(States, (Events.event_id == States.event_id))
+        ),
+        legacy_event_types,
+    ).outerjoin(States, (Events.event_id == States.event_id))
+    return (
+        apply_states_meta_join(query, legacy_entity_ids)
         .where(
             (States.last_updated_ts == States.last_changed_ts)
             | States.last_changed_ts.is_(None)
         )
-        .where(_not_continuous_entity_matcher())
+        .where(_not_continuous_entity_matcher(legacy_entity_ids))
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
@@ -188,20 +253,40 @@ def legacy_select_events_context_id(
     )
 
 
-def apply_states_filters(query: Query, start_day: float, end_day: float) -> Query:
+def apply_event_types_join(query: Query, legacy_event_types: bool = False) -> Query:
+    """Join the event_types table unless it is still being migrated."""
+    if legacy_event_types:
+        return query
+    return query.outerjoin(
+        EventTypes, (Events.event_type_id == EventTypes.event_type_id)
+    )
+
+
+def apply_states_meta_join(query: Query, legacy_entity_ids: bool = False) -> Query:
+    """Join the states_meta table unless it is still being migrated."""
+    if legacy_entity_ids:
+        return query
+    return query.outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+
+
+def apply_states_filters(
+    query: Query, start_day: float, end_day: float, legacy_entity_ids: bool = False
+) -> Query:
     """Filter states by time range.
 
     Filters states that do not have an old state or new state (added / removed)
     Filters states that are in a continuous domain with a UOM.
     Filters states that do not have matching last_updated_ts and last_changed_ts.
     """
+    query = query.filter(
+        (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
+    )
+    if not legacy_entity_ids:
+        query = query.join(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
     return (
-        query.filter(
-            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
-        )
-        .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
+        query.outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
         .where(_missing_state_matcher())
-        .where(_not_continuous_entity_matcher())
+        .where(_not_continuous_entity_matcher(legacy_entity_ids))
         .where(
             (States.last_updated_ts == States.last_changed_ts)
             | States.last_changed_ts.is_(None)
@@ -212,6 +297,34 @@ def apply_states_filters(query: Query, start_day: float, end_day: float) -> Quer
     )
 
 
+def apply_states_entity_matcher(
+    query: Query,
+    states_metadata_ids: list[int] | list[str],
+    legacy_entity_ids: bool = False,
+) -> Query:
+    """Match the states of the entities.
+
+    While the states_meta table is being migrated the states are
+    matched by their entity_id instead of their metadata_id.
+    """
+    if legacy_entity_ids:
+        return query.where(States.entity_id.in_(states_metadata_ids))
+    return query.where(States.metadata_id.in_(states_metadata_ids))
+
+
+def _event_type_matcher(
+    event_type_ids: tuple[int, ...] | tuple[str, ...], legacy_event_types: bool
+) -> ClauseList:
+    """Match the events of the event types.
+
+    While the event_types table is being migrated the events are
+    matched by their event_type instead of their event_type_id.
+    """
+    if legacy_event_types:
+        return Events.event_type.in_(event_type_ids)
+    return Events.event_type_id.in_(event_type_ids)
+
+
 def _missing_state_matcher() -> sqlalchemy.and_:
     # The below removes state change events that do not have
     # and old_state or the old_state is missing (newly added entities)
@@ -223,11 +336,15 @@ def _missing_state_matcher() -> sqlalchemy.and_:
     )
 
 
-def _not_continuous_entity_matcher() -> sqlalchemy.or_:
+def _not_continuous_entity_matcher(
+    legacy_entity_ids: bool = False,
+) -> sqlalchemy.or_:
     """Match non continuous entities."""
     return sqlalchemy.or_(
         # First exclude domains that may be continuous
-        _not_possible_continuous_domain_matcher(),
+        _not_possible_continuous_domain_matcher(
+            States.entity_id if legacy_entity_ids else StatesMeta.entity_id
+        ),
         # But let in the entities in the possible continuous domains
         # that are not actually continuous sensors because they lack a UOM
         sqlalchemy.and_(
@@ -236,7 +353,9 @@ def _not_continuous_entity_matcher() -> sqlalchemy.or_:
     )
 
 
-def _not_possible_continuous_domain_matcher() -> sqlalchemy.and_:
+def _not_possible_continuous_domain_matcher(
+    entity_id_column: Column,
+) -> sqlalchemy.and_:
     """Match not continuous domains.
 
     This matches domain that are always considered continuous
@@ -245,7 +364,7 @@ def _not_possible_continuous_domain_matcher() -> sqlalchemy.and_:
     """
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~entity_id_column.like(entity_domain)
             for entity_domain in (
                 *ALWAYS_CONTINUOUS_ENTITY_ID_LIKE,
                 *CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE,
@@ -262,7 +381,7 @@ def _conditionally_continuous_domain_matcher() -> sqlalchemy.or_:
     """
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
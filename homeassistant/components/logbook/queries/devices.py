@@ -18,8 +18,10 @@ from homeassistant.components.recorder.db_schema import (
 )
 
 from .common import (
+    apply_event_types_join,
     apply_events_context_hints,
     apply_states_context_hints,
+    apply_states_meta_join,
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
@@ -30,13 +32,14 @@ from .common import (
 def _select_device_id_context_ids_sub_query(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
     json_quotable_device_ids: list[str],
+    legacy_event_types: bool = False,
 ) -> CompoundSelect:
     """Generate a subquery to find context ids for multiple devices."""
-    inner = select_events_context_id_subquery(start_day, end_day, event_types).where(
-        apply_event_device_id_matchers(json_quotable_device_ids)
-    )
+    inner = select_events_context_id_subquery(
+        start_day, end_day, event_type_ids, legacy_event_types
+    ).where(apply_event_device_id_matchers(json_quotable_device_ids))
     return select(inner.c.context_id).group_by(inner.c.context_id)
 
 
@@ -44,26 +47,35 @@ def _apply_devices_context_union(
     query: Query,
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
     json_quotable_device_ids: list[str],
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> CompoundSelect:
     """Generate a CTE to find the device context ids and a query to find linked row."""
     devices_cte: CTE = _select_device_id_context_ids_sub_query(
         start_day,
         end_day,
-        event_types,
+        event_type_ids,
         json_quotable_device_ids,
+        legacy_event_types,
     ).cte()
     return query.union_all(
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(devices_cte)
-            .outerjoin(Events, devices_cte.c.context_id == Events.context_id)
-        ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(devices_cte)
-            .outerjoin(States, devices_cte.c.context_id == States.context_id)
+        apply_event_types_join(
+            apply_events_context_hints(
+                select_events_context_only(legacy_event_types)
+                .select_from(devices_cte)
+                .outerjoin(Events, devices_cte.c.context_id == Events.context_id)
+            ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
+            legacy_event_types,
+        ),
+        apply_states_meta_join(
+            apply_states_context_hints(
+                select_states_context_only(legacy_entity_ids)
+                .select_from(devices_cte)
+                .outerjoin(States, devices_cte.c.context_id == States.context_id)
+            ),
+            legacy_entity_ids,
         ),
     )
 
@@ -71,18 +83,33 @@ def _apply_devices_context_union(
 def devices_stmt(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
     json_quotable_device_ids: list[str],
-) -> StatementLambdaElement:
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
+) -> StatementLambdaElement | CompoundSelect:
     """Generate a logbook query for multiple devices."""
+    if legacy_event_types or legacy_entity_ids:
+        # Not a lambda_stmt since the lookup tables are only migrated once
+        return _apply_devices_context_union(
+            select_events_without_states(
+                start_day, end_day, event_type_ids, legacy_event_types
+            ).where(apply_event_device_id_matchers(json_quotable_device_ids)),
+            start_day,
+            end_day,
+            event_type_ids,
+            json_quotable_device_ids,
+            legacy_event_types,
+            legacy_entity_ids,
+        ).order_by(Events.time_fired_ts)
     stmt = lambda_stmt(
         lambda: _apply_devices_context_union(
-            select_events_without_states(start_day, end_day, event_types).where(
+            select_events_without_states(start_day, end_day, event_type_ids).where(
                 apply_event_device_id_matchers(json_quotable_device_ids)
             ),
             start_day,
             end_day,
-            event_types,
+            event_type_ids,
             json_quotable_device_ids,
         ).order_by(Events.time_fired_ts)
     )
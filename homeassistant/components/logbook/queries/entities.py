@@ -12,6 +12,7 @@ from sqlalchemy.sql.selectable import CTE, CompoundSelect
 from homeassistant.components.recorder.db_schema import (
     ENTITY_ID_IN_EVENT,
     ENTITY_ID_LAST_UPDATED_INDEX_TS,
+    METADATA_ID_LAST_UPDATED_INDEX_TS,
     OLD_ENTITY_ID_IN_EVENT,
     EventData,
     Events,
@@ -19,9 +20,12 @@ from homeassistant.components.recorder.db_schema import (
 )
 
 from .common import (
+    apply_event_types_join,
     apply_events_context_hints,
     apply_states_context_hints,
+    apply_states_entity_matcher,
     apply_states_filters,
+    apply_states_meta_join,
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
@@ -33,20 +37,25 @@ from .common import (
 def _select_entities_context_ids_sub_query(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> CompoundSelect:
     """Generate a subquery to find context ids for multiple entities."""
     union = union_all(
-        select_events_context_id_subquery(start_day, end_day, event_types).where(
-            apply_event_entity_id_matchers(json_quoted_entity_ids)
+        select_events_context_id_subquery(
+            start_day, end_day, event_type_ids, legacy_event_types
+        ).where(apply_event_entity_id_matchers(json_quoted_entity_ids)),
+        apply_states_entity_matcher(
+            apply_entities_hints(select(States.context_id), legacy_entity_ids).filter(
+                (States.last_updated_ts > start_day)
+                & (States.last_updated_ts < end_day)
+            ),
+            states_metadata_ids,
+            legacy_entity_ids,
         ),
-        apply_entities_hints(select(States.context_id))
-        .filter(
-            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
-        )
-        .where(States.entity_id.in_(entity_ids)),
     )
     return select(union.c.context_id).group_by(union.c.context_id)
 
@@ -55,17 +64,21 @@ def _apply_entities_context_union(
     query: Query,
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> CompoundSelect:
     """Generate a CTE to find the entity and device context ids and a query to find linked row."""
     entities_cte: CTE = _select_entities_context_ids_sub_query(
         start_day,
         end_day,
-        event_types,
-        entity_ids,
+        event_type_ids,
+        states_metadata_ids,
         json_quoted_entity_ids,
+        legacy_event_types,
+        legacy_entity_ids,
     ).cte()
     # We used to optimize this to exclude rows we already in the union with
     # a States.entity_id.not_in(entity_ids) but that made the
@@ -73,16 +86,24 @@ def _apply_entities_context_union(
     # in the python code anyways since they will have context_only
     # set on them the impact is minimal.
     return query.union_all(
-        states_query_for_entity_ids(start_day, end_day, entity_ids),
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(entities_cte)
-            .outerjoin(Events, entities_cte.c.context_id == Events.context_id)
-        ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(entities_cte)
-            .outerjoin(States, entities_cte.c.context_id == States.context_id)
+        states_query_for_metadata_ids(
+            start_day, end_day, states_metadata_ids, legacy_entity_ids
+        ),
+        apply_event_types_join(
+            apply_events_context_hints(
+                select_events_context_only(legacy_event_types)
+                .select_from(entities_cte)
+                .outerjoin(Events, entities_cte.c.context_id == Events.context_id)
+            ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
+            legacy_event_types,
+        ),
+        apply_states_meta_join(
+            apply_states_context_hints(
+                select_states_context_only(legacy_entity_ids)
+                .select_from(entities_cte)
+                .outerjoin(States, entities_cte.c.context_id == States.context_id)
+            ),
+            legacy_entity_ids,
         ),
     )
 
@@ -90,32 +111,58 @@ def _apply_entities_context_union(
 def entities_stmt(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
-) -> StatementLambdaElement:
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
+) -> StatementLambdaElement | CompoundSelect:
     """Generate a logbook query for multiple entities."""
+    if legacy_event_types or legacy_entity_ids:
+        # Not a lambda_stmt since the lookup tables are only migrated once
+        return _apply_entities_context_union(
+            select_events_without_states(
+                start_day, end_day, event_type_ids, legacy_event_types
+            ).where(apply_event_entity_id_matchers(json_quoted_entity_ids)),
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids,
+            json_quoted_entity_ids,
+            legacy_event_types,
+            legacy_entity_ids,
+        ).order_by(Events.time_fired_ts)
     return lambda_stmt(
         lambda: _apply_entities_context_union(
-            select_events_without_states(start_day, end_day, event_types).where(
+            select_events_without_states(start_day, end_day, event_type_ids).where(
                 apply_event_entity_id_matchers(json_quoted_entity_ids)
             ),
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
         ).order_by(Events.time_fired_ts)
     )
 
 
-def states_query_for_entity_ids(
-    start_day: float, end_day: float, entity_ids: list[str]
+def states_query_for_metadata_ids(
+    start_day: float,
+    end_day: float,
+    states_metadata_ids: list[int] | list[str],
+    legacy_entity_ids: bool = False,
 ) -> Query:
     """Generate a select for states from the States table for specific entities."""
-    return apply_states_filters(
-        apply_entities_hints(select_states()), start_day, end_day
-    ).where(States.entity_id.in_(entity_ids))
+    return apply_states_entity_matcher(
+        apply_states_filters(
+            apply_entities_hints(select_states(legacy_entity_ids), legacy_entity_ids),
+            start_day,
+            end_day,
+            legacy_entity_ids,
+        ),
+        states_metadata_ids,
+        legacy_entity_ids,
+    )
 
 
 def apply_event_entity_id_matchers(
@@ -134,8 +181,16 @@ def apply_event_entity_id_matchers(
     )
 
 
-def apply_entities_hints(query: Query) -> Query:
+def apply_entities_hints(query: Query, legacy_entity_ids: bool = False) -> Query:
     """Force mysql to use the right index on large selects."""
+    if legacy_entity_ids:
+        return query.with_hint(
+            States,
+            f"FORCE INDEX ({ENTITY_ID_LAST_UPDATED_INDEX_TS})",
+            dialect_name="mysql",
+        )
     return query.with_hint(
-        States, f"FORCE INDEX ({ENTITY_ID_LAST_UPDATED_INDEX_TS})", dialect_name="mysql"
+        States,
+        f"FORCE INDEX ({METADATA_ID_LAST_UPDATED_INDEX_TS})",
+        dialect_name="mysql",
     )
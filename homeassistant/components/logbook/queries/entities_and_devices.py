@@ -12,8 +12,11 @@ from sqlalchemy.sql.selectable import CTE, CompoundSelect
 from homeassistant.components.recorder.db_schema import EventData, Events, States
 
 from .common import (
+    apply_event_types_join,
     apply_events_context_hints,
     apply_states_context_hints,
+    apply_states_entity_matcher,
+    apply_states_meta_join,
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
@@ -23,30 +26,37 @@ from .devices import apply_event_device_id_matchers
 from .entities import (
     apply_entities_hints,
     apply_event_entity_id_matchers,
-    states_query_for_entity_ids,
+    states_query_for_metadata_ids,
 )
 
 
 def _select_entities_device_id_context_ids_sub_query(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> CompoundSelect:
     """Generate a subquery to find context ids for multiple entities and multiple devices."""
     union = union_all(
-        select_events_context_id_subquery(start_day, end_day, event_types).where(
+        select_events_context_id_subquery(
+            start_day, end_day, event_type_ids, legacy_event_types
+        ).where(
             _apply_event_entity_id_device_id_matchers(
                 json_quoted_entity_ids, json_quoted_device_ids
             )
         ),
-        apply_entities_hints(select(States.context_id))
-        .filter(
-            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
-        )
-        .where(States.entity_id.in_(entity_ids)),
+        apply_states_entity_matcher(
+            apply_entities_hints(select(States.context_id), legacy_entity_ids).filter(
+                (States.last_updated_ts > start_day)
+                & (States.last_updated_ts < end_day)
+            ),
+            states_metadata_ids,
+            legacy_entity_ids,
+        ),
     )
     return select(union.c.context_id).group_by(union.c.context_id)
 
@@ -55,18 +65,22 @@ def _apply_entities_devices_context_union(
     query: Query,
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
 ) -> CompoundSelect:
     devices_entities_cte: CTE = _select_entities_device_id_context_ids_sub_query(
         start_day,
         end_day,
-        event_types,
-        entity_ids,
+        event_type_ids,
+        states_metadata_ids,
         json_quoted_entity_ids,
         json_quoted_device_ids,
+        legacy_event_types,
+        legacy_entity_ids,
     ).cte()
     # We used to optimize this to exclude rows we already in the union with
     # a States.entity_id.not_in(entity_ids) but that made the
@@ -74,16 +88,28 @@ def _apply_entities_devices_context_union(
     # in the python code anyways since they will have context_only
     # set on them the impact is minimal.
     return query.union_all(
-        states_query_for_entity_ids(start_day, end_day, entity_ids),
-        apply_events_context_hints(
-            select_events_context_only()
-            .select_from(devices_entities_cte)
-            .outerjoin(Events, devices_entities_cte.c.context_id == Events.context_id)
-        ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
-        apply_states_context_hints(
-            select_states_context_only()
-            .select_from(devices_entities_cte)
-            .outerjoin(States, devices_entities_cte.c.context_id == States.context_id)
+        states_query_for_metadata_ids(
+            start_day, end_day, states_metadata_ids, legacy_entity_ids
+        ),
+        apply_event_types_join(
+            apply_events_context_hints(
+                select_events_context_only(legacy_event_types)
+                .select_from(devices_entities_cte)
+                .outerjoin(
+                    Events, devices_entities_cte.c.context_id == Events.context_id
+                )
+            ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
+            legacy_event_types,
+        ),
+        apply_states_meta_join(
+            apply_states_context_hints(
+                select_states_context_only(legacy_entity_ids)
+                .select_from(devices_entities_cte)
+                .outerjoin(
+                    States, devices_entities_cte.c.context_id == States.context_id
+                )
+            ),
+            legacy_entity_ids,
         ),
     )
 
@@ -91,23 +117,44 @@ def _apply_entities_devices_context_union(
 def entities_devices_stmt(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
-    entity_ids: list[str],
+    event_type_ids: tuple[int, ...] | tuple[str, ...],
+    states_metadata_ids: list[int] | list[str],
     json_quoted_entity_ids: list[str],
     json_quoted_device_ids: list[str],
-) -> StatementLambdaElement:
+    legacy_event_types: bool = False,
+    legacy_entity_ids: bool = False,
+) -> StatementLambdaElement | CompoundSelect:
     """Generate a logbook query for multiple entities."""
+    if legacy_event_types or legacy_entity_ids:
+        # Not a lambda_stmt since the lookup tables are only migrated once
+        return _apply_entities_devices_context_union(
+            select_events_without_states(
+                start_day, end_day, event_type_ids, legacy_event_types
+            ).where(
+                _apply_event_entity_id_device_id_matchers(
+                    json_quoted_entity_ids, json_quoted_device_ids
+                )
+            ),
+            start_day,
+            end_day,
+            event_type_ids,
+            states_metadata_ids,
+            json_quoted_entity_ids,
+            json_quoted_device_ids,
+            legacy_event_types,
+            legacy_entity_ids,
+        ).order_by(Events.time_fired_ts)
     stmt = lambda_stmt(
         lambda: _apply_entities_devices_context_union(
-            select_events_without_states(start_day, end_day, event_types).where(
+            select_events_without_states(start_day, end_day, event_type_ids).where(
                 _apply_event_entity_id_device_id_matchers(
                     json_quoted_entity_ids, json_quoted_device_ids
                 )
             ),
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
             json_quoted_device_ids,
         ).order_by(Events.time_fired_ts)
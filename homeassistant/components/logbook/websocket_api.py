@@ -17,7 +17,7 @@ from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.entityfilter import EntityFilter
 from homeassistant.helpers.event import async_track_point_in_utc_time
-from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.json import JSON_DUMP, json_bytes
 import homeassistant.util.dt as dt_util
 
 from .const import LOGBOOK_ENTITIES_FILTER
@@ -105,6 +105,7 @@ async def _async_send_historical_events(
     if not is_big_query:
         message, last_event_time = await _async_get_ws_stream_events(
             hass,
+            connection,
             msg_id,
             start_time,
             end_time,
@@ -127,6 +128,7 @@ async def _async_send_historical_events(
     recent_query_start = end_time - timedelta(hours=BIG_QUERY_RECENT_HOURS)
     recent_message, recent_query_last_event_time = await _async_get_ws_stream_events(
         hass,
+        connection,
         msg_id,
         recent_query_start,
         end_time,
@@ -139,6 +141,7 @@ async def _async_send_historical_events(
 
     older_message, older_query_last_event_time = await _async_get_ws_stream_events(
         hass,
+        connection,
         msg_id,
         start_time,
         recent_query_start,
@@ -160,6 +163,7 @@ async def _async_send_historical_events(
 
 async def _async_get_ws_stream_events(
     hass: HomeAssistant,
+    connection: ActiveConnection,
     msg_id: int,
     start_time: dt,
     end_time: dt,
@@ -167,9 +171,11 @@ async def _async_get_ws_stream_events(
     event_processor: EventProcessor,
     partial: bool,
 ) -> tuple[str, dt | None]:
-    """Async wrapper around _ws_formatted_get_events."""
+    """Async wrapper around _ws_stream_get_events."""
     return await get_instance(hass).async_add_executor_job(
         _ws_stream_get_events,
+        hass,
+        connection,
         msg_id,
         start_time,
         end_time,
@@ -191,6 +197,8 @@ def _generate_stream_message(
 
 
 def _ws_stream_get_events(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
     msg_id: int,
     start_day: dt,
     end_day: dt,
@@ -198,11 +206,42 @@ def _ws_stream_get_events(
     event_processor: EventProcessor,
     partial: bool,
 ) -> tuple[str, dt | None]:
-    """Fetch events and convert them to json in the executor."""
-    events = event_processor.get_events(start_day, end_day)
+    """Fetch events and convert them to json in the executor.
+
+    The events are read in chunks. Each chunk except the last one is
+    sent as a partial message as soon as it is ready, and the message
+    for the last chunk is returned.
+    """
+    events: list[dict[str, Any]] = []
+    for chunk in event_processor.iter_events(start_day, end_day):
+        if not chunk:
+            continue
+        if events:
+            hass.loop.call_soon_threadsafe(
+                connection.send_message,
+                _ws_stream_message_json(
+                    msg_id, start_day, end_day, formatter, events, True
+                ),
+            )
+        events = chunk
     last_time = None
     if events:
         last_time = dt_util.utc_from_timestamp(events[-1]["when"])
+    return (
+        _ws_stream_message_json(msg_id, start_day, end_day, formatter, events, partial),
+        last_time,
+    )
+
+
+def _ws_stream_message_json(
+    msg_id: int,
+    start_day: dt,
+    end_day: dt,
+    formatter: Callable[[int, Any], dict[str, Any]],
+    events: list[dict[str, Any]],
+    partial: bool,
+) -> str:
+    """Generate a logbook stream message as json."""
     message = _generate_stream_message(events, start_day, end_day)
     if partial:
         # This is a hint to consumers of the api that
@@ -210,7 +249,7 @@ def _ws_stream_get_events(
         # data in case the UI needs to show that historical
         # data is still loading in the future
         message["partial"] = True
-    return JSON_DUMP(formatter(msg_id, message)), last_time
+    return JSON_DUMP(formatter(msg_id, message))
 
 
 async def _async_events_consumer(
@@ -437,12 +476,24 @@ def _ws_formatted_get_events(
     end_time: dt,
     event_processor: EventProcessor,
 ) -> str:
-    """Fetch events and convert them to json in the executor."""
-    return JSON_DUMP(
-        messages.result_message(
-            msg_id, event_processor.get_events(start_time, end_time)
+    """Fetch events and convert them to json in the executor.
+
+    Each chunk of events is converted to json as soon as it has been
+    read so the events of the whole period are never in memory at once.
+    """
+    return b"".join(
+        (
+            b'{"id":',
+            json_bytes(msg_id),
+            b',"type":"result","success":true,"result":[',
+            b",".join(
+                json_bytes(events)[1:-1]
+                for events in event_processor.iter_events(start_time, end_time)
+                if events
+            ),
+            b"]}",
         )
-    )
+    ).decode("utf-8")
 
 
 @websocket_api.websocket_command(
@@ -370,7 +370,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Restore saved subscriptions
     if mqtt_data.subscriptions_to_restore:
         mqtt_data.client.subscriptions = mqtt_data.subscriptions_to_restore
-        mqtt_data.subscriptions_to_restore = []
+        mqtt_data.subscriptions_to_restore = None
     mqtt_data.reload_dispatchers.append(
         entry.add_update_listener(_async_config_entry_updated)
     )
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Coroutine, Iterable
-from functools import lru_cache, partial, wraps
+from collections import deque
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+from functools import partial, wraps
 import inspect
 from itertools import groupby
 import logging
@@ -70,6 +71,7 @@ from .models import (
     MessageCallbackType,
     PublishMessage,
     PublishPayloadType,
+    ReceiveBatchStats,
     ReceiveMessage,
     ReceivePayloadType,
 )
@@ -273,12 +275,118 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob[[ReceiveMessage], Coroutine[Any, Any, None] | None] = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
 
 
+class _SubscriptionTrieNode:
+    """A level of a subscribed topic in the subscription trie."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: dict[str, _SubscriptionTrieNode] = {}
+        self.subscriptions: list[Subscription] = []
+
+
+class SubscriptionTrie:
+    """Collection of subscriptions indexed by a trie of the topic levels.
+
+    The trie is updated when subscriptions are added or removed, finding the
+    subscriptions for a topic only walks the levels of the topic and the
+    "+" and "#" wildcards which were subscribed at those levels.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _SubscriptionTrieNode()
+        # Subscriptions in the order they were added
+        self._subscriptions: dict[Subscription, None] = {}
+
+    def __bool__(self) -> bool:
+        """Return True if there are subscriptions."""
+        return bool(self._subscriptions)
+
+    def __contains__(self, subscription: object) -> bool:
+        """Return True if the subscription was added."""
+        return subscription in self._subscriptions
+
+    def __iter__(self) -> Iterator[Subscription]:
+        """Iterate over the subscriptions in the order they were added."""
+        return iter(self._subscriptions)
+
+    def __len__(self) -> int:
+        """Return the number of subscriptions."""
+        return len(self._subscriptions)
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription."""
+        self._subscriptions[subscription] = None
+        node = self._root
+        for level in subscription.topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _SubscriptionTrieNode()
+            node = child
+        node.subscriptions.append(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription, raises KeyError if it was not added."""
+        del self._subscriptions[subscription]
+        path: list[tuple[_SubscriptionTrieNode, str]] = []
+        node = self._root
+        for level in subscription.topic.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        node.subscriptions.remove(subscription)
+        # Prune the levels which are no longer used by any subscription
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.children or child.subscriptions:
+                break
+            del parent.children[level]
+
+    def has_topic(self, topic: str) -> bool:
+        """Return True if there are subscriptions to the exact topic."""
+        node = self._root
+        for level in topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                return False
+            node = child
+        return bool(node.subscriptions)
+
+    def match(self, topic: str) -> list[Subscription]:
+        """Return the subscriptions matching a topic.
+
+        Wildcards at the first level do not match topics starting with "$".
+        """
+        levels = topic.split("/")
+        wildcards = not topic.startswith("$")
+        matches: list[Subscription] = []
+        nodes = [self._root]
+        for idx, level in enumerate(levels):
+            next_nodes: list[_SubscriptionTrieNode] = []
+            for node in nodes:
+                children = node.children
+                if (child := children.get(level)) is not None:
+                    next_nodes.append(child)
+                if wildcards or idx:
+                    if (child := children.get("+")) is not None:
+                        next_nodes.append(child)
+                    if (child := children.get("#")) is not None:
+                        matches.extend(child.subscriptions)
+            if not next_nodes:
+                return matches
+            nodes = next_nodes
+        for node in nodes:
+            matches.extend(node.subscriptions)
+            # "#" also matches the parent level
+            if (child := node.children.get("#")) is not None:
+                matches.extend(child.subscriptions)
+        return matches
+
+
 class MqttClientSetup:
     """Helper class to setup the paho mqtt client from config."""
 
@@ -357,7 +465,7 @@ class MQTT:
         self.hass = hass
         self.config_entry = config_entry
         self.conf = conf
-        self.subscriptions: list[Subscription] = []
+        self.subscriptions = SubscriptionTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -367,6 +475,12 @@ class MQTT:
         self._pending_operations: dict[int, asyncio.Event] = {}
         self._pending_operations_condition = asyncio.Condition()
 
+        # Received messages with their monotonic receive time, they are
+        # appended by the paho thread and handled in batches in the event loop
+        self._received_messages: deque[tuple[mqtt.MQTTMessage, float]] = deque()
+        self._received_messages_scheduled = False
+        self.receive_batch_stats = ReceiveBatchStats()
+
         if self.hass.state == CoreState.running:
             self._ha_started.set()
         else:
@@ -494,11 +608,8 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
-        self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
+        self.subscriptions.add(subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -511,7 +622,6 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
 
             # Only unsubscribe if currently connected
             if self.connected:
@@ -531,7 +641,7 @@ class MQTT:
             _raise_on_error(result)
             return mid
 
-        if any(other.topic == topic for other in self.subscriptions):
+        if self.subscriptions.has_topic(topic):
             # Other subscriptions on topic remaining - don't unsubscribe.
             return
 
@@ -641,19 +751,50 @@ class MQTT:
     def _mqtt_on_message(
         self, _mqttc: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage
     ) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic: str) -> list[Subscription]:
-        subscriptions: list[Subscription] = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        The message is queued and the queue is handled once per event loop
+        iteration to avoid waking up the event loop for every message.
+        """
+        self._received_messages.append((msg, time.monotonic()))
+        if not self._received_messages_scheduled:
+            self._received_messages_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_received_messages)
+
+    @callback
+    def _mqtt_handle_received_messages(self) -> None:
+        """Handle the messages queued by the paho thread."""
+        # Reset the flag before taking the messages, a message queued after
+        # this schedules a new run even if it is handled by this one
+        self._received_messages_scheduled = False
+        received_messages = self._received_messages
+        if not (batch_size := len(received_messages)):
+            return
+        latency = time.monotonic() - received_messages[0][1]
+        try:
+            for _ in range(batch_size):
+                msg = received_messages.popleft()[0]
+                # A failing subscriber must not hold up the rest of the batch
+                try:
+                    self._mqtt_process_message(msg)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Exception while handling message on %s: %s",
+                        msg.topic,
+                        msg.payload[0:8192],
+                    )
+        finally:
+            self._mqtt_data.state_write_requests.process_write_state_requests()
+            self.receive_batch_stats.add_batch(batch_size, latency)
 
     @callback
     def _mqtt_handle_message(self, msg: mqtt.MQTTMessage) -> None:
+        """Handle a single message and write the requested states."""
+        self._mqtt_process_message(msg)
+        self._mqtt_data.state_write_requests.process_write_state_requests()
+
+    @callback
+    def _mqtt_process_message(self, msg: mqtt.MQTTMessage) -> None:
         _LOGGER.debug(
             "Received%s message on %s (qos=%s): %s",
             " retained" if msg.retain else "",
@@ -663,7 +804,7 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self.subscriptions.match(msg.topic)
 
         for subscription in subscriptions:
             payload: SubscribePayloadType = msg.payload
@@ -690,7 +831,6 @@ class MQTT:
                     timestamp,
                 ),
             )
-        self._mqtt_data.state_write_requests.process_write_state_requests()
 
     def _mqtt_on_callback(
         self,
@@ -789,13 +929,3 @@ def _raise_on_errors(result_codes: Iterable[int]) -> None:
 def _raise_on_error(result_code: int) -> None:
     """Raise error if error result."""
     _raise_on_errors((result_code,))
-
-
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable-next=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
@@ -21,7 +21,7 @@ from homeassistant.helpers.service_info.mqtt import ReceivePayloadType
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, TemplateVarsType
 
 if TYPE_CHECKING:
-    from .client import MQTT, Subscription
+    from .client import MQTT, SubscriptionTrie
     from .debug_info import TimestampedPublishMessage
     from .device_trigger import Trigger
     from .discovery import MQTTDiscoveryPayload
@@ -68,6 +68,31 @@ AsyncMessageCallbackType = Callable[[ReceiveMessage], Coroutine[Any, Any, None]]
 MessageCallbackType = Callable[[ReceiveMessage], None]
 
 
+@dataclass
+class ReceiveBatchStats:
+    """Counters of the batches of received messages.
+
+    The latency is the time in seconds the oldest message of a batch
+    waited in the queue before the batch was handled.
+    """
+
+    batches: int = 0
+    messages: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def add_batch(self, batch_size: int, latency: float) -> None:
+        """Count a handled batch."""
+        self.batches += 1
+        self.messages += batch_size
+        self.last_batch_size = batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+
 class SubscriptionDebugInfo(TypedDict):
     """Class for holding subscription debug info."""
 
@@ -301,6 +326,6 @@ class MqttData:
     )
     reload_needed: bool = False
     state_write_requests: EntityTopicState = field(default_factory=EntityTopicState)
-    subscriptions_to_restore: list[Subscription] = field(default_factory=list)
+    subscriptions_to_restore: SubscriptionTrie | None = None
     tags: dict[str, dict[str, MQTTTagScanner]] = field(default_factory=dict)
     updated_config: ConfigType = field(default_factory=dict)
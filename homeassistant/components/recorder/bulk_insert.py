@@ -0,0 +1,211 @@
+"""Bulk insert of new recorder rows with SQLAlchemy core."""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Column, Table, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.session import Session
+
+from .db_schema import (
+    Base,
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+
+
+def _insert_columns(model: type[Base]) -> list[str]:
+    """Return the column names to insert for a model, excluding the primary key."""
+    return [column.key for column in model.__table__.columns if not column.primary_key]
+
+
+STATE_ATTRIBUTES_COLUMNS = _insert_columns(StateAttributes)
+STATES_META_COLUMNS = _insert_columns(StatesMeta)
+EVENT_DATA_COLUMNS = _insert_columns(EventData)
+EVENT_TYPES_COLUMNS = _insert_columns(EventTypes)
+EVENTS_COLUMNS = _insert_columns(Events)
+STATES_COLUMNS = _insert_columns(States)
+
+
+def _rows(objects: list[Any], columns: list[str]) -> list[dict[str, Any]]:
+    """Convert ORM objects to core insert parameters."""
+    return [{column: getattr(obj, column) for column in columns} for obj in objects]
+
+
+def _insert_and_assign_ids(
+    conn: Connection,
+    table: Table,
+    objects: list[Any],
+    columns: list[str],
+    unique_column: str,
+) -> None:
+    """Insert rows in bulk and set the new primary key on each object.
+
+    The value of unique_column must be unique among the objects since
+    it is used to match the ids returned by RETURNING to the objects.
+
+    When the dialect does not support RETURNING with executemany,
+    the ids are read back in insert order. This is safe because
+    the recorder thread is the only writer of these tables.
+    """
+    primary_key: Column = table.primary_key.columns[0]
+    rows = _rows(objects, columns)
+    if conn.dialect.insert_executemany_returning:
+        result = conn.execute(
+            insert(table).returning(primary_key, table.c[unique_column]), rows
+        )
+        id_by_value = {value: row_id for row_id, value in result}
+        for obj in objects:
+            setattr(obj, primary_key.key, id_by_value[getattr(obj, unique_column)])
+        return
+
+    max_id = conn.execute(select(func.max(primary_key))).scalar() or 0
+    conn.execute(insert(table), rows)
+    new_ids = (
+        conn.execute(
+            select(primary_key).where(primary_key > max_id).order_by(primary_key)
+        )
+        .scalars()
+        .all()
+    )
+    if len(new_ids) != len(objects):
+        raise RuntimeError(
+            f"Expected {len(objects)} new rows in {table.name}, found {len(new_ids)}"
+        )
+    for obj, row_id in zip(objects, new_ids):
+        setattr(obj, primary_key.key, row_id)
+
+
+def _state_generations(states: list[States]) -> list[list[States]]:
+    """Split states into groups where each metadata_id appears at most once.
+
+    The state of an entity in one group is the old state of the same
+    entity in the next group, so groups must be inserted in order.
+    """
+    generations: list[list[States]] = []
+    seen: dict[int, int] = {}
+    for dbstate in states:
+        generation = seen.get(dbstate.metadata_id, 0)
+        seen[dbstate.metadata_id] = generation + 1
+        if generation == len(generations):
+            generations.append([])
+        generations[generation].append(dbstate)
+    return generations
+
+
+class BulkInserter:
+    """Buffer new rows and insert them in bulk when the event session commits.
+
+    The rows are ORM objects which are never added to the session. Instead
+    they are written with executemany inserts in the commit transaction, and
+    their primary keys are set afterwards so they can be used the same
+    way as objects that were flushed by the session.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk inserter."""
+        self.state_attributes: list[StateAttributes] = []
+        self.states_meta: list[StatesMeta] = []
+        self.event_data: list[EventData] = []
+        self.event_types: list[EventTypes] = []
+        self.events: list[Events] = []
+        self.states: list[States] = []
+
+    @property
+    def has_pending(self) -> bool:
+        """Return if there are rows waiting to be inserted."""
+        return bool(
+            self.states
+            or self.events
+            or self.state_attributes
+            or self.states_meta
+            or self.event_data
+            or self.event_types
+        )
+
+    def add(self, obj: Base) -> None:
+        """Add a new row to be inserted."""
+        if isinstance(obj, States):
+            self.states.append(obj)
+        elif isinstance(obj, Events):
+            self.events.append(obj)
+        elif isinstance(obj, StateAttributes):
+            self.state_attributes.append(obj)
+        elif isinstance(obj, StatesMeta):
+            self.states_meta.append(obj)
+        elif isinstance(obj, EventData):
+            self.event_data.append(obj)
+        elif isinstance(obj, EventTypes):
+            self.event_types.append(obj)
+        else:
+            raise TypeError(f"Unsupported object for bulk insert: {obj}")
+
+    def clear(self) -> None:
+        """Drop all pending rows."""
+        self.state_attributes = []
+        self.states_meta = []
+        self.event_data = []
+        self.event_types = []
+        self.events = []
+        self.states = []
+
+    def write(self, session: Session) -> None:
+        """Insert all pending rows in the current transaction of the session."""
+        conn = session.connection()
+        if self.state_attributes:
+            _insert_and_assign_ids(
+                conn,
+                StateAttributes.__table__,
+                self.state_attributes,
+                STATE_ATTRIBUTES_COLUMNS,
+                "shared_attrs",
+            )
+        if self.states_meta:
+            _insert_and_assign_ids(
+                conn,
+                StatesMeta.__table__,
+                self.states_meta,
+                STATES_META_COLUMNS,
+                "entity_id",
+            )
+        if self.event_data:
+            _insert_and_assign_ids(
+                conn,
+                EventData.__table__,
+                self.event_data,
+                EVENT_DATA_COLUMNS,
+                "shared_data",
+            )
+        if self.event_types:
+            _insert_and_assign_ids(
+                conn,
+                EventTypes.__table__,
+                self.event_types,
+                EVENT_TYPES_COLUMNS,
+                "event_type",
+            )
+        if self.events:
+            for dbevent in self.events:
+                if (event_data := dbevent.event_data_rel) is not None:
+                    dbevent.data_id = event_data.data_id
+                if (event_types := dbevent.event_type_rel) is not None:
+                    dbevent.event_type_id = event_types.event_type_id
+            # Nothing references new events, so their ids are not needed
+            conn.execute(insert(Events.__table__), _rows(self.events, EVENTS_COLUMNS))
+        for dbstate in self.states:
+            if (states_meta := dbstate.states_meta_rel) is not None:
+                dbstate.metadata_id = states_meta.metadata_id
+        for generation in _state_generations(self.states):
+            for dbstate in generation:
+                if (state_attributes := dbstate.state_attributes) is not None:
+                    dbstate.attributes_id = state_attributes.attributes_id
+                if (old_state := dbstate.old_state) is not None:
+                    dbstate.old_state_id = old_state.state_id
+            _insert_and_assign_ids(
+                conn, States.__table__, generation, STATES_COLUMNS, "metadata_id"
+            )
+        self.clear()
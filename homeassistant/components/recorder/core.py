@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
@@ -11,7 +11,7 @@ import queue
 import sqlite3
 import threading
 import time
-from typing import Any, TypeVar, cast
+from typing import Any, TypeVar
 
 import async_timeout
 from lru import LRU  # pylint: disable=no-name-in-module
@@ -20,6 +20,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -29,7 +30,7 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 from homeassistant.helpers.event import (
     async_track_time_change,
     async_track_time_interval,
@@ -41,6 +42,7 @@ from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 
 from . import migration, statistics
+from .bulk_insert import BulkInserter
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -50,6 +52,7 @@ from .const import (
     MAX_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
@@ -58,8 +61,10 @@ from .db_schema import (
     Base,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
     Statistics,
     StatisticsRuns,
     StatisticsShortTerm,
@@ -73,20 +78,32 @@ from .models import (
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import find_shared_attributes_id, find_shared_data_id
+from .queries import (
+    find_latest_shared_attributes,
+    find_latest_shared_data,
+    find_shared_attributes_ids,
+    find_shared_data_ids,
+)
 from .run_history import RunHistory
+from .table_managers.event_types import EventTypeManager
+from .table_managers.states_meta import StatesMetaManager
 from .tasks import (
     AdjustStatisticsTask,
     ChangeStatisticsUnitTask,
     ClearStatisticsTask,
     CommitTask,
+    CompileMissingStatisticsTask,
     DatabaseLockTask,
+    EntityIDMigrationTask,
     EventTask,
+    EventTypeIDMigrationTask,
     ImportStatisticsTask,
     KeepAliveTask,
+    PartitionTablesTask,
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
+    StatisticsRollupsTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -95,8 +112,10 @@ from .tasks import (
 )
 from .util import (
     build_mysqldb_conv,
+    chunked,
     dburl_to_path,
     end_incomplete_runs,
+    execute_stmt_lambda_element,
     is_second_sunday,
     move_away_broken_database,
     session_scope,
@@ -124,6 +143,10 @@ EXPIRE_AFTER_COMMITS = 120
 STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 EVENT_DATA_ID_CACHE_SIZE = 2048
 
+# The attribute and event data ids of the states and events recorded
+# in this window before startup are loaded into the caches
+SHARED_IDS_WARM_UP_WINDOW = timedelta(days=1)
+
 SHUTDOWN_TASK = object()
 
 COMMIT_TASK = CommitTask()
@@ -159,6 +182,9 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
         exclude_attributes_by_domain: dict[str, set[str]],
+        bulk_insert: bool = False,
+        bulk_purge: bool = False,
+        partition_tables: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -191,11 +217,37 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._old_states: dict[str, States] = {}
+        # The attributes of the last state of each entity and their shared
+        # attributes, so unchanged attributes are not serialized again
+        self._last_shared_attrs: dict[str, tuple[Mapping[str, Any], bytes]] = {}
         self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
         self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
         self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_event_data: dict[str, EventData] = {}
+        # Attributes and data which are not cached are looked up in the
+        # database at the next commit, these map them to their hash and
+        # the new rows which use them
+        self._unresolved_state_attributes: dict[str, tuple[int, list[States]]] = {}
+        self._unresolved_event_data: dict[str, tuple[int, list[Events]]] = {}
         self._pending_expunge: list[States] = []
+        self.event_type_manager = EventTypeManager(self)
+        self.states_meta_manager = StatesMetaManager(self)
+        self.statistics_accumulator = statistics.HourlyStatisticsAccumulator()
+        # The day and month statistics rollups are only used for queries once
+        # they have been checked, or rebuilt, for the current time zone
+        self.statistics_rollups_active = False
+        # When bulk insert is enabled, new rows are written with executemany
+        # inserts at commit time instead of being flushed by the event session
+        self._bulk_inserter: BulkInserter | None = (
+            BulkInserter() if bulk_insert else None
+        )
+        # When bulk purge is enabled, old rows are purged with set-based
+        # deletes by time instead of deletes of selected ids
+        self.bulk_purge = bulk_purge
+        # When table partitioning is enabled, the states and events tables
+        # are range partitioned by day and purged by dropping partitions
+        self.partition_tables = partition_tables
+        self.tables_partitioned = False
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
@@ -459,6 +511,9 @@ class Recorder(threading.Thread):
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
+        if self.tables_partitioned:
+            # Create the partitions for the upcoming days
+            self.queue_task(PartitionTablesTask())
         if self.auto_purge:
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
@@ -478,6 +533,12 @@ class Recorder(threading.Thread):
         start = statistics.get_start_time()
         self.queue_task(StatisticsTask(start, True))
 
+    @callback
+    def async_rebuild_statistics_rollups(self) -> None:
+        """Stop using the statistics rollups until they are rebuilt."""
+        self.statistics_rollups_active = False
+        self.queue_task(StatisticsRollupsTask())
+
     @callback
     def async_adjust_statistics(
         self,
@@ -652,7 +713,14 @@ class Recorder(threading.Thread):
 
         # Catch up with missed statistics
         with session_scope(session=self.get_session()) as session:
+            self._activate_table_managers_or_migrate(session)
             self._schedule_compile_missing_statistics(session)
+            self._warm_up_shared_ids_caches(session)
+        if self.schema_version >= 35:
+            # The rollup tables were added in schema 35
+            self.queue_task(StatisticsRollupsTask())
+        if self.partition_tables:
+            self._schedule_partition_tables()
 
         _LOGGER.debug("Recorder processing the queue")
         self.hass.add_job(self._async_set_recorder_ready_migration_done)
@@ -780,6 +848,24 @@ class Recorder(threading.Thread):
             self.backlog,
         )
 
+    def _activate_table_managers_or_migrate(self, session: Session) -> None:
+        """Activate the table managers or schedule the migrations to fill them."""
+        if self.schema_version < 34:
+            # The lookup tables were added in schema 34
+            return
+
+        if migration.needs_event_type_id_migration(session):
+            self.queue_task(EventTypeIDMigrationTask())
+        else:
+            _LOGGER.debug("Activating event_types manager as all data is migrated")
+            self.event_type_manager.active = True
+
+        if migration.needs_entity_id_migration(session):
+            self.queue_task(EntityIDMigrationTask())
+        else:
+            _LOGGER.debug("Activating states_meta manager as all data is migrated")
+            self.states_meta_manager.active = True
+
     def _process_one_event(self, event: Event) -> None:
         if not self.enabled:
             return
@@ -791,48 +877,171 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
-    def _find_shared_attr_in_db(self, attr_hash: int, shared_attrs: str) -> int | None:
-        """Find shared attributes in the db from the hash and shared_attrs."""
+    def _warm_up_shared_ids_caches(self, session: Session) -> None:
+        """Load the ids of recently used attributes and event data into the caches.
+
+        The attributes of the latest state of each entity and the data of
+        the latest event of each event type are loaded so the caches do
+        not start empty.
+        """
+        start_time_ts = dt_util.utc_to_timestamp(
+            dt_util.utcnow() - SHARED_IDS_WARM_UP_WINDOW
+        )
+        for attributes_id, shared_attrs in execute_stmt_lambda_element(
+            session,
+            find_latest_shared_attributes(
+                start_time_ts, STATE_ATTRIBUTES_ID_CACHE_SIZE
+            ),
+        ):
+            self._state_attributes_ids[shared_attrs] = attributes_id
+        for data_id, shared_data in execute_stmt_lambda_element(
+            session, find_latest_shared_data(start_time_ts, EVENT_DATA_ID_CACHE_SIZE)
+        ):
+            self._event_data_ids[shared_data] = data_id
+        _LOGGER.debug(
+            "Loaded %s attributes ids and %s data ids into the caches",
+            len(self._state_attributes_ids),
+            len(self._event_data_ids),
+        )
+
+    def _find_shared_ids_in_db(
+        self,
+        find_ids: Callable[[Iterable[int]], StatementLambdaElement],
+        hashes: Iterable[int],
+    ) -> dict[str, int]:
+        """Find the ids of shared attributes or data in the db from their hashes."""
         #
         # Avoid the event session being flushed since it will
         # commit all the pending events and states to the database.
         #
         # The lookup has already have checked to see if the data is cached
-        # or going to be written in the next commit so there is no
-        # need to flush before checking the database.
+        # so there is no need to flush before checking the database.
         #
         assert self.event_session is not None
+        ids: dict[str, int] = {}
         with self.event_session.no_autoflush:
-            if attributes_id := self.event_session.execute(
-                find_shared_attributes_id(attr_hash, shared_attrs)
-            ).first():
-                return cast(int, attributes_id[0])
-        return None
+            for hashes_chunk in chunked(hashes, SQLITE_MAX_BIND_VARS):
+                for row_id, shared in execute_stmt_lambda_element(
+                    self.event_session, find_ids(hashes_chunk)
+                ):
+                    ids[shared] = row_id
+        return ids
+
+    def _resolve_shared_attrs_and_data(self) -> None:
+        """Set the attributes and data of the new rows that were not cached.
+
+        They are looked up with one query per commit instead of one query
+        per new row. Attributes and data which are not found in the
+        database are saved with the new rows.
+        """
+        if unresolved_attributes := self._unresolved_state_attributes:
+            attributes_ids = self._find_shared_ids_in_db(
+                find_shared_attributes_ids,
+                {attr_hash for attr_hash, _ in unresolved_attributes.values()},
+            )
+            for shared_attrs, (attr_hash, dbstates) in unresolved_attributes.items():
+                # Matching attributes found in the database
+                if attributes_id := attributes_ids.get(shared_attrs):
+                    self._state_attributes_ids[shared_attrs] = attributes_id
+                    for dbstate in dbstates:
+                        dbstate.attributes_id = attributes_id
+                    continue
+                # No matching attributes found, save them in the DB
+                dbstate_attributes = StateAttributes(
+                    shared_attrs=shared_attrs, hash=attr_hash
+                )
+                self._pending_state_attributes[shared_attrs] = dbstate_attributes
+                self._add_to_event_session(dbstate_attributes)
+                for dbstate in dbstates:
+                    dbstate.state_attributes = dbstate_attributes
+            # Only forget the attributes once the rows are resolved, so they
+            # are looked up again when the query fails and the commit is retried
+            self._unresolved_state_attributes = {}
+
+        if unresolved_data := self._unresolved_event_data:
+            data_ids = self._find_shared_ids_in_db(
+                find_shared_data_ids,
+                {data_hash for data_hash, _ in unresolved_data.values()},
+            )
+            for shared_data, (data_hash, dbevents) in unresolved_data.items():
+                # Matching data found in the database
+                if data_id := data_ids.get(shared_data):
+                    self._event_data_ids[shared_data] = data_id
+                    for dbevent in dbevents:
+                        dbevent.data_id = data_id
+                    continue
+                # No matching data found, save it in the DB
+                dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
+                self._pending_event_data[shared_data] = dbevent_data
+                self._add_to_event_session(dbevent_data)
+                for dbevent in dbevents:
+                    dbevent.event_data_rel = dbevent_data
+            self._unresolved_event_data = {}
+
+    def _add_to_event_session(self, obj: Base) -> None:
+        """Add a new row to the event session or the bulk inserter."""
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.add(obj)
+            return
+        assert self.event_session is not None
+        self.event_session.add(obj)
 
-    def _find_shared_data_in_db(self, data_hash: int, shared_data: str) -> int | None:
-        """Find shared event data in the db from the hash and shared_attrs."""
-        #
-        # Avoid the event session being flushed since it will
-        # commit all the pending events and states to the database.
-        #
-        # The lookup has already have checked to see if the data is cached
-        # or going to be written in the next commit so there is no
-        # need to flush before checking the database.
-        #
+    def _process_event_type_into_session(self, dbevent: Events, event: Event) -> None:
+        """Set the event_type_id of a new event row."""
         assert self.event_session is not None
-        with self.event_session.no_autoflush:
-            if data_id := self.event_session.execute(
-                find_shared_data_id(data_hash, shared_data)
-            ).first():
-                return cast(int, data_id[0])
-        return None
+        event_type_manager = self.event_type_manager
+        event_type = event.event_type
+        # Matching event type found in the pending commit
+        if pending_event_types := event_type_manager.get_pending(event_type):
+            dbevent.event_type_rel = pending_event_types
+        # Matching event type id found in the cache or the database
+        elif event_type_id := event_type_manager.get(
+            event_type, self.event_session, True
+        ):
+            dbevent.event_type_id = event_type_id
+        # No matching event type found, save it in the DB
+        else:
+            dbevent_types = EventTypes(event_type=event_type)
+            event_type_manager.add_pending(event_type, dbevent_types)
+            dbevent.event_type_rel = dbevent_types
+            self._add_to_event_session(dbevent_types)
+        # Once all rows have been migrated to event_type_id
+        # the event_type string is no longer stored
+        if event_type_manager.active:
+            dbevent.event_type = None
+
+    def _process_states_meta_into_session(
+        self, dbstate: States, entity_id: str
+    ) -> None:
+        """Set the metadata_id of a new state row."""
+        assert self.event_session is not None
+        states_meta_manager = self.states_meta_manager
+        # Matching entity_id found in the pending commit
+        if pending_states_meta := states_meta_manager.get_pending(entity_id):
+            dbstate.states_meta_rel = pending_states_meta
+        # Matching metadata_id found in the cache or the database
+        elif metadata_id := states_meta_manager.get(
+            entity_id, self.event_session, True
+        ):
+            dbstate.metadata_id = metadata_id
+        # No matching entity_id found, save it in the DB
+        else:
+            dbstates_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(entity_id, dbstates_meta)
+            dbstate.states_meta_rel = dbstates_meta
+            self._add_to_event_session(dbstates_meta)
+        # Once all rows have been migrated to metadata_id
+        # the entity_id string is no longer stored
+        if states_meta_manager.active:
+            dbstate.entity_id = None
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         assert self.event_session is not None
         dbevent = Events.from_event(event)
         if not event.data:
-            self.event_session.add(dbevent)
+            self._process_event_type_into_session(dbevent, event)
+            self._add_to_event_session(dbevent)
             return
 
         try:
@@ -844,35 +1053,53 @@ class Recorder(threading.Thread):
             return
 
         shared_data = shared_data_bytes.decode("utf-8")
-        # Matching attributes found in the pending commit
-        if pending_event_data := self._pending_event_data.get(shared_data):
-            dbevent.event_data_rel = pending_event_data
-        # Matching attributes id found in the cache
-        elif data_id := self._event_data_ids.get(shared_data):
+        # Matching data id found in the cache
+        if data_id := self._event_data_ids.get(shared_data):
             dbevent.data_id = data_id
+        # Matching data is already waiting to be looked up
+        elif unresolved_event_data := self._unresolved_event_data.get(shared_data):
+            unresolved_event_data[1].append(dbevent)
+        # Look up the data in the database with the next commit
         else:
-            data_hash = EventData.hash_shared_data_bytes(shared_data_bytes)
-            # Matching attributes found in the database
-            if data_id := self._find_shared_data_in_db(data_hash, shared_data):
-                self._event_data_ids[shared_data] = dbevent.data_id = data_id
-            # No matching attributes found, save them in the DB
-            else:
-                dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
-                dbevent.event_data_rel = self._pending_event_data[
-                    shared_data
-                ] = dbevent_data
-                self.event_session.add(dbevent_data)
+            self._unresolved_event_data[shared_data] = (
+                EventData.hash_shared_data_bytes(shared_data_bytes),
+                [dbevent],
+            )
+
+        self._process_event_type_into_session(dbevent, event)
+        self._add_to_event_session(dbevent)
 
-        self.event_session.add(dbevent)
+    def _shared_attrs_bytes_from_event(self, event: Event) -> bytes:
+        """Return the shared attributes of a state_changed event.
+
+        The state machine reuses the attributes of the old state when they
+        have not changed, so they are only serialized when they are not
+        the same object as the attributes of the last recorded state.
+        """
+        entity_id: str = event.data["entity_id"]
+        new_state: State | None = event.data.get("new_state")
+        if new_state is None:
+            self._last_shared_attrs.pop(entity_id, None)
+        elif (
+            last_shared_attrs := self._last_shared_attrs.get(entity_id)
+        ) and last_shared_attrs[0] is new_state.attributes:
+            return last_shared_attrs[1]
+        shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+            event, self._exclude_attributes_by_domain, self.dialect_name
+        )
+        if new_state is not None:
+            self._last_shared_attrs[entity_id] = (
+                new_state.attributes,
+                shared_attrs_bytes,
+            )
+        return shared_attrs_bytes
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
         assert self.event_session is not None
         try:
             dbstate = States.from_event(event)
-            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
-                event, self._exclude_attributes_by_domain, self.dialect_name
-            )
+            shared_attrs_bytes = self._shared_attrs_bytes_from_event(event)
         except JSON_ENCODE_EXCEPTIONS as ex:
             _LOGGER.warning(
                 "State is not JSON serializable: %s: %s",
@@ -883,38 +1110,34 @@ class Recorder(threading.Thread):
 
         shared_attrs = shared_attrs_bytes.decode("utf-8")
         dbstate.attributes = None
-        # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
-            dbstate.state_attributes = pending_attributes
         # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
             dbstate.attributes_id = attributes_id
+        # Matching attributes are already waiting to be looked up
+        elif unresolved_attributes := self._unresolved_state_attributes.get(
+            shared_attrs
+        ):
+            unresolved_attributes[1].append(dbstate)
+        # Look up the attributes in the database with the next commit
         else:
-            attr_hash = StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
-            # Matching attributes found in the database
-            if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
-                dbstate.attributes_id = attributes_id
-                self._state_attributes_ids[shared_attrs] = attributes_id
-            # No matching attributes found, save them in the DB
-            else:
-                dbstate_attributes = StateAttributes(
-                    shared_attrs=shared_attrs, hash=attr_hash
-                )
-                dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+            self._unresolved_state_attributes[shared_attrs] = (
+                StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes),
+                [dbstate],
+            )
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
+        entity_id: str = event.data["entity_id"]
+        self._process_states_meta_into_session(dbstate, entity_id)
+        if old_state := self._old_states.pop(entity_id, None):
             if old_state.state_id:
                 dbstate.old_state_id = old_state.state_id
             else:
                 dbstate.old_state = old_state
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
+            self._old_states[entity_id] = dbstate
             self._pending_expunge.append(dbstate)
         else:
             dbstate.state = None
-        self.event_session.add(dbstate)
+        self._add_to_event_session(dbstate)
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -927,6 +1150,8 @@ class Recorder(threading.Thread):
         return False
 
     def _event_session_has_pending_writes(self) -> bool:
+        if self._bulk_inserter is not None and self._bulk_inserter.has_pending:
+            return True
         return bool(
             self.event_session and (self.event_session.new or self.event_session.dirty)
         )
@@ -957,6 +1182,9 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         self._commits_without_expire += 1
 
+        self._resolve_shared_attrs_and_data()
+        if self._bulk_inserter is not None and self._bulk_inserter.has_pending:
+            self._bulk_inserter.write(self.event_session)
         self.event_session.commit()
         if self._pending_expunge:
             for dbstate in self._pending_expunge:
@@ -978,6 +1206,8 @@ class Recorder(threading.Thread):
         for event_data in self._pending_event_data.values():
             self._event_data_ids[event_data.shared_data] = event_data.data_id
         self._pending_event_data = {}
+        self.event_type_manager.post_commit_pending()
+        self.states_meta_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1002,6 +1232,12 @@ class Recorder(threading.Thread):
         self._event_data_ids = {}
         self._pending_state_attributes = {}
         self._pending_event_data = {}
+        self._unresolved_state_attributes = {}
+        self._unresolved_event_data = {}
+        self.event_type_manager.reset()
+        self.states_meta_manager.reset()
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.clear()
 
         if not self.event_session:
             return
@@ -1030,6 +1266,46 @@ class Recorder(threading.Thread):
             self.engine, self.event_session, old_version, new_version
         )
 
+    def _migrate_event_type_ids(self) -> bool:
+        """Migrate a batch of event types to event_type_ids.
+
+        Returns True once all events have been migrated.
+        """
+        if not migration.migrate_event_type_ids(self):
+            return False
+        _LOGGER.debug("Activating event_types manager as all data is migrated")
+        self.event_type_manager.active = True
+        migration.post_migrate_event_type_ids(self)
+        return True
+
+    def _migrate_entity_ids(self) -> bool:
+        """Migrate a batch of entity_ids to metadata_ids.
+
+        Returns True once all states have been migrated.
+        """
+        if not migration.migrate_entity_ids(self):
+            return False
+        _LOGGER.debug("Activating states_meta manager as all data is migrated")
+        self.states_meta_manager.active = True
+        migration.post_migrate_entity_ids(self)
+        return True
+
+    def _schedule_partition_tables(self) -> None:
+        """Schedule partitioning the tables if the database supports it."""
+        if self.dialect_name != SupportedDialect.POSTGRESQL:
+            # MySQL and MariaDB can not range partition on the
+            # double precision timestamp columns
+            _LOGGER.warning(
+                "Table partitioning is only supported with PostgreSQL, "
+                "the states and events tables will not be partitioned"
+            )
+            return
+        self.queue_task(PartitionTablesTask())
+
+    def _partition_tables(self) -> None:
+        """Partition the tables and create the upcoming partitions."""
+        self.tables_partitioned = migration.partition_tables(self)
+
     def _send_keep_alive(self) -> None:
         """Send a keep alive to keep the db connection open."""
         assert self.event_session is not None
@@ -1201,11 +1477,14 @@ class Recorder(threading.Thread):
         if last_run := session.query(func.max(StatisticsRuns.start)).scalar():
             start = max(start, process_timestamp(last_run) + timedelta(minutes=5))
 
-        # Add tasks
+        # Add tasks, one for each hour so the missed periods are compiled
+        # in order before the periodic statistics task of a new period
         while start < last_period:
-            end = start + timedelta(minutes=5)
+            end = min(last_period, start.replace(minute=0) + timedelta(hours=1))
             _LOGGER.debug("Compiling missing statistics for %s-%s", start, end)
-            self.queue_task(StatisticsTask(start, end >= last_period))
+            self.queue_task(
+                CompileMissingStatisticsTask(start, end, end >= last_period)
+            )
             start = end
 
     def _end_session(self) -> None:
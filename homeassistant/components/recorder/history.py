@@ -1,32 +1,41 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Iterator, MutableMapping
+from collections.abc import Callable, Iterable, Iterator, MutableMapping, Sequence
 from datetime import datetime
 from itertools import groupby
 import logging
+import math
 import time
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
-from sqlalchemy import Column, Text, and_, func, lambda_stmt, or_, select
+from sqlalchemy import Column, Text, and_, func, lambda_stmt, or_, select, union_all
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.lambdas import StatementLambdaElement
-from sqlalchemy.sql.selectable import Subquery
+from sqlalchemy.sql.selectable import CompoundSelect, Select, Subquery
 
-from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
-from homeassistant.core import HomeAssistant, State, split_entity_id
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
+from homeassistant.core import HomeAssistant, State, callback, split_entity_id
+from homeassistant.helpers.json import json_bytes
 import homeassistant.util.dt as dt_util
 
 from .. import recorder
-from .db_schema import RecorderRuns, StateAttributes, States
+from .db_schema import RecorderRuns, StateAttributes, States, StatesMeta
 from .filters import Filters
 from .models import (
     LazyState,
     LazyStatePreSchema31,
+    decode_attributes,
     process_datetime_to_timestamp,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -40,6 +49,15 @@ _LOGGER = logging.getLogger(__name__)
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+# Number of rows fetched at once when streaming states
+STREAM_CHUNK_SIZE = 4096
+
+# Maximum number of state changes requests combined into one query,
+# each request is a part of the union with up to four bound parameters
+MAX_REQUESTS_PER_STATE_CHANGES_QUERY = 200
+
+DATA_STATE_CHANGES_PRELOADER = "recorder_state_changes_preloader"
+
 SIGNIFICANT_DOMAINS = {
     "climate",
     "device_tracker",
@@ -60,13 +78,13 @@ NEED_ATTRIBUTE_DOMAINS = {
 
 
 _BASE_STATES = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
     States.last_changed_ts,
     States.last_updated_ts,
 ]
 _BASE_STATES_NO_LAST_CHANGED = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
     literal(value=None).label("last_changed_ts"),
     States.last_updated_ts,
@@ -81,6 +99,28 @@ _QUERY_STATE_NO_ATTR_NO_LAST_CHANGED = [
     literal(value=None, type_=Text).label("attributes"),
     literal(value=None, type_=Text).label("shared_attrs"),
 ]
+_BASE_STATES_PRE_SCHEMA_34 = [
+    States.entity_id,
+    States.state,
+    States.last_changed_ts,
+    States.last_updated_ts,
+]
+_BASE_STATES_NO_LAST_CHANGED_PRE_SCHEMA_34 = [
+    States.entity_id,
+    States.state,
+    literal(value=None).label("last_changed_ts"),
+    States.last_updated_ts,
+]
+_QUERY_STATE_NO_ATTR_PRE_SCHEMA_34 = [
+    *_BASE_STATES_PRE_SCHEMA_34,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+]
+_QUERY_STATE_NO_ATTR_NO_LAST_CHANGED_PRE_SCHEMA_34 = [
+    *_BASE_STATES_NO_LAST_CHANGED_PRE_SCHEMA_34,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+]
 _BASE_STATES_PRE_SCHEMA_31 = [
     States.entity_id,
     States.state,
@@ -140,10 +180,45 @@ _QUERY_STATES_NO_LAST_CHANGED = [
     States.attributes,
     StateAttributes.shared_attrs,
 ]
+_QUERY_STATES_PRE_SCHEMA_34 = [
+    *_BASE_STATES_PRE_SCHEMA_34,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+]
+_QUERY_STATES_NO_LAST_CHANGED_PRE_SCHEMA_34 = [
+    *_BASE_STATES_NO_LAST_CHANGED_PRE_SCHEMA_34,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+]
 
 
 def _schema_version(hass: HomeAssistant) -> int:
-    return recorder.get_instance(hass).schema_version
+    """Return the schema version to build the queries for.
+
+    Until the background migration has set the metadata_id
+    of all states, the queries still use the entity_id strings
+    as they did before schema version 34.
+    """
+    instance = recorder.get_instance(hass)
+    schema_version = instance.schema_version
+    if schema_version >= 34 and not instance.states_meta_manager.active:
+        return 33
+    return schema_version
+
+
+def _metadata_ids(
+    hass: HomeAssistant, session: Session, entity_ids: Iterable[str]
+) -> list[int]:
+    """Return the metadata_ids of the entity_ids which have states."""
+    return [
+        metadata_id
+        for metadata_id in recorder.get_instance(hass)
+        .states_meta_manager.get_many(entity_ids, session)
+        .values()
+        if metadata_id is not None
+    ]
 
 
 def lambda_stmt_and_join_attributes(
@@ -158,14 +233,36 @@ def lambda_stmt_and_join_attributes(
     # without the attributes fields and do not join the
     # state_attributes table
     if no_attributes:
+        if schema_version >= 34:
+            if include_last_changed:
+                return (
+                    lambda_stmt(
+                        lambda: select(*_QUERY_STATE_NO_ATTR)
+                        .select_from(States)
+                        .outerjoin(
+                            StatesMeta, States.metadata_id == StatesMeta.metadata_id
+                        )
+                    ),
+                    False,
+                )
+            return (
+                lambda_stmt(
+                    lambda: select(*_QUERY_STATE_NO_ATTR_NO_LAST_CHANGED)
+                    .select_from(States)
+                    .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                ),
+                False,
+            )
         if schema_version >= 31:
             if include_last_changed:
                 return (
-                    lambda_stmt(lambda: select(*_QUERY_STATE_NO_ATTR)),
+                    lambda_stmt(lambda: select(*_QUERY_STATE_NO_ATTR_PRE_SCHEMA_34)),
                     False,
                 )
             return (
-                lambda_stmt(lambda: select(*_QUERY_STATE_NO_ATTR_NO_LAST_CHANGED)),
+                lambda_stmt(
+                    lambda: select(*_QUERY_STATE_NO_ATTR_NO_LAST_CHANGED_PRE_SCHEMA_34)
+                ),
                 False,
             )
         if include_last_changed:
@@ -193,10 +290,31 @@ def lambda_stmt_and_join_attributes(
             False,
         )
 
+    if schema_version >= 34:
+        if include_last_changed:
+            return (
+                lambda_stmt(
+                    lambda: select(*_QUERY_STATES)
+                    .select_from(States)
+                    .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                ),
+                True,
+            )
+        return (
+            lambda_stmt(
+                lambda: select(*_QUERY_STATES_NO_LAST_CHANGED)
+                .select_from(States)
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            ),
+            True,
+        )
     if schema_version >= 31:
         if include_last_changed:
-            return lambda_stmt(lambda: select(*_QUERY_STATES)), True
-        return lambda_stmt(lambda: select(*_QUERY_STATES_NO_LAST_CHANGED)), True
+            return lambda_stmt(lambda: select(*_QUERY_STATES_PRE_SCHEMA_34)), True
+        return (
+            lambda_stmt(lambda: select(*_QUERY_STATES_NO_LAST_CHANGED_PRE_SCHEMA_34)),
+            True,
+        )
     # Finally if no migration is in progress and no_attributes
     # was not requested, we query both attributes columns and
     # join state_attributes
@@ -238,6 +356,18 @@ def get_significant_states(
 
 
 def _ignore_domains_filter(query: Query) -> Query:
+    """Add a filter to ignore domains we do not fetch history for."""
+    return query.filter(
+        and_(
+            *[
+                ~StatesMeta.entity_id.like(entity_domain)
+                for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
+            ]
+        )
+    )
+
+
+def _ignore_domains_filter_pre_schema_34(query: Query) -> Query:
     """Add a filter to ignore domains we do not fetch history for."""
     return query.filter(
         and_(
@@ -254,6 +384,7 @@ def _significant_states_stmt(
     start_time: datetime,
     end_time: datetime | None,
     entity_ids: list[str] | None,
+    metadata_ids: list[int] | None,
     filters: Filters | None,
     significant_changes_only: bool,
     no_attributes: bool,
@@ -277,7 +408,20 @@ def _significant_states_stmt(
             (States.last_changed == States.last_updated) | States.last_changed.is_(None)
         )
     elif significant_changes_only:
-        if schema_version >= 31:
+        if schema_version >= 34:
+            stmt += lambda q: q.filter(
+                or_(
+                    *[
+                        StatesMeta.entity_id.like(entity_domain)
+                        for entity_domain in SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE
+                    ],
+                    (
+                        (States.last_changed_ts == States.last_updated_ts)
+                        | States.last_changed_ts.is_(None)
+                    ),
+                )
+            )
+        elif schema_version >= 31:
             stmt += lambda q: q.filter(
                 or_(
                     *[
@@ -304,10 +448,20 @@ def _significant_states_stmt(
                 )
             )
 
-    if entity_ids:
+    if schema_version >= 34:
+        if entity_ids:
+            stmt += lambda q: q.filter(States.metadata_id.in_(metadata_ids))
+        else:
+            stmt += _ignore_domains_filter
+            if filters and filters.has_config:
+                entity_filter = filters.states_metadata_entity_filter()
+                stmt = stmt.add_criteria(
+                    lambda q: q.filter(entity_filter), track_on=[filters]
+                )
+    elif entity_ids:
         stmt += lambda q: q.filter(States.entity_id.in_(entity_ids))
     else:
-        stmt += _ignore_domains_filter
+        stmt += _ignore_domains_filter_pre_schema_34
         if filters and filters.has_config:
             entity_filter = filters.states_entity_filter()
             stmt = stmt.add_criteria(
@@ -329,7 +483,9 @@ def _significant_states_stmt(
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    if schema_version >= 31:
+    if schema_version >= 34:
+        stmt += lambda q: q.order_by(States.metadata_id, States.last_updated_ts)
+    elif schema_version >= 31:
         stmt += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
     else:
         stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -360,11 +516,17 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    schema_version = _schema_version(hass)
+    metadata_ids: list[int] | None = None
+    if entity_ids and schema_version >= 34:
+        if not (metadata_ids := _metadata_ids(hass, session, entity_ids)):
+            return {}
     stmt = _significant_states_stmt(
-        _schema_version(hass),
+        schema_version,
         start_time,
         end_time,
         entity_ids,
+        metadata_ids,
         filters,
         significant_changes_only,
         no_attributes,
@@ -424,6 +586,7 @@ def _state_changed_during_period_stmt(
     start_time: datetime,
     end_time: datetime | None,
     entity_id: str | None,
+    metadata_id: int | None,
     no_attributes: bool,
     descending: bool,
     limit: int | None,
@@ -454,21 +617,29 @@ def _state_changed_during_period_stmt(
             stmt += lambda q: q.filter(States.last_updated_ts < end_time_ts)
         else:
             stmt += lambda q: q.filter(States.last_updated < end_time)
-    if entity_id:
+    if metadata_id:
+        stmt += lambda q: q.filter(States.metadata_id == metadata_id)
+    elif entity_id:
         stmt += lambda q: q.filter(States.entity_id == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
     if descending:
-        if schema_version >= 31:
+        if schema_version >= 34:
+            stmt += lambda q: q.order_by(
+                States.metadata_id, States.last_updated_ts.desc()
+            )
+        elif schema_version >= 31:
             stmt += lambda q: q.order_by(
                 States.entity_id, States.last_updated_ts.desc()
             )
         else:
             stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc())
     else:
-        if schema_version >= 31:
+        if schema_version >= 34:
+            stmt += lambda q: q.order_by(States.metadata_id, States.last_updated_ts)
+        elif schema_version >= 31:
             stmt += lambda q: q.order_by(States.entity_id, States.last_updated_ts)
         else:
             stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -492,11 +663,18 @@ def state_changes_during_period(
     entity_ids = [entity_id] if entity_id is not None else None
 
     with session_scope(hass=hass) as session:
+        schema_version = _schema_version(hass)
+        metadata_id: int | None = None
+        if entity_id and schema_version >= 34:
+            if not (metadata_ids := _metadata_ids(hass, session, [entity_id])):
+                return {}
+            metadata_id = metadata_ids[0]
         stmt = _state_changed_during_period_stmt(
-            _schema_version(hass),
+            schema_version,
             start_time,
             end_time,
             entity_id,
+            metadata_id,
             no_attributes,
             descending,
             limit,
@@ -517,8 +695,273 @@ def state_changes_during_period(
         )
 
 
+class StateChangesRequest(NamedTuple):
+    """A request for the state changes of an entity after start_time.
+
+    If limit is set, only the last limit state changes are returned. If
+    include_start_time_state is set, the state at start_time is returned
+    first, like state_changes_during_period does.
+    """
+
+    entity_id: str
+    start_time: datetime
+    limit: int | None = None
+    include_start_time_state: bool = False
+
+
+def _state_changes_many_stmt(
+    requests: list[tuple[int, int, float, int | None]]
+) -> CompoundSelect:
+    """Return the statement for the state changes of many entities.
+
+    requests is a list of (index, metadata_id, start_time_ts, limit). Each
+    request is a subquery of the union with its own start time and limit,
+    so it can use the metadata_id and last_updated_ts index and only reads
+    the rows it returns. The rows are labeled with the index of their
+    request.
+    """
+    subqueries = []
+    for index, metadata_id, start_time_ts, limit in requests:
+        stmt = (
+            select(
+                literal(index).label("request_index"),
+                StatesMeta.entity_id,
+                States.state,
+                literal(value=None).label("last_changed_ts"),
+                States.last_updated_ts,
+                States.attributes,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .filter(
+                (
+                    (States.last_changed_ts == States.last_updated_ts)
+                    | States.last_changed_ts.is_(None)
+                )
+                & (States.metadata_id == metadata_id)
+                & (States.last_updated_ts > start_time_ts)
+            )
+            .order_by(States.last_updated_ts.desc())
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+        # Not all databases allow ORDER BY and LIMIT in the parts of a union
+        subqueries.append(select(stmt.subquery()))
+    return union_all(*subqueries)
+
+
+def _start_time_states_many_stmt(requests: list[tuple[int, float]]) -> Select:
+    """Return the statement for the states of many entities at their start times.
+
+    requests is a list of (metadata_id, start_time_ts). The state of each
+    request is the last state of the entity before its start time.
+    """
+    conditions = []
+    for metadata_id, start_time_ts in requests:
+        last_updated_ts = (
+            select(func.max(States.last_updated_ts))
+            .filter(
+                (States.metadata_id == metadata_id)
+                & (States.last_updated_ts < start_time_ts)
+            )
+            .scalar_subquery()
+        )
+        conditions.append(
+            (States.metadata_id == metadata_id)
+            & (States.last_updated_ts == last_updated_ts)
+        )
+    return (
+        select(
+            StatesMeta.entity_id,
+            States.state,
+            literal(value=None).label("last_changed_ts"),
+            States.last_updated_ts,
+            States.attributes,
+            StateAttributes.shared_attrs,
+        )
+        .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .filter(or_(*conditions))
+    )
+
+
+def state_changes_during_period_many(
+    hass: HomeAssistant, requests: Sequence[StateChangesRequest]
+) -> list[list[State]]:
+    """Return the state changes of many entities with as few queries as possible.
+
+    The result contains the state changes of each request in ascending
+    order, after the state at the start time if the request includes it.
+    """
+    results: list[list[State]] = [[] for _ in requests]
+    if _schema_version(hass) < 34:
+        for result, request in zip(results, requests):
+            entity_id = request.entity_id.lower()
+            states = state_changes_during_period(
+                hass,
+                request.start_time,
+                entity_id=entity_id,
+                descending=True,
+                limit=request.limit,
+                include_start_time_state=request.include_start_time_state,
+            ).get(entity_id, [])
+            # The state at the start time is first and has the start time
+            # as last_updated, so sorting puts it back before the changes
+            result.extend(sorted(states, key=lambda state: state.last_updated))
+        return results
+
+    entity_ids = [request.entity_id.lower() for request in requests]
+    with session_scope(hass=hass) as session:
+        metadata_ids = recorder.get_instance(hass).states_meta_manager.get_many(
+            set(entity_ids), session
+        )
+        pending = [
+            (index, metadata_id, request)
+            for index, (entity_id, request) in enumerate(zip(entity_ids, requests))
+            if (metadata_id := metadata_ids.get(entity_id)) is not None
+        ]
+        attr_cache: dict[str, dict[str, Any]] = {}
+        for chunk_start in range(0, len(pending), MAX_REQUESTS_PER_STATE_CHANGES_QUERY):
+            chunk = pending[
+                chunk_start : chunk_start + MAX_REQUESTS_PER_STATE_CHANGES_QUERY
+            ]
+            rows_by_index: dict[int, list[Row]] = defaultdict(list)
+            for row in session.execute(
+                _state_changes_many_stmt(
+                    [
+                        (
+                            index,
+                            metadata_id,
+                            request.start_time.timestamp(),
+                            request.limit,
+                        )
+                        for index, metadata_id, request in chunk
+                    ]
+                )
+            ):
+                rows_by_index[row.request_index].append(row)
+            for index, rows in rows_by_index.items():
+                rows.sort(key=lambda row: row.last_updated_ts)
+                results[index].extend(LazyState(row, attr_cache, None) for row in rows)
+            if start_time_requests := [
+                (metadata_id, index, request)
+                for index, metadata_id, request in chunk
+                if request.include_start_time_state
+            ]:
+                _add_start_time_states(
+                    session, entity_ids, start_time_requests, attr_cache, results
+                )
+    return results
+
+
+def _add_start_time_states(
+    session: Session,
+    entity_ids: list[str],
+    requests: list[tuple[int, int, StateChangesRequest]],
+    attr_cache: dict[str, dict[str, Any]],
+    results: list[list[State]],
+) -> None:
+    """Insert the states at the start times before the state changes.
+
+    requests is a list of (metadata_id, index, request). The rows of an
+    entity can be the start state of several requests with different start
+    times, the start state of a request is the newest row before its start.
+    """
+    rows_by_entity_id: dict[str, list[Row]] = defaultdict(list)
+    for row in session.execute(
+        _start_time_states_many_stmt(
+            [
+                (metadata_id, request.start_time.timestamp())
+                for metadata_id, _, request in requests
+            ]
+        )
+    ):
+        rows_by_entity_id[row.entity_id].append(row)
+    for _, index, request in requests:
+        start_time_ts = request.start_time.timestamp()
+        if start_rows := [
+            row
+            for row in rows_by_entity_id[entity_ids[index]]
+            if row.last_updated_ts < start_time_ts
+        ]:
+            row = max(start_rows, key=lambda row: row.last_updated_ts)
+            results[index].insert(0, LazyState(row, attr_cache, request.start_time))
+
+
+class _StateChangesPreloader:
+    """Combine the state changes requests of an event loop iteration."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the preloader."""
+        self._hass = hass
+        self._pending: list[
+            tuple[StateChangesRequest, asyncio.Future[list[State]]]
+        ] = []
+
+    @callback
+    def async_request(
+        self, request: StateChangesRequest
+    ) -> asyncio.Future[list[State]]:
+        """Queue a request, it is loaded with all requests made until it runs."""
+        future: asyncio.Future[list[State]] = self._hass.loop.create_future()
+        if not self._pending:
+            self._hass.async_create_task(self._async_preload())
+        self._pending.append((request, future))
+        return future
+
+    async def _async_preload(self) -> None:
+        """Load the pending requests and fan out the results."""
+        pending, self._pending = self._pending, []
+        try:
+            results = await recorder.get_instance(self._hass).async_add_executor_job(
+                state_changes_during_period_many,
+                self._hass,
+                [request for request, _ in pending],
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for (_, future), result in zip(pending, results):
+            # The requester may have been cancelled in the meantime
+            if not future.done():
+                future.set_result(result)
+
+
+async def async_preload_state_changes(
+    hass: HomeAssistant,
+    entity_id: str,
+    start_time: datetime,
+    limit: int | None = None,
+    include_start_time_state: bool = False,
+) -> list[State]:
+    """Return the state changes of an entity after start_time in ascending order.
+
+    The requests of all callers in the same event loop iteration, such as
+    sensors which load their history at startup, are combined into a
+    single query grouped by entity instead of a query per entity. If
+    include_start_time_state is set, the state at start_time is returned first.
+    """
+    if (preloader := hass.data.get(DATA_STATE_CHANGES_PRELOADER)) is None:
+        preloader = hass.data[DATA_STATE_CHANGES_PRELOADER] = _StateChangesPreloader(
+            hass
+        )
+    return await preloader.async_request(
+        StateChangesRequest(entity_id, start_time, limit, include_start_time_state)
+    )
+
+
 def _get_last_state_changes_stmt(
-    schema_version: int, number_of_states: int, entity_id: str | None
+    schema_version: int,
+    number_of_states: int,
+    entity_id: str | None,
+    metadata_id: int | None,
 ) -> StatementLambdaElement:
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, False, include_last_changed=False
@@ -532,13 +975,19 @@ def _get_last_state_changes_stmt(
         stmt += lambda q: q.filter(
             (States.last_changed == States.last_updated) | States.last_changed.is_(None)
         )
-    if entity_id:
+    if metadata_id:
+        stmt += lambda q: q.filter(States.metadata_id == metadata_id)
+    elif entity_id:
         stmt += lambda q: q.filter(States.entity_id == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    if schema_version >= 31:
+    if schema_version >= 34:
+        stmt += lambda q: q.order_by(
+            States.metadata_id, States.last_updated_ts.desc()
+        ).limit(number_of_states)
+    elif schema_version >= 31:
         stmt += lambda q: q.order_by(
             States.entity_id, States.last_updated_ts.desc()
         ).limit(number_of_states)
@@ -558,8 +1007,14 @@ def get_last_state_changes(
     entity_ids = [entity_id] if entity_id is not None else None
 
     with session_scope(hass=hass) as session:
+        schema_version = _schema_version(hass)
+        metadata_id: int | None = None
+        if entity_id and schema_version >= 34:
+            if not (metadata_ids := _metadata_ids(hass, session, [entity_id])):
+                return {}
+            metadata_id = metadata_ids[0]
         stmt = _get_last_state_changes_stmt(
-            _schema_version(hass), number_of_states, entity_id
+            schema_version, number_of_states, entity_id, metadata_id
         )
         states = list(execute_stmt_lambda_element(session, stmt))
         return cast(
@@ -580,6 +1035,7 @@ def _get_states_for_entites_stmt(
     run_start: datetime,
     utc_point_in_time: datetime,
     entity_ids: list[str],
+    metadata_ids: list[int] | None,
     no_attributes: bool,
 ) -> StatementLambdaElement:
     """Baked query to get states for specific entities."""
@@ -588,7 +1044,23 @@ def _get_states_for_entites_stmt(
     )
     # We got an include-list of entities, accelerate the query by filtering already
     # in the inner query.
-    if schema_version >= 31:
+    if schema_version >= 34:
+        run_start_ts = process_timestamp(run_start).timestamp()
+        utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .filter(
+                    (States.last_updated_ts >= run_start_ts)
+                    & (States.last_updated_ts < utc_point_in_time_ts)
+                )
+                .filter(States.metadata_id.in_(metadata_ids))
+                .group_by(States.metadata_id)
+                .subquery()
+            ).c.max_state_id
+        )
+    elif schema_version >= 31:
         run_start_ts = process_timestamp(run_start).timestamp()
         utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
         stmt += lambda q: q.where(
@@ -631,6 +1103,21 @@ def _generate_most_recent_states_by_date(
     utc_point_in_time: datetime,
 ) -> Subquery:
     """Generate the sub query for the most recent states by data."""
+    if schema_version >= 34:
+        run_start_ts = process_timestamp(run_start).timestamp()
+        utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
+        return (
+            select(
+                States.metadata_id.label("max_metadata_id"),
+                func.max(States.last_updated_ts).label("max_last_updated"),
+            )
+            .filter(
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < utc_point_in_time_ts)
+            )
+            .group_by(States.metadata_id)
+            .subquery()
+        )
     if schema_version >= 31:
         run_start_ts = process_timestamp(run_start).timestamp()
         utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
@@ -678,7 +1165,25 @@ def _get_states_for_all_stmt(
     most_recent_states_by_date = _generate_most_recent_states_by_date(
         schema_version, run_start, utc_point_in_time
     )
-    if schema_version >= 31:
+    if schema_version >= 34:
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .join(
+                    most_recent_states_by_date,
+                    and_(
+                        States.metadata_id
+                        == most_recent_states_by_date.c.max_metadata_id,
+                        States.last_updated_ts
+                        == most_recent_states_by_date.c.max_last_updated,
+                    ),
+                )
+                .group_by(States.metadata_id)
+                .subquery()
+            ).c.max_state_id,
+        )
+    elif schema_version >= 31:
         stmt += lambda q: q.where(
             States.state_id
             == (
@@ -712,10 +1217,20 @@ def _get_states_for_all_stmt(
                 .subquery()
             ).c.max_state_id,
         )
-    stmt += _ignore_domains_filter
-    if filters and filters.has_config:
-        entity_filter = filters.states_entity_filter()
-        stmt = stmt.add_criteria(lambda q: q.filter(entity_filter), track_on=[filters])
+    if schema_version >= 34:
+        stmt += _ignore_domains_filter
+        if filters and filters.has_config:
+            entity_filter = filters.states_metadata_entity_filter()
+            stmt = stmt.add_criteria(
+                lambda q: q.filter(entity_filter), track_on=[filters]
+            )
+    else:
+        stmt += _ignore_domains_filter_pre_schema_34
+        if filters and filters.has_config:
+            entity_filter = filters.states_entity_filter()
+            stmt = stmt.add_criteria(
+                lambda q: q.filter(entity_filter), track_on=[filters]
+            )
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -734,11 +1249,20 @@ def _get_rows_with_session(
 ) -> Iterable[Row]:
     """Return the states at a specific point in time."""
     schema_version = _schema_version(hass)
+    metadata_ids: list[int] | None = None
+    if entity_ids and schema_version >= 34:
+        if not (metadata_ids := _metadata_ids(hass, session, entity_ids)):
+            return []
+
     if entity_ids and len(entity_ids) == 1:
         return execute_stmt_lambda_element(
             session,
             _get_single_entity_states_stmt(
-                schema_version, utc_point_in_time, entity_ids[0], no_attributes
+                schema_version,
+                utc_point_in_time,
+                entity_ids[0],
+                metadata_ids[0] if metadata_ids else None,
+                no_attributes,
             ),
         )
 
@@ -753,7 +1277,12 @@ def _get_rows_with_session(
     # since the last recorder run started.
     if entity_ids:
         stmt = _get_states_for_entites_stmt(
-            schema_version, run.start, utc_point_in_time, entity_ids, no_attributes
+            schema_version,
+            run.start,
+            utc_point_in_time,
+            entity_ids,
+            metadata_ids,
+            no_attributes,
         )
     else:
         stmt = _get_states_for_all_stmt(
@@ -767,6 +1296,7 @@ def _get_single_entity_states_stmt(
     schema_version: int,
     utc_point_in_time: datetime,
     entity_id: str,
+    metadata_id: int | None,
     no_attributes: bool = False,
 ) -> StatementLambdaElement:
     # Use an entirely different (and extremely fast) query if we only
@@ -774,7 +1304,17 @@ def _get_single_entity_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
-    if schema_version >= 31:
+    if schema_version >= 34:
+        utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
+        stmt += (
+            lambda q: q.filter(
+                States.last_updated_ts < utc_point_in_time_ts,
+                States.metadata_id == metadata_id,
+            )
+            .order_by(States.last_updated_ts.desc())
+            .limit(1)
+        )
+    elif schema_version >= 31:
         utc_point_in_time_ts = dt_util.utc_to_timestamp(utc_point_in_time)
         stmt += (
             lambda q: q.filter(
@@ -952,3 +1492,338 @@ def _sorted_states_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+def stream_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_points: int | None = None,
+) -> Iterator[tuple[str, bytes, float]]:
+    """Stream significant states in the compressed state format.
+
+    Yields a tuple of (entity_id, fragment, last_updated_ts) for each entity
+    as soon as all of its states have been read. The fragment is the
+    "entity_id": [compressed states] member of a JSON object, so the
+    fragments can be joined with commas to build the same result as
+    get_significant_states with compressed_state_format.
+
+    The rows are fetched with a server side cursor in chunks of chunk_size,
+    so only the states of the entity that is being processed are kept in
+    memory instead of the states of all entities.
+
+    If max_points is set, the numeric states of each entity are reduced
+    to about max_points states before they are serialized.
+    """
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    end_time_ts = dt_util.utc_to_timestamp(end_time) if end_time else time.time()
+    with session_scope(hass=hass) as session:
+        schema_version = _schema_version(hass)
+        if schema_version < 31:
+            states = get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            )
+            for entity_id, state_list in states.items():
+                comp_states = cast(list[dict[str, Any]], state_list)
+                if max_points:
+                    comp_states = _downsample_compressed_states(
+                        comp_states, max_points, start_time_ts, end_time_ts
+                    )
+                yield (
+                    entity_id,
+                    json_bytes({entity_id: comp_states})[1:-1],
+                    comp_states[-1][COMPRESSED_STATE_LAST_UPDATED],
+                )
+            return
+
+        metadata_ids: list[int] | None = None
+        if entity_ids and schema_version >= 34:
+            if not (metadata_ids := _metadata_ids(hass, session, entity_ids)):
+                return
+        stmt = _significant_states_stmt(
+            schema_version,
+            start_time,
+            end_time,
+            entity_ids,
+            metadata_ids,
+            filters,
+            significant_changes_only,
+            no_attributes,
+        )
+        initial_states: dict[str, Row] = {}
+        if include_start_time_state:
+            initial_states = {
+                row.entity_id: row
+                for row in _get_rows_with_session(
+                    hass,
+                    session,
+                    start_time,
+                    entity_ids,
+                    filters=filters,
+                    no_attributes=no_attributes,
+                )
+            }
+
+        builder = _CompressedStatesBuilder(
+            start_time, minimal_response, max_points, end_time_ts
+        )
+        # Execute on the connection since the session would fetch
+        # all rows of the result before returning the first one
+        result = (
+            session.connection()
+            .execution_options(stream_results=True, max_row_buffer=chunk_size)
+            .execute(stmt)
+        )
+        while rows := result.fetchmany(chunk_size):
+            # Convert the chunk into columns and process
+            # the run of rows of each entity at once
+            (
+                entity_id_col,
+                state_col,
+                last_changed_col,
+                last_updated_col,
+                attributes_col,
+                shared_attrs_col,
+            ) = zip(*rows)
+            num_rows = len(entity_id_col)
+            run_start = 0
+            while run_start < num_rows:
+                entity_id = entity_id_col[run_start]
+                run_end = run_start + 1
+                while run_end < num_rows and entity_id_col[run_end] == entity_id:
+                    run_end += 1
+                if entity_id != builder.entity_id:
+                    if builder.entity_id is not None:
+                        yield builder.finish()
+                    builder.start(entity_id, initial_states.pop(entity_id, None))
+                builder.add_rows(
+                    state_col[run_start:run_end],
+                    last_changed_col[run_start:run_end],
+                    last_updated_col[run_start:run_end],
+                    attributes_col[run_start:run_end],
+                    shared_attrs_col[run_start:run_end],
+                )
+                run_start = run_end
+        if builder.entity_id is not None:
+            yield builder.finish()
+
+        # If there are no states beyond the initial state,
+        # the state a was never popped from initial_states
+        for entity_id, row in initial_states.items():
+            builder.start(entity_id, row)
+            yield builder.finish()
+
+
+class _CompressedStatesBuilder:
+    """Build the compressed states of one entity from columns of rows."""
+
+    def __init__(
+        self,
+        start_time: datetime,
+        minimal_response: bool,
+        max_points: int | None,
+        end_time_ts: float,
+    ) -> None:
+        """Initialize the builder."""
+        self.start_time = start_time
+        self.start_time_ts = dt_util.utc_to_timestamp(start_time)
+        self.end_time_ts = end_time_ts
+        self.minimal_response = minimal_response
+        self.max_points = max_points
+        self.entity_id: str | None = None
+        self.minimal = False
+        self.states: list[dict[str, Any]] = []
+        self.prev_state: str | None = None
+        self.attr_cache: dict[str, dict[str, Any]] = {}
+
+    def start(self, entity_id: str, initial_row: Row | None) -> None:
+        """Start the states of an entity, with the state at the start time."""
+        self.entity_id = entity_id
+        self.minimal = (
+            self.minimal_response
+            and split_entity_id(entity_id)[0] not in NEED_ATTRIBUTE_DOMAINS
+        )
+        self.states = []
+        self.prev_state = None
+        self.attr_cache = {}
+        if initial_row is not None:
+            self.prev_state = initial_row.state
+            self.states.append(
+                row_to_compressed_state(initial_row, self.attr_cache, self.start_time)
+            )
+
+    def add_rows(
+        self,
+        state_col: Sequence[str],
+        last_changed_col: Sequence[float | None],
+        last_updated_col: Sequence[float],
+        attributes_col: Sequence[str | None],
+        shared_attrs_col: Sequence[str | None],
+    ) -> None:
+        """Add the states of consecutive rows of the entity."""
+        states = self.states
+        if not self.minimal:
+            attr_cache = self.attr_cache
+            for (
+                state,
+                last_changed_ts,
+                last_updated_ts,
+                attributes,
+                shared_attrs,
+            ) in zip(
+                state_col,
+                last_changed_col,
+                last_updated_col,
+                attributes_col,
+                shared_attrs_col,
+            ):
+                comp_state = {
+                    COMPRESSED_STATE_STATE: state,
+                    COMPRESSED_STATE_ATTRIBUTES: decode_attributes(
+                        shared_attrs or attributes, attr_cache
+                    ),
+                    COMPRESSED_STATE_LAST_UPDATED: last_updated_ts,
+                }
+                if last_changed_ts and last_changed_ts != last_updated_ts:
+                    comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+                states.append(comp_state)
+            return
+
+        # With minimal response only the first state is complete,
+        # the others only have the state and last_updated and
+        # are skipped if the state did not change
+        first = 0
+        if not states:
+            comp_state = {
+                COMPRESSED_STATE_STATE: state_col[0],
+                COMPRESSED_STATE_ATTRIBUTES: decode_attributes(
+                    shared_attrs_col[0] or attributes_col[0], self.attr_cache
+                ),
+                COMPRESSED_STATE_LAST_UPDATED: last_updated_col[0],
+            }
+            if (last_changed_ts := last_changed_col[0]) and last_changed_ts != (
+                last_updated_col[0]
+            ):
+                comp_state[COMPRESSED_STATE_LAST_CHANGED] = last_changed_ts
+            states.append(comp_state)
+            self.prev_state = state_col[0]
+            first = 1
+        prev_state = self.prev_state
+        for idx in range(first, len(state_col)):
+            if (state := state_col[idx]) != prev_state:
+                states.append(
+                    {
+                        COMPRESSED_STATE_STATE: state,
+                        COMPRESSED_STATE_LAST_UPDATED: last_updated_col[idx],
+                    }
+                )
+                prev_state = state
+        self.prev_state = prev_state
+
+    def finish(self) -> tuple[str, bytes, float]:
+        """Serialize the states of the entity."""
+        entity_id = self.entity_id
+        assert entity_id is not None
+        states = self.states
+        self.entity_id = None
+        self.states = []
+        self.attr_cache = {}
+        if self.max_points:
+            states = _downsample_compressed_states(
+                states, self.max_points, self.start_time_ts, self.end_time_ts
+            )
+        return (
+            entity_id,
+            json_bytes({entity_id: states})[1:-1],
+            states[-1][COMPRESSED_STATE_LAST_UPDATED],
+        )
+
+
+def _append_min_max(
+    result: list[dict[str, Any]],
+    states: list[dict[str, Any]],
+    min_idx: int,
+    max_idx: int,
+) -> None:
+    """Append the minimum and maximum state of a bucket in time order."""
+    if min_idx == max_idx:
+        result.append(states[min_idx])
+    elif min_idx < max_idx:
+        result.append(states[min_idx])
+        result.append(states[max_idx])
+    else:
+        result.append(states[max_idx])
+        result.append(states[min_idx])
+
+
+def _downsample_compressed_states(
+    states: list[dict[str, Any]],
+    max_points: int,
+    start_time_ts: float,
+    end_time_ts: float,
+) -> list[dict[str, Any]]:
+    """Reduce the compressed states of an entity to about max_points states.
+
+    The period is split into max_points / 2 buckets of equal duration and
+    only the states with the minimum and the maximum value of each bucket
+    are kept, so peaks are still visible when the states are drawn.
+
+    The first and the last state and states which are not numeric, such
+    as unavailable, are always kept.
+    """
+    if len(states) <= max_points:
+        return states
+    bucket_width = (end_time_ts - start_time_ts) / max(max_points // 2, 1) or 1.0
+    result = [states[0]]
+    bucket: int | None = None
+    min_idx = max_idx = 0
+    min_value = max_value = 0.0
+    last_idx = len(states) - 1
+    for idx in range(1, last_idx):
+        comp_state = states[idx]
+        try:
+            value = float(comp_state[COMPRESSED_STATE_STATE])
+        except (TypeError, ValueError):
+            value = math.nan
+        if not math.isfinite(value):
+            if bucket is not None:
+                _append_min_max(result, states, min_idx, max_idx)
+                bucket = None
+            result.append(comp_state)
+            continue
+        state_bucket = int(
+            (comp_state[COMPRESSED_STATE_LAST_UPDATED] - start_time_ts) // bucket_width
+        )
+        if state_bucket != bucket:
+            if bucket is not None:
+                _append_min_max(result, states, min_idx, max_idx)
+            bucket = state_bucket
+            min_idx = max_idx = idx
+            min_value = max_value = value
+        elif value < min_value:
+            min_idx = idx
+            min_value = value
+        elif value > max_value:
+            max_idx = idx
+            max_value = value
+    if bucket is not None:
+        _append_min_max(result, states, min_idx, max_idx)
+    result.append(states[last_idx])
+    return result
@@ -4,7 +4,7 @@ from __future__ import annotations
 from collections.abc import Callable, Iterable
 import contextlib
 from dataclasses import dataclass, replace as dataclass_replace
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 from typing import TYPE_CHECKING
 
@@ -23,19 +23,37 @@ from sqlalchemy.schema import AddConstraint, DropConstraint
 from sqlalchemy.sql.expression import true
 
 from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
 
 from .const import SupportedDialect
 from .db_schema import (
+    ENTITY_ID_LAST_UPDATED_INDEX_TS,
+    EVENT_TYPE_ID_TIME_FIRED_INDEX_TS,
+    EVENT_TYPE_TIME_FIRED_INDEX_TS,
+    METADATA_ID_LAST_UPDATED_INDEX_TS,
+    PARTITION_DEFAULT_SUFFIX,
+    PARTITION_LEGACY_SUFFIX,
+    PARTITIONED_TABLES,
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
+    EventTypes,
     SchemaChanges,
+    States,
+    StatesMeta,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from .models import process_timestamp
+from .queries import (
+    find_entity_ids_to_migrate,
+    find_event_type_to_migrate,
+    has_events_event_type_ids_to_migrate,
+    has_states_metadata_ids_to_migrate,
+)
 from .statistics import (
     correct_db_schema as statistics_correct_db_schema,
     delete_statistics_duplicates,
@@ -44,13 +62,19 @@ from .statistics import (
     validate_db_schema as statistics_validate_db_schema,
 )
 from .tasks import CommitTask, PostSchemaMigrationTask
-from .util import session_scope
+from .util import get_partition_end, partition_name, session_scope, table_is_partitioned
 
 if TYPE_CHECKING:
     from . import Recorder
 
 LIVE_MIGRATION_MIN_SCHEMA_VERSION = 0
 
+# The number of rows migrated to the lookup tables per recorder task
+ID_MIGRATION_BATCH_SIZE = 10000
+
+# The number of upcoming UTC days partitions are created for
+PARTITION_DAYS_AHEAD = 3
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -874,6 +898,22 @@ def _apply_update(  # noqa: C901
         # when querying the states table.
         # https://github.com/home-assistant/core/issues/83787
         _drop_index(session_maker, "states", "ix_states_entity_id")
+    elif new_version == 34:
+        # The event_type and entity_id strings are moved to the event_types
+        # and states_meta tables by the recorder in the background after
+        # the schema migration, see migrate_event_type_ids and
+        # migrate_entity_ids. The indexes on the old columns are dropped
+        # once all rows have been migrated.
+        _add_columns(session_maker, "events", ["event_type_id INTEGER"])
+        _add_columns(session_maker, "states", ["metadata_id INTEGER"])
+        _create_index(session_maker, "events", EVENT_TYPE_ID_TIME_FIRED_INDEX_TS)
+        _create_index(session_maker, "states", METADATA_ID_LAST_UPDATED_INDEX_TS)
+    elif new_version == 35:
+        # The statistics_day and statistics_month tables are created with
+        # the other missing tables, they are filled by the recorder in the
+        # background from the hourly statistics, see
+        # rebuild_statistics_rollups
+        pass
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1041,6 +1081,299 @@ def _migrate_columns_to_timestamp(
                 )
 
 
+def needs_event_type_id_migration(session: Session) -> bool:
+    """Check if there are events without an event_type_id."""
+    return bool(session.execute(has_events_event_type_ids_to_migrate()).first())
+
+
+def needs_entity_id_migration(session: Session) -> bool:
+    """Check if there are states without a metadata_id."""
+    return bool(session.execute(has_states_metadata_ids_to_migrate()).first())
+
+
+def migrate_event_type_ids(instance: Recorder) -> bool:
+    """Migrate a batch of event_type strings to the event_types table.
+
+    Returns True once all events have been migrated.
+    """
+    event_type_manager = instance.event_type_manager
+    with session_scope(session=instance.get_session()) as session:
+        events = session.execute(
+            find_event_type_to_migrate(ID_MIGRATION_BATCH_SIZE)
+        ).all()
+        if events:
+            event_type_to_id = event_type_manager.get_many(
+                {event_type for _, event_type in events}, session, True
+            )
+            if missing := [
+                EventTypes(event_type=event_type)
+                for event_type, event_type_id in event_type_to_id.items()
+                if event_type_id is None
+            ]:
+                session.add_all(missing)
+                # Flush to assign the new event_type_ids. They are not
+                # added to the cache since the commit may still fail.
+                session.flush()
+                for db_event_type in missing:
+                    event_type_to_id[
+                        db_event_type.event_type
+                    ] = db_event_type.event_type_id
+            session.bulk_update_mappings(
+                Events,
+                [
+                    {
+                        "event_id": event_id,
+                        "event_type_id": event_type_to_id[event_type],
+                    }
+                    for event_id, event_type in events
+                ],
+            )
+
+    is_done = len(events) < ID_MIGRATION_BATCH_SIZE
+    _LOGGER.debug("Migrated %s event types, done: %s", len(events), is_done)
+    return is_done
+
+
+def migrate_entity_ids(instance: Recorder) -> bool:
+    """Migrate a batch of entity_id strings to the states_meta table.
+
+    Returns True once all states have been migrated.
+    """
+    states_meta_manager = instance.states_meta_manager
+    with session_scope(session=instance.get_session()) as session:
+        states = session.execute(
+            find_entity_ids_to_migrate(ID_MIGRATION_BATCH_SIZE)
+        ).all()
+        if states:
+            entity_id_to_metadata_id = states_meta_manager.get_many(
+                {entity_id for _, entity_id in states}, session, True
+            )
+            if missing := [
+                StatesMeta(entity_id=entity_id)
+                for entity_id, metadata_id in entity_id_to_metadata_id.items()
+                if metadata_id is None
+            ]:
+                session.add_all(missing)
+                # Flush to assign the new metadata_ids. They are not
+                # added to the cache since the commit may still fail.
+                session.flush()
+                for db_states_meta in missing:
+                    entity_id_to_metadata_id[
+                        db_states_meta.entity_id
+                    ] = db_states_meta.metadata_id
+            session.bulk_update_mappings(
+                States,
+                [
+                    {
+                        "state_id": state_id,
+                        "metadata_id": entity_id_to_metadata_id[entity_id],
+                    }
+                    for state_id, entity_id in states
+                ],
+            )
+
+    is_done = len(states) < ID_MIGRATION_BATCH_SIZE
+    _LOGGER.debug("Migrated %s entity ids, done: %s", len(states), is_done)
+    return is_done
+
+
+def post_migrate_event_type_ids(instance: Recorder) -> None:
+    """Drop the index on events.event_type once all events are migrated."""
+    _drop_index(instance.get_session, "events", EVENT_TYPE_TIME_FIRED_INDEX_TS)
+
+
+def post_migrate_entity_ids(instance: Recorder) -> None:
+    """Drop the index on states.entity_id once all states are migrated."""
+    _drop_index(instance.get_session, "states", ENTITY_ID_LAST_UPDATED_INDEX_TS)
+
+
+def partition_tables(instance: Recorder) -> bool:
+    """Range partition the states and events tables by UTC day.
+
+    Tables which are not partitioned yet are converted in place. The
+    existing table is renamed and attached as the legacy partition for all
+    rows before the next UTC day, so no rows are copied. The partitions for
+    today and the upcoming days are created each time this runs.
+
+    Only supported with PostgreSQL.
+
+    Returns True if the tables are partitioned.
+    """
+    today = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    session_maker = instance.get_session
+    for table, column in PARTITIONED_TABLES.items():
+        try:
+            with session_scope(session=session_maker()) as session:
+                if not table_is_partitioned(session, table) and not _partition_table(
+                    session, table, column, today + timedelta(days=1)
+                ):
+                    return False
+        except SQLAlchemyError:
+            _LOGGER.exception("Could not partition the %s table", table)
+            return False
+        # A partition which can not be created is retried the next time
+        # this runs, the rows of its day end up in the default partition
+        # in the meantime
+        _create_day_partitions(session_maker, table, column, today)
+    return True
+
+
+def _partition_table(
+    session: Session, table: str, column: str, legacy_end: datetime
+) -> bool:
+    """Convert a table to a table range partitioned on column.
+
+    All rows are kept in the legacy partition which ends at legacy_end.
+    """
+    if session.execute(
+        text(f"SELECT 1 FROM {table} WHERE {column} IS NULL LIMIT 1")
+    ).scalar():
+        _LOGGER.warning(
+            "The %s table can not be partitioned since it has rows without %s",
+            table,
+            column,
+        )
+        return False
+
+    _LOGGER.warning(
+        "Partitioning the %s table; This may take a while, please be patient!",
+        table,
+    )
+    legacy_table = f"{table}_{PARTITION_LEGACY_SUFFIX}"
+    id_column = Base.metadata.tables[table].primary_key.columns.values()[0].name
+    max_id = session.execute(text(f"SELECT max({id_column}) FROM {table}")).scalar()
+
+    # Foreign keys can not reference a partitioned table
+    for referencing_table, constraint in session.execute(
+        text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint"
+            " WHERE contype = 'f' AND confrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).all():
+        session.execute(
+            text(f'ALTER TABLE {referencing_table} DROP CONSTRAINT "{constraint}"')
+        )
+
+    # The partitioned table takes over the name of the table and its indexes
+    session.execute(text(f"ALTER TABLE {table} RENAME TO {legacy_table}"))
+    for (index,) in session.execute(
+        text(
+            "SELECT index_class.relname FROM pg_index"
+            " JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid"
+            " WHERE pg_index.indrelid = to_regclass(:table)"
+        ),
+        {"table": legacy_table},
+    ).all():
+        session.execute(
+            text(f'ALTER INDEX "{index}" RENAME TO "{index}_{PARTITION_LEGACY_SUFFIX}"')
+        )
+    # Ids are generated by the partitioned table from now on
+    session.execute(
+        text(f"ALTER TABLE {legacy_table} ALTER {id_column} DROP IDENTITY IF EXISTS")
+    )
+    session.execute(text(f"ALTER TABLE {legacy_table} ALTER {id_column} DROP DEFAULT"))
+    session.execute(text(f"ALTER TABLE {legacy_table} ALTER {column} SET NOT NULL"))
+
+    session.execute(
+        text(
+            f"CREATE TABLE {table} (LIKE {legacy_table} INCLUDING DEFAULTS)"
+            f" PARTITION BY RANGE ({column})"
+        )
+    )
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ALTER {id_column} ADD GENERATED BY DEFAULT"
+            f" AS IDENTITY (START WITH {(max_id or 0) + 1})"
+        )
+    )
+    # The primary key of a partitioned table must include the partition column
+    session.execute(
+        text(f"ALTER TABLE {table} ADD PRIMARY KEY ({id_column}, {column})")
+    )
+    connection = session.connection()
+    for index in Base.metadata.tables[table].indexes:
+        index.create(connection)
+
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy_table}"
+            f" FOR VALUES FROM (MINVALUE) TO ({legacy_end.timestamp()})"
+        )
+    )
+    # Rows outside of the day partitions, for example when the clock
+    # jumps, end up in the default partition
+    session.execute(
+        text(
+            f"CREATE TABLE {table}_{PARTITION_DEFAULT_SUFFIX}"
+            f" PARTITION OF {table} DEFAULT"
+        )
+    )
+    _LOGGER.warning("Partitioning the %s table completed", table)
+    return True
+
+
+def _create_day_partitions(
+    session_maker: Callable[[], Session], table: str, column: str, first_day: datetime
+) -> None:
+    """Create the day partitions of a table starting at first_day.
+
+    Days which are still covered by the legacy partition are skipped.
+    """
+    try:
+        with session_scope(session=session_maker()) as session:
+            legacy_end = get_partition_end(
+                session, f"{table}_{PARTITION_LEGACY_SUFFIX}"
+            )
+    except SQLAlchemyError:
+        _LOGGER.exception("Could not create the partitions of the %s table", table)
+        return
+    for day_offset in range(PARTITION_DAYS_AHEAD + 1):
+        start = first_day + timedelta(days=day_offset)
+        if legacy_end is not None and start.timestamp() < legacy_end:
+            continue
+        try:
+            with session_scope(session=session_maker()) as session:
+                _create_day_partition(session, table, column, start)
+        except SQLAlchemyError:
+            _LOGGER.exception(
+                "Could not create the partition of the %s table for %s",
+                table,
+                start.date(),
+            )
+
+
+def _create_day_partition(
+    session: Session, table: str, column: str, start: datetime
+) -> None:
+    """Create the partition of a table for the UTC day starting at start.
+
+    A partition can not be attached while rows of its range are in the
+    default partition, so these rows are moved to the new partition first.
+    """
+    partition = partition_name(table, start)
+    if session.execute(
+        text("SELECT to_regclass(:partition)"), {"partition": partition}
+    ).scalar():
+        return
+    start_ts = start.timestamp()
+    end_ts = (start + timedelta(days=1)).timestamp()
+    session.execute(text(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS)"))
+    session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table}_{PARTITION_DEFAULT_SUFFIX}"
+            f" WHERE {column} >= {start_ts} AND {column} < {end_ts} RETURNING *)"
+            f" INSERT INTO {partition} SELECT * FROM moved"
+        )
+    )
+    session.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {partition}"
+            f" FOR VALUES FROM ({start_ts}) TO ({end_ts})"
+        )
+    )
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database.
 
@@ -341,11 +341,17 @@ def decode_attributes_from_row(
     row: Row, attr_cache: dict[str, dict[str, Any]]
 ) -> dict[str, Any]:
     """Decode attributes from a database row."""
-    source: str = row.shared_attrs or row.attributes
-    if (attributes := attr_cache.get(source)) is not None:
-        return attributes
+    return decode_attributes(row.shared_attrs or row.attributes, attr_cache)
+
+
+def decode_attributes(
+    source: str | None, attr_cache: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Decode shared attributes, reusing the attributes already in attr_cache."""
     if not source or source == EMPTY_JSON_OBJECT:
         return {}
+    if (attributes := attr_cache.get(source)) is not None:
+        return attributes
     try:
         attr_cache[source] = attributes = json_loads(source)
     except ValueError:
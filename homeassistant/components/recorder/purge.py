@@ -2,20 +2,32 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable
-from datetime import datetime
-from functools import partial
-from itertools import islice, zip_longest
+from datetime import datetime, timedelta
+from itertools import zip_longest
 import logging
-from typing import TYPE_CHECKING, Any
+import math
+import time
+from typing import TYPE_CHECKING
 
+from sqlalchemy import text
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.expression import distinct
 
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.util.dt as dt_util
 
-from .const import MAX_ROWS_TO_PURGE
-from .db_schema import Events, StateAttributes, States
+from .const import EVENT_RECORDER_PURGE_PROGRESS, MAX_ROWS_TO_PURGE
+from .db_schema import (
+    PARTITION_LEGACY_SUFFIX,
+    PARTITIONED_TABLES,
+    TABLE_STATES,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -24,22 +36,39 @@ from .queries import (
     data_ids_exist_in_events_with_fast_in_distinct,
     delete_event_data_rows,
     delete_event_rows,
+    delete_event_types_rows,
+    delete_events_rows_before,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_meta_rows,
     delete_states_rows,
+    delete_states_rows_before,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_before,
+    find_events_purge_boundary,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
+    find_states_purge_boundary,
     find_states_to_purge,
     find_statistics_runs_to_purge,
+    find_unused_attributes_ids,
+    find_unused_data_ids,
+    find_unused_event_type_ids,
+    find_unused_states_metadata_ids,
 )
 from .repack import repack_database
-from .util import retryable_database_job, session_scope
+from .util import (
+    chunked,
+    get_table_partitions,
+    partition_day,
+    retryable_database_job,
+    session_scope,
+)
 
 if TYPE_CHECKING:
     from . import Recorder
@@ -51,22 +80,6 @@ DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
 
-def take(take_num: int, iterable: Iterable) -> list[Any]:
-    """Return first n items of the iterable as a list.
-
-    From itertools recipes
-    """
-    return list(islice(iterable, take_num))
-
-
-def chunked(iterable: Iterable, chunked_num: int) -> Iterable[Any]:
-    """Break *iterable* into lists of length *n*.
-
-    From more-itertools
-    """
-    return iter(partial(take, chunked_num, iter(iterable)), [])
-
-
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -99,12 +112,23 @@ def purge_old_data(
                 " remaining"
             )
             # Once we are done purging legacy rows, we use the new method
-            has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
-            )
+            if instance.tables_partitioned:
+                has_more_to_purge |= _purge_partitions(instance, session, purge_before)
+            if instance.bulk_purge:
+                has_more_to_purge |= _purge_in_bulk(
+                    instance,
+                    session,
+                    states_batch_size,
+                    events_batch_size,
+                    purge_before,
+                )
+            else:
+                has_more_to_purge |= _purge_states_and_attributes_ids(
+                    instance, session, states_batch_size, purge_before
+                )
+                has_more_to_purge |= _purge_events_and_data_ids(
+                    instance, session, events_batch_size, purge_before
+                )
 
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
@@ -126,6 +150,10 @@ def purge_old_data(
             return False
 
         _purge_old_recorder_runs(instance, session, purge_before)
+        if instance.states_meta_manager.active:
+            _purge_unused_states_meta(instance, session)
+        if instance.event_type_manager.active:
+            _purge_unused_event_types(instance, session)
     if repack:
         repack_database(instance)
     return True
@@ -225,6 +253,162 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _purge_in_bulk(
+    instance: Recorder,
+    session: Session,
+    states_batch_size: int,
+    events_batch_size: int,
+    purge_before: datetime,
+) -> bool:
+    """Purge states, events and unused attributes and data with set-based deletes.
+
+    Instead of selecting the ids of the rows to purge and deleting them by id,
+    the states and events are deleted with a single statement per table up to
+    a boundary time. The boundary is the time of the row at the end of the
+    batch, so about batch_size * MAX_ROWS_TO_PURGE rows are deleted at once.
+    Rows with the same time as the boundary row are always deleted together.
+
+    Unused attributes and data are found with an anti-join instead of
+    checking the ids of the purged rows.
+
+    Returns true if there are more rows to purge.
+    """
+    start = time.monotonic()
+    purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+
+    states_before_ts = purge_before_ts
+    if (
+        states_boundary := session.execute(
+            find_states_purge_boundary(
+                purge_before_ts, states_batch_size * MAX_ROWS_TO_PURGE - 1
+            )
+        ).scalar()
+    ) is not None:
+        states_before_ts = math.nextafter(states_boundary, math.inf)
+    # Update old_state_id to NULL before deleting to ensure
+    # the delete does not fail due to a foreign key constraint
+    # since some databases (MSSQL) cannot do the ON DELETE SET NULL
+    # for us.
+    session.execute(disconnect_states_rows_before(states_before_ts))
+    states_deleted = session.execute(delete_states_rows_before(states_before_ts))
+    _evict_states_before_from_old_states_cache(instance, states_before_ts)
+
+    events_before_ts = purge_before_ts
+    if (
+        events_boundary := session.execute(
+            find_events_purge_boundary(
+                purge_before_ts, events_batch_size * MAX_ROWS_TO_PURGE - 1
+            )
+        ).scalar()
+    ) is not None:
+        events_before_ts = math.nextafter(events_boundary, math.inf)
+    events_deleted = session.execute(delete_events_rows_before(events_before_ts))
+
+    attributes_ids, data_ids = _purge_unused_attributes_and_data_ids(instance, session)
+
+    has_more_to_purge = (
+        states_boundary is not None
+        or events_boundary is not None
+        or len(attributes_ids) == MAX_ROWS_TO_PURGE
+        or len(data_ids) == MAX_ROWS_TO_PURGE
+    )
+    rows = (
+        states_deleted.rowcount
+        + events_deleted.rowcount
+        + len(attributes_ids)
+        + len(data_ids)
+    )
+    duration = time.monotonic() - start
+    _LOGGER.debug(
+        "Purged %s states, %s events, %s attributes and %s data in %.3fs",
+        states_deleted.rowcount,
+        events_deleted.rowcount,
+        len(attributes_ids),
+        len(data_ids),
+        duration,
+    )
+    instance.hass.bus.fire(
+        EVENT_RECORDER_PURGE_PROGRESS,
+        {
+            "states": states_deleted.rowcount,
+            "events": events_deleted.rowcount,
+            "state_attributes": len(attributes_ids),
+            "event_data": len(data_ids),
+            "rows_per_second": round(rows / duration) if duration else rows,
+            "remaining": has_more_to_purge,
+        },
+    )
+    return has_more_to_purge
+
+
+def _purge_unused_attributes_and_data_ids(
+    instance: Recorder, session: Session
+) -> tuple[set[int], set[int]]:
+    """Purge a batch of attributes and data which are no longer used.
+
+    They are found with an anti-join instead of checking the ids of the
+    purged rows.
+    """
+    attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.execute(find_unused_attributes_ids()).all()
+    }
+    if attributes_ids:
+        _purge_batch_attributes_ids(instance, session, attributes_ids)
+    data_ids = {data_id for (data_id,) in session.execute(find_unused_data_ids()).all()}
+    if data_ids:
+        _purge_batch_data_ids(instance, session, data_ids)
+    return attributes_ids, data_ids
+
+
+def _purge_partitions(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Drop the partitions of the states and events tables before purge_before.
+
+    Day partitions are dropped once the whole day is before purge_before and
+    the legacy partition once all its rows have been purged. The remaining
+    rows are purged row by row.
+
+    Returns true if there are more unused attributes or data to purge.
+    """
+    purge_before_ts = dt_util.utc_to_timestamp(purge_before)
+    partitions_to_drop: list[str] = []
+    states_dropped_before_ts: float | None = None
+    for table in PARTITIONED_TABLES:
+        for partition in get_table_partitions(session, table):
+            if (day := partition_day(table, partition)) is not None:
+                end_ts = dt_util.utc_to_timestamp(day + timedelta(days=1))
+                if end_ts > purge_before_ts:
+                    continue
+                if table == TABLE_STATES:
+                    states_dropped_before_ts = max(
+                        states_dropped_before_ts or end_ts, end_ts
+                    )
+            elif partition != f"{table}_{PARTITION_LEGACY_SUFFIX}" or (
+                session.execute(text(f"SELECT 1 FROM {partition} LIMIT 1")).scalar()
+            ):
+                continue
+            partitions_to_drop.append(partition)
+
+    if not partitions_to_drop:
+        return False
+
+    if states_dropped_before_ts is not None:
+        # There are no foreign keys on partitioned tables, so
+        # old_state_id has to be cleared by hand
+        session.execute(disconnect_states_rows_before(states_dropped_before_ts))
+        _evict_states_before_from_old_states_cache(instance, states_dropped_before_ts)
+    for partition in partitions_to_drop:
+        _LOGGER.debug("Dropping partition %s", partition)
+        session.execute(text(f"DROP TABLE {partition}"))
+
+    attributes_ids, data_ids = _purge_unused_attributes_and_data_ids(instance, session)
+    return (
+        len(attributes_ids) == MAX_ROWS_TO_PURGE or len(data_ids) == MAX_ROWS_TO_PURGE
+    )
+
+
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime
 ) -> tuple[set[int], set[int]]:
@@ -484,6 +668,19 @@ def _evict_purged_states_from_old_states_cache(
         old_states.pop(old_state_reversed[purged_state_id], None)
 
 
+def _evict_states_before_from_old_states_cache(
+    instance: Recorder, purge_before_ts: float
+) -> None:
+    """Evict states updated before purge_before_ts from the old states cache."""
+    old_states = instance._old_states  # pylint: disable=protected-access
+    for entity_id in [
+        entity_id
+        for entity_id, old_state in old_states.items()
+        if old_state.last_updated_ts < purge_before_ts
+    ]:
+        old_states.pop(entity_id)
+
+
 def _evict_purged_data_from_data_cache(
     instance: Recorder, purged_data_ids: set[int]
 ) -> None:
@@ -580,6 +777,91 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
+def _purge_unused_states_meta(instance: Recorder, session: Session) -> None:
+    """Remove states_meta rows that are no longer used by any state."""
+    if not (rows := session.execute(find_unused_states_metadata_ids()).all()):
+        return
+    metadata_ids = [metadata_id for metadata_id, _ in rows]
+    deleted_rows = session.execute(delete_states_meta_rows(metadata_ids))
+    _LOGGER.debug("Deleted %s states_meta", deleted_rows)
+    instance.states_meta_manager.evict_purged(entity_id for _, entity_id in rows)
+
+
+def _purge_unused_event_types(instance: Recorder, session: Session) -> None:
+    """Remove event_types rows that are no longer used by any event."""
+    if not (rows := session.execute(find_unused_event_type_ids()).all()):
+        return
+    event_type_ids = [event_type_id for event_type_id, _ in rows]
+    deleted_rows = session.execute(delete_event_types_rows(event_type_ids))
+    _LOGGER.debug("Deleted %s event_types", deleted_rows)
+    instance.event_type_manager.evict_purged(event_type for _, event_type in rows)
+
+
+def _select_states_entity_criteria(
+    instance: Recorder, session: Session, entity_filter: Callable[[str], bool]
+) -> ColumnElement | None:
+    """Return the criteria to select the states of entities matching the filter.
+
+    Returns None if there are no matching entities in the database.
+    """
+    if instance.states_meta_manager.active:
+        used_metadata_ids: set[int] = {
+            metadata_id
+            for (metadata_id,) in session.query(distinct(States.metadata_id)).all()
+        }
+        metadata_ids: list[int] = [
+            metadata_id
+            for metadata_id, entity_id in session.query(
+                StatesMeta.metadata_id, StatesMeta.entity_id
+            ).all()
+            if metadata_id in used_metadata_ids and entity_filter(entity_id)
+        ]
+        _LOGGER.debug("Selected metadata_ids %s", metadata_ids)
+        return States.metadata_id.in_(metadata_ids) if metadata_ids else None
+
+    entity_ids: list[str] = [
+        entity_id
+        for (entity_id,) in session.query(distinct(States.entity_id)).all()
+        if entity_filter(entity_id)
+    ]
+    _LOGGER.debug("Selected entity_ids %s", entity_ids)
+    return States.entity_id.in_(entity_ids) if entity_ids else None
+
+
+def _select_events_event_type_criteria(
+    instance: Recorder, session: Session, excluded_event_types: set[str]
+) -> tuple[ColumnElement, list[str]] | None:
+    """Return the criteria to select events of the excluded event types.
+
+    Returns None if there are no such events in the database.
+    """
+    if instance.event_type_manager.active:
+        used_event_type_ids: set[int] = {
+            event_type_id
+            for (event_type_id,) in session.query(distinct(Events.event_type_id)).all()
+        }
+        event_type_ids: dict[int, str] = {
+            event_type_id: event_type
+            for event_type_id, event_type in session.query(
+                EventTypes.event_type_id, EventTypes.event_type
+            ).all()
+            if event_type_id in used_event_type_ids
+            and event_type in excluded_event_types
+        }
+        if not event_type_ids:
+            return None
+        return Events.event_type_id.in_(event_type_ids), list(event_type_ids.values())
+
+    event_types: list[str] = [
+        event_type
+        for (event_type,) in session.query(distinct(Events.event_type)).all()
+        if event_type in excluded_event_types
+    ]
+    if not event_types:
+        return None
+    return Events.event_type.in_(event_types), event_types
+
+
 def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     """Remove filtered states and events that shouldn't be in the database."""
     _LOGGER.debug("Cleanup filtered data")
@@ -587,23 +869,20 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     assert database_engine is not None
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
-        if not instance.entity_filter(entity_id)
-    ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, database_engine)
+    entity_filter = instance.entity_filter
+    if (
+        states_criteria := _select_states_entity_criteria(
+            instance, session, lambda entity_id: not entity_filter(entity_id)
+        )
+    ) is not None:
+        _purge_filtered_states(instance, session, states_criteria, database_engine)
         return False
 
     # Check if excluded event_types are in database
-    excluded_event_types: list[str] = [
-        event_type
-        for (event_type,) in session.query(distinct(Events.event_type)).all()
-        if event_type in instance.exclude_t
-    ]
-    if len(excluded_event_types) > 0:
-        _purge_filtered_events(instance, session, excluded_event_types)
+    if events_criteria := _select_events_event_type_criteria(
+        instance, session, instance.exclude_t
+    ):
+        _purge_filtered_events(instance, session, *events_criteria)
         return False
 
     return True
@@ -612,7 +891,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    states_criteria: ColumnElement,
     database_engine: DatabaseEngine,
 ) -> None:
     """Remove filtered states and linked events."""
@@ -622,7 +901,7 @@ def _purge_filtered_states(
     state_ids, attributes_ids, event_ids = zip(
         *(
             session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
+            .filter(states_criteria)
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -640,7 +919,10 @@ def _purge_filtered_states(
 
 
 def _purge_filtered_events(
-    instance: Recorder, session: Session, excluded_event_types: list[str]
+    instance: Recorder,
+    session: Session,
+    events_criteria: ColumnElement,
+    excluded_event_types: list[str],
 ) -> None:
     """Remove filtered events and linked states."""
     database_engine = instance.database_engine
@@ -648,7 +930,7 @@ def _purge_filtered_events(
     event_ids, data_ids = zip(
         *(
             session.query(Events.event_id, Events.data_id)
-            .filter(Events.event_type.in_(excluded_event_types))
+            .filter(events_criteria)
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -677,18 +959,14 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
     database_engine = instance.database_engine
     assert database_engine is not None
     with session_scope(session=instance.get_session()) as session:
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
-            if entity_filter(entity_id)
-        ]
-        _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        if (
+            states_criteria := _select_states_entity_criteria(
+                instance, session, entity_filter
+            )
+        ) is not None:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states
             # or events record.
-            _purge_filtered_states(
-                instance, session, selected_entity_ids, database_engine
-            )
+            _purge_filtered_states(instance, session, states_criteria, database_engine)
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
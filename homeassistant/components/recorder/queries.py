@@ -4,7 +4,16 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    delete,
+    distinct,
+    exists,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -12,31 +21,71 @@ from .const import MAX_ROWS_TO_PURGE
 from .db_schema import (
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 
 
-def find_shared_attributes_id(
-    data_hash: int, shared_attrs: str
+def find_shared_attributes_ids(hashes: Iterable[int]) -> StatementLambdaElement:
+    """Find the attributes_ids and shared_attrs by hashes."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(StateAttributes.hash.in_(hashes))
+    )
+
+
+def find_shared_data_ids(hashes: Iterable[int]) -> StatementLambdaElement:
+    """Find the data_ids and shared_data by hashes."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).filter(
+            EventData.hash.in_(hashes)
+        )
+    )
+
+
+def find_latest_shared_attributes(
+    start_time_ts: float, limit: int
 ) -> StatementLambdaElement:
-    """Find an attributes_id by hash and shared_attrs."""
+    """Find the attributes of the latest state of each entity since start_time_ts."""
     return lambda_stmt(
-        lambda: select(StateAttributes.attributes_id)
-        .filter(StateAttributes.hash == data_hash)
-        .filter(StateAttributes.shared_attrs == shared_attrs)
+        lambda: select(StateAttributes.attributes_id, StateAttributes.shared_attrs)
+        .filter(
+            StateAttributes.attributes_id.in_(
+                select(States.attributes_id).filter(
+                    States.state_id.in_(
+                        select(func.max(States.state_id))
+                        .filter(States.last_updated_ts >= start_time_ts)
+                        .group_by(States.metadata_id)
+                    )
+                )
+            )
+        )
+        .limit(limit)
     )
 
 
-def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElement:
-    """Find a data_id by hash and shared_data."""
+def find_latest_shared_data(start_time_ts: float, limit: int) -> StatementLambdaElement:
+    """Find the data of the latest event of each event type since start_time_ts."""
     return lambda_stmt(
-        lambda: select(EventData.data_id)
-        .filter(EventData.hash == attr_hash)
-        .filter(EventData.shared_data == shared_data)
+        lambda: select(EventData.data_id, EventData.shared_data)
+        .filter(
+            EventData.data_id.in_(
+                select(Events.data_id).filter(
+                    Events.event_id.in_(
+                        select(func.max(Events.event_id))
+                        .filter(Events.time_fired_ts >= start_time_ts)
+                        .group_by(Events.event_type_id)
+                    )
+                )
+            )
+        )
+        .limit(limit)
     )
 
 
@@ -596,6 +645,91 @@ def find_states_to_purge(purge_before: float) -> StatementLambdaElement:
     )
 
 
+def find_states_purge_boundary(
+    purge_before: float, offset: int
+) -> StatementLambdaElement:
+    """Find the last_updated_ts of the state at offset in the states to purge."""
+    return lambda_stmt(
+        lambda: select(States.last_updated_ts)
+        .filter(States.last_updated_ts < purge_before)
+        .order_by(States.last_updated_ts)
+        .offset(offset)
+        .limit(1)
+    )
+
+
+def find_events_purge_boundary(
+    purge_before: float, offset: int
+) -> StatementLambdaElement:
+    """Find the time_fired_ts of the event at offset in the events to purge."""
+    return lambda_stmt(
+        lambda: select(Events.time_fired_ts)
+        .filter(Events.time_fired_ts < purge_before)
+        .order_by(Events.time_fired_ts)
+        .offset(offset)
+        .limit(1)
+    )
+
+
+def disconnect_states_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Disconnect states rows from the states updated before purge_before."""
+    # The states to purge are selected from a derived table since
+    # MySQL does not allow selecting from the table being updated.
+    # The distinct prevents MySQL from merging the derived table
+    # into the update.
+    return lambda_stmt(
+        lambda: update(States)
+        .where(
+            States.old_state_id.in_(
+                select(
+                    select(distinct(States.state_id).label("state_id"))
+                    .filter(States.last_updated_ts < purge_before)
+                    .subquery()
+                    .c.state_id
+                )
+            )
+        )
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Delete states rows updated before purge_before."""
+    return lambda_stmt(
+        lambda: delete(States)
+        .where(States.last_updated_ts < purge_before)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_events_rows_before(purge_before: float) -> StatementLambdaElement:
+    """Delete events rows fired before purge_before."""
+    return lambda_stmt(
+        lambda: delete(Events)
+        .where(Events.time_fired_ts < purge_before)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_unused_attributes_ids() -> StatementLambdaElement:
+    """Find attributes_ids that are no longer used by any state."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .where(~exists().where(States.attributes_id == StateAttributes.attributes_id))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def find_unused_data_ids() -> StatementLambdaElement:
+    """Find data_ids that are no longer used by any event."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id)
+        .where(~exists().where(Events.data_id == EventData.data_id))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime,
 ) -> StatementLambdaElement:
@@ -640,3 +774,119 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
 def find_legacy_row() -> StatementLambdaElement:
     """Check if there are still states in the table with an event_id."""
     return lambda_stmt(lambda: select(func.max(States.event_id)))
+
+
+def find_event_type_ids(event_types: Iterable[str]) -> StatementLambdaElement:
+    """Find the event_type_ids for the given event_types."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id, EventTypes.event_type).filter(
+            EventTypes.event_type.in_(event_types)
+        )
+    )
+
+
+def find_states_metadata_ids(entity_ids: Iterable[str]) -> StatementLambdaElement:
+    """Find the metadata_ids for the given entity_ids."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).filter(
+            StatesMeta.entity_id.in_(entity_ids)
+        )
+    )
+
+
+def select_event_type_ids(event_types: tuple[str, ...]) -> Select:
+    """Generate a select for event type ids.
+
+    This query is intentionally not a lambda statement
+    so it can be used as a subquery.
+    """
+    return select(EventTypes.event_type_id).where(
+        EventTypes.event_type.in_(event_types)
+    )
+
+
+def select_metadata_ids(entity_ids: tuple[str, ...]) -> Select:
+    """Generate a select for states metadata ids.
+
+    This query is intentionally not a lambda statement
+    so it can be used as a subquery.
+    """
+    return select(StatesMeta.metadata_id).where(StatesMeta.entity_id.in_(entity_ids))
+
+
+def has_events_event_type_ids_to_migrate() -> StatementLambdaElement:
+    """Check if there are events that need their event_type_id set."""
+    return lambda_stmt(
+        lambda: select(Events.event_id)
+        .filter(Events.event_type_id.is_(None))
+        .filter(Events.event_type.is_not(None))
+        .limit(1)
+    )
+
+
+def has_states_metadata_ids_to_migrate() -> StatementLambdaElement:
+    """Check if there are states that need their metadata_id set."""
+    return lambda_stmt(
+        lambda: select(States.state_id)
+        .filter(States.metadata_id.is_(None))
+        .filter(States.entity_id.is_not(None))
+        .limit(1)
+    )
+
+
+def find_event_type_to_migrate(limit: int) -> StatementLambdaElement:
+    """Find events that need their event_type_id set."""
+    return lambda_stmt(
+        lambda: select(Events.event_id, Events.event_type)
+        .filter(Events.event_type_id.is_(None))
+        .filter(Events.event_type.is_not(None))
+        .limit(limit)
+    )
+
+
+def find_entity_ids_to_migrate(limit: int) -> StatementLambdaElement:
+    """Find states that need their metadata_id set."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.entity_id)
+        .filter(States.metadata_id.is_(None))
+        .filter(States.entity_id.is_not(None))
+        .limit(limit)
+    )
+
+
+def find_unused_event_type_ids() -> StatementLambdaElement:
+    """Find event_type_ids that are no longer used by any event."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id, EventTypes.event_type)
+        .outerjoin(Events, EventTypes.event_type_id == Events.event_type_id)
+        .filter(Events.event_id.is_(None))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def find_unused_states_metadata_ids() -> StatementLambdaElement:
+    """Find metadata_ids that are no longer used by any state."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id)
+        .outerjoin(States, StatesMeta.metadata_id == States.metadata_id)
+        .filter(States.state_id.is_(None))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def delete_event_types_rows(event_type_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete event_types rows."""
+    return lambda_stmt(
+        lambda: delete(EventTypes)
+        .where(EventTypes.event_type_id.in_(event_type_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_meta_rows(metadata_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_meta rows."""
+    return lambda_stmt(
+        lambda: delete(StatesMeta)
+        .where(StatesMeta.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
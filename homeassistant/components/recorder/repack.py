@@ -7,7 +7,8 @@ from typing import TYPE_CHECKING
 from sqlalchemy import text
 
 from .const import SupportedDialect
-from .db_schema import ALL_TABLES
+from .db_schema import ALL_TABLES, PARTITION_LEGACY_SUFFIX, PARTITIONED_TABLES
+from .util import get_table_partitions, session_scope
 
 if TYPE_CHECKING:
     from . import Recorder
@@ -30,11 +31,22 @@ def repack_database(instance: Recorder) -> None:
 
     # Execute postgresql vacuum command to free up space on disk
     if dialect_name == SupportedDialect.POSTGRESQL:
+        vacuum = "VACUUM"
+        if instance.tables_partitioned:
+            # Old rows are dropped with their partitions, only the legacy
+            # partitions still have rows deleted one by one
+            tables = [table for table in ALL_TABLES if table not in PARTITIONED_TABLES]
+            with session_scope(session=instance.get_session()) as session:
+                for table in PARTITIONED_TABLES:
+                    legacy_table = f"{table}_{PARTITION_LEGACY_SUFFIX}"
+                    if legacy_table in get_table_partitions(session, table):
+                        tables.append(legacy_table)
+            vacuum = f"VACUUM {','.join(tables)}"
         _LOGGER.debug("Vacuuming SQL DB to free space")
         with instance.engine.connect().execution_options(
             isolation_level="AUTOCOMMIT"
         ) as conn:
-            conn.execute(text("VACUUM"))
+            conn.execute(text(vacuum))
             conn.commit()
         return
 
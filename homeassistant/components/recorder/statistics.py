@@ -10,10 +10,11 @@ from functools import partial
 from itertools import chain, groupby
 import json
 import logging
+from math import fsum
 import os
 import re
 from statistics import mean
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 from sqlalchemy import bindparam, func, lambda_stmt, select, text
 from sqlalchemy.engine import Engine
@@ -25,7 +26,7 @@ from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Subquery
 import voluptuous as vol
 
-from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, EVENT_CORE_CONFIG_UPDATE
 from homeassistant.core import Event, HomeAssistant, callback, valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry
@@ -61,7 +62,10 @@ from .const import (
 from .db_schema import (
     Statistics,
     StatisticsBase,
+    StatisticsDay,
     StatisticsMeta,
+    StatisticsMonth,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -153,6 +157,11 @@ STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
 
 _LOGGER = logging.getLogger(__name__)
 
+_KeyT = TypeVar("_KeyT", int, str)
+
+# The number of metadata_ids of which the rollups are rebuilt in one task
+STATISTICS_ROLLUPS_BATCH_SIZE = 10
+
 
 def _get_unit_class(unit: str | None) -> str | None:
     """Get corresponding unit class from from the statistics unit."""
@@ -276,6 +285,104 @@ class PlatformCompiledStatistics:
     current_metadata: dict[str, tuple[int, StatisticMetaData]]
 
 
+@dataclasses.dataclass
+class _RunningStatistic:
+    """Running aggregates of the 5-minute statistics of one metadata_id."""
+
+    mean_total: float = 0.0
+    mean_count: int = 0
+    min: float | None = None
+    max: float | None = None
+    last_reset: datetime | None = None
+    state: float | None = None
+    sum: float | None = None
+
+
+class HourlyStatisticsAccumulator:
+    """Keep running aggregates of the 5-minute statistics of the current hour.
+
+    This allows the hourly statistics to be compiled without reading back
+    the 5-minute statistics of the hour. The aggregates are only used if
+    every 5-minute period of the hour was added in order, otherwise the
+    hourly statistics are compiled from the database.
+
+    This class is not thread-safe and must only be used from the recorder
+    thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accumulator."""
+        self._hour_start: datetime | None = None
+        self._next_start: datetime | None = None
+        self._stats: dict[int, _RunningStatistic] = {}
+
+    def reset(self) -> None:
+        """Drop the aggregates.
+
+        Must be called when 5-minute statistics of the current hour are
+        modified by anything else than compile_statistics.
+        """
+        self._hour_start = None
+        self._next_start = None
+        self._stats = {}
+
+    def add_period(
+        self, start: datetime, stats: Iterable[tuple[int, StatisticData]]
+    ) -> None:
+        """Add the 5-minute statistics compiled for the period starting at start."""
+        if start.minute == 0:
+            self._hour_start = start
+            self._stats = {}
+        elif self._next_start is None or start != self._next_start:
+            # A period is missing, the hour has to be compiled from the database
+            self.reset()
+            return
+        self._next_start = start + timedelta(minutes=5)
+
+        for metadata_id, stat in stats:
+            if (running := self._stats.get(metadata_id)) is None:
+                running = self._stats[metadata_id] = _RunningStatistic()
+            if (_mean := stat.get("mean")) is not None:
+                running.mean_total += _mean
+                running.mean_count += 1
+            if (_min := stat.get("min")) is not None:
+                running.min = _min if running.min is None else min(running.min, _min)
+            if (_max := stat.get("max")) is not None:
+                running.max = _max if running.max is None else max(running.max, _max)
+            # The sum is taken from the last 5-minute period of the hour
+            running.last_reset = stat.get("last_reset")
+            running.state = stat.get("state")
+            running.sum = stat.get("sum")
+
+    def hourly_statistics(
+        self, start_time: datetime
+    ) -> dict[int, StatisticData] | None:
+        """Return the hourly statistics for the hour starting at start_time.
+
+        Returns None if not every 5-minute period of the hour was added.
+        """
+        if self._hour_start != start_time or self._next_start != (
+            start_time + timedelta(hours=1)
+        ):
+            return None
+        return {
+            metadata_id: {
+                "start": start_time,
+                "mean": (
+                    running.mean_total / running.mean_count
+                    if running.mean_count
+                    else None
+                ),
+                "min": running.min,
+                "max": running.max,
+                "last_reset": running.last_reset,
+                "state": running.state,
+                "sum": running.sum,
+            }
+            for metadata_id, running in self._stats.items()
+        }
+
+
 def split_statistic_id(entity_id: str) -> list[str]:
     """Split a state entity ID into domain and object ID."""
     return entity_id.split(":", 1)
@@ -340,6 +447,19 @@ def async_setup(hass: HomeAssistant) -> None:
 
     async_at_start(hass, setup_entity_registry_event_handler)
 
+    time_zone = hass.config.time_zone
+
+    @callback
+    def _async_core_config_updated(event: Event) -> None:
+        """Rebuild the statistics rollups when the time zone is changed."""
+        nonlocal time_zone
+        if hass.config.time_zone == time_zone:
+            return
+        time_zone = hass.config.time_zone
+        get_instance(hass).async_rebuild_statistics_rollups()
+
+    hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, _async_core_config_updated)
+
 
 def get_start_time() -> datetime:
     """Return start time."""
@@ -613,16 +733,32 @@ def _compile_hourly_statistics_summary_mean_stmt(
     )
 
 
-def _compile_hourly_statistics(session: Session, start: datetime) -> None:
+def _compile_hourly_statistics(
+    session: Session,
+    start: datetime,
+    accumulator: HourlyStatisticsAccumulator | None = None,
+) -> None:
     """Compile hourly statistics.
 
     This will summarize 5-minute statistics for one hour:
     - average, min max is computed by a database query
     - sum is taken from the last 5-minute entry during the hour
+
+    If the accumulator has seen every 5-minute period of the hour, its
+    aggregates are used instead and the database is not queried.
     """
     start_time = start.replace(minute=0)
     end_time = start_time + timedelta(hours=1)
 
+    if (
+        accumulator is not None
+        and (accumulated := accumulator.hourly_statistics(start_time)) is not None
+    ):
+        for metadata_id, stat in accumulated.items():
+            session.add(Statistics.from_stats(metadata_id, stat))
+        _add_hour_to_statistics_rollups(session, start_time, accumulated)
+        return
+
     # Compute last hour's average, min, max
     summary: dict[str, StatisticData] = {}
     stmt = _compile_hourly_statistics_summary_mean_stmt(start_time, end_time)
@@ -674,6 +810,7 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
     # Insert compiled hourly statistics in the database
     for metadata_id, stat in summary.items():
         session.add(Statistics.from_stats(metadata_id, stat))
+    _add_hour_to_statistics_rollups(session, start_time, summary)
 
 
 @retryable_database_job("statistics")
@@ -691,6 +828,59 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
             _LOGGER.debug("Statistics already compiled for %s-%s", start, end)
             return True
 
+    _compile_statistics(instance, start)
+
+    if fire_events:
+        instance.hass.bus.fire(EVENT_RECORDER_5MIN_STATISTICS_GENERATED)
+        if start.minute == 55:
+            instance.hass.bus.fire(EVENT_RECORDER_HOURLY_STATISTICS_GENERATED)
+
+    return True
+
+
+@retryable_database_job("statistics")
+def compile_missing_statistics(
+    instance: Recorder, start: datetime, end: datetime, fire_events: bool
+) -> bool:
+    """Compile all missing 5-minute statistics periods between start and end.
+
+    This is used to catch up after the recorder was not running. The
+    compiled periods are looked up with a single query and the hourly
+    statistics are compiled from the aggregates of the accumulator.
+    """
+    start = dt_util.as_utc(start)
+    end = dt_util.as_utc(end)
+
+    with session_scope(session=instance.get_session()) as session:
+        compiled_runs = {
+            process_timestamp(run_start)
+            for (run_start,) in session.query(StatisticsRuns.start)
+            .filter(StatisticsRuns.start >= start)
+            .filter(StatisticsRuns.start < end)
+        }
+
+    compiled_5min = compiled_hourly = False
+    period_start = start
+    while period_start < end:
+        if period_start in compiled_runs:
+            _LOGGER.debug("Statistics already compiled for %s", period_start)
+        else:
+            _compile_statistics(instance, period_start)
+            compiled_5min = True
+            compiled_hourly |= period_start.minute == 55
+        period_start += timedelta(minutes=5)
+
+    if fire_events and compiled_5min:
+        instance.hass.bus.fire(EVENT_RECORDER_5MIN_STATISTICS_GENERATED)
+        if compiled_hourly:
+            instance.hass.bus.fire(EVENT_RECORDER_HOURLY_STATISTICS_GENERATED)
+
+    return True
+
+
+def _compile_statistics(instance: Recorder, start: datetime) -> None:
+    """Compile and insert the 5-minute statistics for the period starting at start."""
+    end = start + timedelta(minutes=5)
     _LOGGER.debug("Compiling statistics for %s-%s", start, end)
     platform_stats: list[StatisticResult] = []
     current_metadata: dict[str, tuple[int, StatisticMetaData]] = {}
@@ -711,39 +901,42 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
         platform_stats.extend(compiled.platform_stats)
         current_metadata.update(compiled.current_metadata)
 
+    accumulator = instance.statistics_accumulator
+    unique_constraint_filter = _filter_unique_constraint_integrity_error(instance)
+
+    def _exception_filter(err: Exception) -> bool:
+        """Drop the aggregates which include the failed period."""
+        accumulator.reset()
+        return unique_constraint_filter(err)
+
     # Insert collected statistics in the database
     with session_scope(
-        session=instance.get_session(),
-        exception_filter=_filter_unique_constraint_integrity_error(instance),
+        session=instance.get_session(), exception_filter=_exception_filter
     ) as session:
+        period_stats: list[tuple[int, StatisticData]] = []
         for stats in platform_stats:
             metadata_id = _update_or_add_metadata(
                 session, stats["meta"], current_metadata
             )
-            _insert_statistics(
+            if _insert_statistics(
                 session,
                 StatisticsShortTerm,
                 metadata_id,
                 stats["stat"],
-            )
+            ):
+                period_stats.append((metadata_id, stats["stat"]))
+        accumulator.add_period(start, period_stats)
 
         if start.minute == 55:
             # A full hour is ready, summarize it
-            _compile_hourly_statistics(session, start)
+            _compile_hourly_statistics(session, start, accumulator)
 
         session.add(StatisticsRuns(start=start))
 
-    if fire_events:
-        instance.hass.bus.fire(EVENT_RECORDER_5MIN_STATISTICS_GENERATED)
-        if start.minute == 55:
-            instance.hass.bus.fire(EVENT_RECORDER_HOURLY_STATISTICS_GENERATED)
-
-    return True
-
 
 def _adjust_sum_statistics(
     session: Session,
-    table: type[Statistics | StatisticsShortTerm],
+    table: type[StatisticsBase],
     metadata_id: int,
     start_time: datetime,
     adj: float,
@@ -770,7 +963,7 @@ def _insert_statistics(
     table: type[Statistics | StatisticsShortTerm],
     metadata_id: int,
     statistic: StatisticData,
-) -> None:
+) -> bool:
     """Insert statistics in the database."""
     try:
         session.add(table.from_stats(metadata_id, statistic))
@@ -780,6 +973,8 @@ def _insert_statistics(
             metadata_id,
             statistic,
         )
+        return False
+    return True
 
 
 def _update_statistics(
@@ -890,6 +1085,7 @@ def _clear_statistics_with_session(session: Session, statistic_ids: list[str]) -
 
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
+    instance.statistics_accumulator.reset()
     with session_scope(session=instance.get_session()) as session:
         _clear_statistics_with_session(session, statistic_ids)
 
@@ -988,25 +1184,44 @@ def list_statistic_ids(
     ]
 
 
+def _mean_of_hourly_means(mean_values: list[float], mean_counts: list[int]) -> float:
+    """Return the mean of hourly means, some of which may be means of several hours."""
+    if len(mean_values) == (total_count := sum(mean_counts)):
+        return mean(mean_values)
+    return (
+        fsum(value * count for value, count in zip(mean_values, mean_counts))
+        / total_count
+    )
+
+
 def _reduce_statistics(
-    stats: dict[str, list[dict[str, Any]]],
+    stats: Mapping[_KeyT, list[dict[str, Any]]],
     same_period: Callable[[datetime, datetime], bool],
     period_start_end: Callable[[datetime], tuple[datetime, datetime]],
     period: timedelta,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[dict[str, Any]]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
-    result: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    with_mean_count: bool = False,
+) -> dict[_KeyT, list[dict[str, Any]]]:
+    """Reduce hourly statistics to daily or monthly statistics.
+
+    Statistics which were already reduced to days or months can be reduced
+    further if they have a mean_count. If with_mean_count is set, the
+    mean_count of the reduced statistics is included in the result.
+    """
+    result: dict[_KeyT, list[dict[str, Any]]] = defaultdict(list)
     for statistic_id, stat_list in stats.items():
         max_values: list[float] = []
         mean_values: list[float] = []
+        mean_counts: list[int] = []
         min_values: list[float] = []
         prev_stat: dict[str, Any] = stat_list[0]
 
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(
-            stat_list, ({"start": stat_list[-1]["start"] + period},)
-        ):
+        # Loop over the hourly statistics + a fake entry to end the period,
+        # the fake entry is offset from the end of the last period since the
+        # start of a period + period may still be in the same period on DST
+        # changes
+        fake_start = period_start_end(stat_list[-1]["start"])[1] + period
+        for statistic in chain(stat_list, ({"start": fake_start},)):
             if not same_period(prev_stat["start"], statistic["start"]):
                 start, end = period_start_end(prev_stat["start"])
                 # The previous statistic was the last entry of the period
@@ -1015,7 +1230,13 @@ def _reduce_statistics(
                     "end": end,
                 }
                 if "mean" in types:
-                    row["mean"] = mean(mean_values) if mean_values else None
+                    row["mean"] = (
+                        _mean_of_hourly_means(mean_values, mean_counts)
+                        if mean_values
+                        else None
+                    )
+                    if with_mean_count:
+                        row["mean_count"] = sum(mean_counts)
                 if "min" in types:
                     row["min"] = min(min_values) if min_values else None
                 if "max" in types:
@@ -1030,11 +1251,13 @@ def _reduce_statistics(
 
                 max_values = []
                 mean_values = []
+                mean_counts = []
                 min_values = []
             if statistic.get("max") is not None:
                 max_values.append(statistic["max"])
             if statistic.get("mean") is not None:
                 mean_values.append(statistic["mean"])
+                mean_counts.append(statistic.get("mean_count", 1))
             if statistic.get("min") is not None:
                 min_values.append(statistic["min"])
             prev_stat = statistic
@@ -1058,6 +1281,13 @@ def day_start_end(time: datetime) -> tuple[datetime, datetime]:
     return (start, end)
 
 
+def _next_day_start(time: datetime) -> datetime:
+    """Return the start of the day after the day time is within."""
+    return dt_util.as_utc(
+        dt_util.start_of_local_day(dt_util.as_local(time).date() + timedelta(days=1))
+    )
+
+
 def _reduce_statistics_per_day(
     stats: dict[str, list[dict[str, Any]]],
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
@@ -1128,11 +1358,249 @@ def _reduce_statistics_per_month(
     )
 
 
+def _statistics_rows_to_dicts(
+    rows: Iterable[Row], with_mean_count: bool
+) -> dict[int, list[dict[str, Any]]]:
+    """Group statistics rows by metadata_id as dicts which can be reduced."""
+    stats: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        stat = {
+            "start": process_timestamp(row.start),
+            "mean": row.mean,
+            "min": row.min,
+            "max": row.max,
+            "last_reset": row.last_reset,
+            "state": row.state,
+            "sum": row.sum,
+        }
+        if with_mean_count:
+            stat["mean_count"] = row.mean_count
+        stats[row.metadata_id].append(stat)
+    return stats
+
+
+def _rebuild_statistics_rollups_with_session(
+    session: Session,
+    metadata_ids: list[int],
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> None:
+    """Rebuild the day and month rollups of metadata_ids from the hourly statistics.
+
+    Only the days and months overlapping start_time - end_time are rebuilt,
+    all of them are rebuilt if start_time and end_time are None.
+    """
+    range_start = range_end = None
+    if start_time is not None and end_time is not None:
+        # The days of the entire months are rebuilt, which avoids
+        # having to find the start and end of days around DST changes
+        range_start = month_start_end(start_time)[0]
+        range_end = month_start_end(end_time - timedelta.resolution)[1]
+
+    # Months are rolled up from the days, so the days are rebuilt first
+    for table, source, same_period, period_start_end, period in (
+        (StatisticsDay, Statistics, same_day, day_start_end, timedelta(days=1)),
+        (
+            StatisticsMonth,
+            StatisticsDay,
+            same_month,
+            month_start_end,
+            timedelta(days=31),
+        ),
+    ):
+        query = session.query(source).filter(source.metadata_id.in_(metadata_ids))
+        delete = session.query(table).filter(table.metadata_id.in_(metadata_ids))
+        if range_start is not None:
+            query = query.filter(source.start >= range_start).filter(
+                source.start < range_end
+            )
+            delete = delete.filter(table.start >= range_start).filter(
+                table.start < range_end
+            )
+        reduced = _reduce_statistics(
+            _statistics_rows_to_dicts(
+                query.order_by(source.metadata_id, source.start),
+                source is StatisticsDay,
+            ),
+            same_period,
+            period_start_end,
+            period,
+            {"last_reset", "max", "mean", "min", "state", "sum"},
+            with_mean_count=True,
+        )
+        delete.delete(synchronize_session=False)
+        session.bulk_insert_mappings(
+            table,
+            [
+                {
+                    "metadata_id": metadata_id,
+                    "start": rollup["start"],
+                    "mean": rollup["mean"],
+                    "mean_count": rollup["mean_count"],
+                    "min": rollup["min"],
+                    "max": rollup["max"],
+                    "last_reset": rollup["last_reset"],
+                    "state": rollup["state"],
+                    "sum": rollup["sum"],
+                }
+                for metadata_id, rollups in reduced.items()
+                for rollup in rollups
+            ],
+        )
+
+
+def _add_hour_to_statistics_rollups(
+    session: Session, start_time: datetime, summary: Mapping[int, StatisticData]
+) -> None:
+    """Add the statistics of a newly compiled hour to the day and month rollups.
+
+    The hour must be newer than the hours which are already rolled up.
+    """
+    if not summary:
+        return
+
+    for table, period_start_end in (
+        (StatisticsDay, day_start_end),
+        (StatisticsMonth, month_start_end),
+    ):
+        period_start = period_start_end(start_time)[0]
+        rollups: dict[int, StatisticsRollupBase] = {
+            rollup.metadata_id: rollup
+            for rollup in session.query(table).filter(table.start == period_start)
+        }
+        for metadata_id, stat in summary.items():
+            if (rollup := rollups.get(metadata_id)) is None:
+                rollup = table(
+                    metadata_id=metadata_id, start=period_start, mean_count=0
+                )
+                session.add(rollup)
+            if (_mean := stat.get("mean")) is not None:
+                rollup.mean = ((rollup.mean or 0.0) * rollup.mean_count + _mean) / (
+                    rollup.mean_count + 1
+                )
+                rollup.mean_count += 1
+            if (_min := stat.get("min")) is not None:
+                rollup.min = _min if rollup.min is None else min(rollup.min, _min)
+            if (_max := stat.get("max")) is not None:
+                rollup.max = _max if rollup.max is None else max(rollup.max, _max)
+            rollup.last_reset = stat.get("last_reset")
+            rollup.state = stat.get("state")
+            rollup.sum = stat.get("sum")
+
+
+def find_statistics_rollups_to_rebuild(instance: Recorder) -> list[int]:
+    """Return the metadata_ids of which the rollups need to be rebuilt.
+
+    This is the case if the hourly statistics were never rolled up, or if
+    they were rolled up in a different time zone. Both are detected by
+    comparing the first day rollup with the first hourly statistic.
+    """
+    first_hour = (
+        select(func.min(Statistics.start))
+        .where(Statistics.metadata_id == StatisticsMeta.id)
+        .scalar_subquery()
+    )
+    first_day = (
+        select(func.min(StatisticsDay.start))
+        .where(StatisticsDay.metadata_id == StatisticsMeta.id)
+        .scalar_subquery()
+    )
+    with session_scope(session=instance.get_session()) as session:
+        return [
+            metadata_id
+            for metadata_id, first_hour_start, first_day_start in session.execute(
+                select(StatisticsMeta.id, first_hour, first_day)
+            )
+            if first_hour_start is not None
+            and (
+                first_day_start is None
+                or process_timestamp(first_day_start)
+                != day_start_end(process_timestamp(first_hour_start))[0]
+            )
+        ]
+
+
+@retryable_database_job("rebuild statistics rollups")
+def rebuild_statistics_rollups(instance: Recorder, metadata_ids: list[int]) -> bool:
+    """Rebuild all day and month rollups of metadata_ids."""
+    _LOGGER.debug("Rebuilding statistics rollups for %s", metadata_ids)
+    with session_scope(session=instance.get_session()) as session:
+        _rebuild_statistics_rollups_with_session(session, metadata_ids, None, None)
+    return True
+
+
+def _statistics_rollup_segments(
+    start_time: datetime,
+    end_time: datetime | None,
+    period: Literal["day", "week", "month"],
+) -> list[tuple[type[StatisticsBase], datetime, datetime | None]]:
+    """Split start_time - end_time in segments read from the rollups where possible.
+
+    Rollups are used for the days and months which are entirely within the
+    period, the remaining hours are read from the hourly statistics. The
+    first day is always read from the hourly statistics, so the statistic
+    before start_time is added in the same cases as without rollups.
+    """
+    days_start = _next_day_start(start_time)
+    days_end = day_start_end(end_time)[0] if end_time is not None else None
+    if days_end is not None and days_end <= days_start:
+        return [(Statistics, start_time, end_time)]
+
+    segments: list[tuple[type[StatisticsBase], datetime, datetime | None]] = [
+        (Statistics, start_time, days_start)
+    ]
+    if period == "month":
+        months_start = month_start_end(days_start - timedelta.resolution)[1]
+        months_end = month_start_end(days_end)[0] if days_end is not None else None
+        if months_end is None or months_start < months_end:
+            if days_start < months_start:
+                segments.append((StatisticsDay, days_start, months_start))
+            segments.append((StatisticsMonth, months_start, months_end))
+            if months_end is None:
+                return segments
+            days_start = months_end
+
+    if days_end is None or days_start < days_end:
+        segments.append((StatisticsDay, days_start, days_end))
+    if end_time is not None and days_end is not None and days_end < end_time:
+        segments.append((Statistics, days_end, end_time))
+    return segments
+
+
+def _statistics_during_period_rollup_rows(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    period: Literal["day", "week", "month"],
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> list[Row]:
+    """Return hourly statistics and rollups during start_time - end_time.
+
+    The rows are sorted by metadata_id and start.
+    """
+    return sorted(
+        chain.from_iterable(
+            execute_stmt_lambda_element(
+                session,
+                _statistics_during_period_stmt(
+                    segment_start, segment_end, metadata_ids, table, types
+                ),
+            )
+            for table, segment_start, segment_end in _statistics_rollup_segments(
+                start_time, end_time, period
+            )
+        ),
+        # The segments are in order, and sorted is stable
+        key=lambda row: row.metadata_id,  # type: ignore[no-any-return]
+    )
+
+
 def _statistics_during_period_stmt(
     start_time: datetime,
     end_time: datetime | None,
     metadata_ids: list[int] | None,
-    table: type[Statistics | StatisticsShortTerm],
+    table: type[StatisticsBase],
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> StatementLambdaElement:
     """Prepare a database query for statistics during a given period.
@@ -1147,6 +1615,8 @@ def _statistics_during_period_stmt(
         columns.append(table.max)
     if "mean" in types:
         columns.append(table.mean)
+        if issubclass(table, StatisticsRollupBase):
+            columns.append(table.mean_count)
     if "min" in types:
         columns.append(table.min)
     if "state" in types:
@@ -1595,10 +2065,24 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
+    use_rollups = (
+        period in ("day", "week", "month")
+        and get_instance(hass).statistics_rollups_active
     )
-    stats = execute_stmt_lambda_element(session, stmt)
+    if use_rollups:
+        stats = _statistics_during_period_rollup_rows(
+            session,
+            start_time,
+            end_time,
+            metadata_ids,
+            period,  # type: ignore[arg-type]
+            types,
+        )
+    else:
+        stmt = _statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = execute_stmt_lambda_element(session, stmt)
 
     if not stats:
         return {}
@@ -1628,6 +2112,7 @@ def _statistics_during_period_with_session(
         start_time,
         units,
         types,
+        with_mean_count=use_rollups,
     )
 
     if period == "day":
@@ -1878,8 +2363,13 @@ def _sorted_statistics_to_dict(
     start_time: datetime | None,
     units: dict[str, str] | None,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+    with_mean_count: bool = False,
 ) -> dict[str, list[dict]]:
-    """Convert SQL results into JSON friendly data structure."""
+    """Convert SQL results into JSON friendly data structure.
+
+    If with_mean_count is set, the mean_count of rollups is included so the
+    result can be reduced.
+    """
     result: dict = defaultdict(list)
     metadata = dict(_metadata.values())
     need_stat_at_start_time: set[int] = set()
@@ -1936,6 +2426,9 @@ def _sorted_statistics_to_dict(
             }
             if "mean" in types:
                 row["mean"] = convert(db_state.mean)
+                if with_mean_count:
+                    # Hourly statistics don't have a mean_count
+                    row["mean_count"] = getattr(db_state, "mean_count", 1)
             if "min" in types:
                 row["min"] = convert(db_state.min)
             if "max" in types:
@@ -2102,11 +2595,23 @@ def _import_statistics_with_session(
         session, statistic_ids=[metadata["statistic_id"]]
     )
     metadata_id = _update_or_add_metadata(session, metadata, old_metadata_dict)
+    first_start: datetime | None = None
+    last_start: datetime | None = None
     for stat in statistics:
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
+        if first_start is None or stat["start"] < first_start:
+            first_start = stat["start"]
+        if last_start is None or stat["start"] > last_start:
+            last_start = stat["start"]
+
+    if table == Statistics and first_start is not None and last_start is not None:
+        session.flush()
+        _rebuild_statistics_rollups_with_session(
+            session, [metadata_id], first_start, last_start + Statistics.duration
+        )
 
     return True
 
@@ -2119,12 +2624,18 @@ def import_statistics(
     table: type[Statistics | StatisticsShortTerm],
 ) -> bool:
     """Process an import_statistics job."""
+    if table == StatisticsShortTerm:
+        instance.statistics_accumulator.reset()
 
     with session_scope(
         session=instance.get_session(),
         exception_filter=_filter_unique_constraint_integrity_error(instance),
     ) as session:
-        return _import_statistics_with_session(session, metadata, statistics, table)
+        _import_statistics_with_session(session, metadata, statistics, table)
+
+    # Duplicated rows are only detected when the session is flushed, they
+    # are dropped by the exception filter and must not requeue the import
+    return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2136,6 +2647,7 @@ def adjust_statistics(
     adjustment_unit: str,
 ) -> bool:
     """Process an add_statistics job."""
+    instance.statistics_accumulator.reset()
 
     with session_scope(session=instance.get_session()) as session:
         metadata = get_metadata_with_session(session, statistic_ids=[statistic_id])
@@ -2164,6 +2676,27 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        # The sums of the days and months after the one of start_time are
+        # adjusted, the day and month of start_time are rebuilt since their
+        # sum is only adjusted if they have hours after start_time
+        for table, next_period_start in (
+            (StatisticsDay, _next_day_start(start_time)),
+            (StatisticsMonth, month_start_end(start_time)[1]),
+        ):
+            _adjust_sum_statistics(
+                session,
+                table,
+                metadata[statistic_id][0],
+                next_period_start,
+                sum_adjustment,
+            )
+        _rebuild_statistics_rollups_with_session(
+            session,
+            [metadata[statistic_id][0]],
+            start_time.replace(minute=0),
+            start_time.replace(minute=0) + Statistics.duration,
+        )
+
     return True
 
 
@@ -2197,6 +2730,7 @@ def change_statistics_unit(
     old_unit: str,
 ) -> None:
     """Change statistics unit for a statistic_id."""
+    instance.statistics_accumulator.reset()
     with session_scope(session=instance.get_session()) as session:
         metadata = get_metadata_with_session(session, statistic_ids=[statistic_id]).get(
             statistic_id
@@ -2215,7 +2749,7 @@ def change_statistics_unit(
         metadata_id = metadata[0]
 
         convert = _get_unit_converter(old_unit, new_unit)
-        for table in (StatisticsShortTerm, Statistics):
+        for table in (StatisticsShortTerm, Statistics, StatisticsDay, StatisticsMonth):
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
         session.query(StatisticsMeta).filter(
             StatisticsMeta.statistic_id == statistic_id
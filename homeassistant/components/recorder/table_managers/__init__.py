@@ -0,0 +1,124 @@
+"""Managers for each table."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from lru import LRU  # pylint: disable=no-name-in-module
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from ..const import SQLITE_MAX_BIND_VARS
+from ..db_schema import Base
+from ..util import chunked, execute_stmt_lambda_element
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+_DataT = TypeVar("_DataT", bound=Base)
+
+
+class BaseLRUTableManager(ABC, Generic[_DataT]):
+    """Map the unique strings of a lookup table to their ids.
+
+    The ids are cached in an LRU. Rows that were created by the
+    recorder but not committed yet are kept as pending until the
+    next commit, after which their ids are moved into the LRU.
+
+    Only the recorder thread may modify the cache. Other threads
+    can still look up ids but the ids they find are not cached.
+    """
+
+    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+        """Initialize the table manager."""
+        self.active = False
+        self.recorder = recorder
+        self._id_map: dict[str, int] = LRU(lru_size)
+        self._pending: dict[str, _DataT] = {}
+
+    @abstractmethod
+    def _find_ids_stmt(self, keys: Iterable[str]) -> StatementLambdaElement:
+        """Return the statement to find (id, key) rows for the keys."""
+
+    @abstractmethod
+    def _key_and_id(self, db_obj: _DataT) -> tuple[str, int]:
+        """Return the key and the id of a row."""
+
+    def get(
+        self, key: str, session: Session, from_recorder: bool = False
+    ) -> int | None:
+        """Resolve a key to its id.
+
+        Returns None if the key does not exist in the database yet.
+        """
+        return self.get_many((key,), session, from_recorder)[key]
+
+    def get_many(
+        self, keys: Iterable[str], session: Session, from_recorder: bool = False
+    ) -> dict[str, int | None]:
+        """Resolve keys to their ids.
+
+        Keys that do not exist in the database yet are mapped to None.
+        """
+        results: dict[str, int | None] = {}
+        missing: list[str] = []
+        for key in keys:
+            if (key_id := self._id_map.get(key)) is None:
+                missing.append(key)
+            results[key] = key_id
+
+        if not missing:
+            return results
+
+        with session.no_autoflush:
+            for missing_chunk in chunked(missing, SQLITE_MAX_BIND_VARS):
+                for key_id, key in execute_stmt_lambda_element(
+                    session, self._find_ids_stmt(missing_chunk)
+                ):
+                    results[key] = key_id
+                    if from_recorder:
+                        self._id_map[key] = key_id
+
+        return results
+
+    def get_pending(self, key: str) -> _DataT | None:
+        """Get a row that is waiting to be committed."""
+        return self._pending.get(key)
+
+    def add_pending(self, key: str, db_obj: _DataT) -> None:
+        """Add a row that will be committed with the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending[key] = db_obj
+
+    def post_commit_pending(self) -> None:
+        """Move the ids of the committed rows into the cache.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for db_obj in self._pending.values():
+            key, key_id = self._key_and_id(db_obj)
+            self._id_map[key] = key_id
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Drop the cache and the pending rows.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._id_map.clear()
+        self._pending.clear()
+
+    def evict_purged(self, keys: Iterable[str]) -> None:
+        """Evict keys whose rows were purged from the cache.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for key in keys:
+            self._id_map.pop(key, None)
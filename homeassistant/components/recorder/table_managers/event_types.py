@@ -0,0 +1,32 @@
+"""Support managing EventTypes."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from . import BaseLRUTableManager
+from ..db_schema import EventTypes
+from ..queries import find_event_type_ids
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+CACHE_SIZE = 2048
+
+
+class EventTypeManager(BaseLRUTableManager[EventTypes]):
+    """Manage the EventTypes table."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the event type manager."""
+        super().__init__(recorder, CACHE_SIZE)
+
+    def _find_ids_stmt(self, keys: Iterable[str]) -> StatementLambdaElement:
+        """Return the statement to find event_type_ids."""
+        return find_event_type_ids(keys)
+
+    def _key_and_id(self, db_obj: EventTypes) -> tuple[str, int]:
+        """Return the event_type and event_type_id of a row."""
+        return db_obj.event_type, db_obj.event_type_id
@@ -0,0 +1,32 @@
+"""Support managing StatesMeta."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from . import BaseLRUTableManager
+from ..db_schema import StatesMeta
+from ..queries import find_states_metadata_ids
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+CACHE_SIZE = 8192
+
+
+class StatesMetaManager(BaseLRUTableManager[StatesMeta]):
+    """Manage the StatesMeta table."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the states meta manager."""
+        super().__init__(recorder, CACHE_SIZE)
+
+    def _find_ids_stmt(self, keys: Iterable[str]) -> StatementLambdaElement:
+        """Return the statement to find metadata_ids."""
+        return find_states_metadata_ids(keys)
+
+    def _key_and_id(self, db_obj: StatesMeta) -> tuple[str, int]:
+        """Return the entity_id and metadata_id of a row."""
+        return db_obj.entity_id, db_obj.metadata_id
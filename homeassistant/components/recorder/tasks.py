@@ -146,6 +146,78 @@ class StatisticsTask(RecorderTask):
         instance.queue_task(StatisticsTask(self.start, self.fire_events))
 
 
+@dataclass
+class CompileMissingStatisticsTask(RecorderTask):
+    """An object to insert into the recorder queue to compile missed statistics.
+
+    The recorder queues one task for each hour of missed periods up front, so
+    the missed periods are compiled in order before any new period.
+    """
+
+    start: datetime
+    end: datetime
+    fire_events: bool
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics task."""
+        if statistics.compile_missing_statistics(
+            instance, self.start, self.end, self.fire_events
+        ):
+            return
+        # Schedule a new statistics task if this one didn't finish
+        instance.queue_task(
+            CompileMissingStatisticsTask(self.start, self.end, self.fire_events)
+        )
+
+
+@dataclass
+class StatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to rebuild statistics rollups.
+
+    If metadata_ids is None, the metadata_ids which need to be rebuilt are
+    looked up. Once nothing needs to be rebuilt the rollups are used for
+    queries.
+    """
+
+    metadata_ids: list[int] | None = None
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics rollups task."""
+        if (metadata_ids := self.metadata_ids) is None:
+            if not (
+                metadata_ids := statistics.find_statistics_rollups_to_rebuild(instance)
+            ):
+                instance.statistics_rollups_active = True
+                return
+            instance.statistics_rollups_active = False
+
+        batch_size = statistics.STATISTICS_ROLLUPS_BATCH_SIZE
+        if not statistics.rebuild_statistics_rollups(
+            instance, metadata_ids[:batch_size]
+        ):
+            # Schedule a new statistics task if this one didn't finish
+            instance.queue_task(StatisticsRollupsTask(metadata_ids))
+            return
+        # Once the batches are done, look up the metadata_ids again
+        # in case statistics were added in the meantime
+        instance.queue_task(StatisticsRollupsTask(metadata_ids[batch_size:] or None))
+
+
+@dataclass
+class PartitionTablesTask(RecorderTask):
+    """An object to insert into the recorder queue to partition the tables.
+
+    The states and events tables are partitioned if they are not yet and
+    the partitions for the upcoming days are created.
+    """
+
+    commit_before = True
+
+    def run(self, instance: Recorder) -> None:
+        """Run partition tables task."""
+        instance._partition_tables()  # pylint: disable=[protected-access]
+
+
 @dataclass
 class ImportStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an import statistics task."""
@@ -317,3 +389,39 @@ class PostSchemaMigrationTask(RecorderTask):
         instance._post_schema_migration(  # pylint: disable=[protected-access]
             self.old_version, self.new_version
         )
+
+
+@dataclass
+class EventTypeIDMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to migrate event type ids."""
+
+    # We have to commit before to make sure there are
+    # no new pending event_types about to be added to
+    # the db since this happens live
+    commit_before = True
+
+    def run(self, instance: Recorder) -> None:
+        """Run event type id migration task."""
+        # pylint: disable-next=[protected-access]
+        if not instance._migrate_event_type_ids():
+            # Schedule a new migration task if this one didn't finish
+            # so events queued in the meantime are processed first
+            instance.queue_task(EventTypeIDMigrationTask())
+
+
+@dataclass
+class EntityIDMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to migrate entity_ids to StatesMeta."""
+
+    # We have to commit before to make sure there are
+    # no new pending states_meta about to be added to
+    # the db since this happens live
+    commit_before = True
+
+    def run(self, instance: Recorder) -> None:
+        """Run entity_id migration task."""
+        # pylint: disable-next=[protected-access]
+        if not instance._migrate_entity_ids():
+            # Schedule a new migration task if this one didn't finish
+            # so events queued in the meantime are processed first
+            instance.queue_task(EntityIDMigrationTask())
@@ -1,12 +1,14 @@
 """SQLAlchemy util functions."""
 from __future__ import annotations
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 import functools
+from itertools import islice
 import logging
 import os
+import re
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, NoReturn, ParamSpec, TypeVar
 
@@ -31,6 +33,7 @@ import homeassistant.util.dt as dt_util
 
 from .const import DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX, SupportedDialect
 from .db_schema import (
+    PARTITION_DAY_FORMAT,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLES_TO_CHECK,
@@ -655,6 +658,75 @@ def write_lock_db_sqlite(instance: Recorder) -> Generator[None, None, None]:
             connection.execute(text("END;"))
 
 
+def table_is_partitioned(session: Session, table: str) -> bool:
+    """Check if a PostgreSQL table is partitioned."""
+    return (
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table"
+                " WHERE partrelid = to_regclass(:table)"
+            ),
+            {"table": table},
+        ).scalar()
+        is not None
+    )
+
+
+def get_table_partitions(session: Session, table: str) -> list[str]:
+    """Return the names of the partitions of a partitioned PostgreSQL table."""
+    return [
+        partition
+        for (partition,) in session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+    ]
+
+
+def get_partition_end(session: Session, partition: str) -> float | None:
+    """Return the exclusive upper bound of a PostgreSQL range partition.
+
+    Returns None if the partition does not exist or has no upper bound.
+    """
+    bound = session.execute(
+        text(
+            "SELECT pg_get_expr(relpartbound, oid) FROM pg_class"
+            " WHERE oid = to_regclass(:partition)"
+        ),
+        {"partition": partition},
+    ).scalar()
+    if not bound or not (match := re.search(r"TO \('?([^')]+)'?\)", bound)):
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def partition_name(table: str, day: datetime) -> str:
+    """Return the name of the partition of a table for a UTC day."""
+    return f"{table}_p{day.strftime(PARTITION_DAY_FORMAT)}"
+
+
+def partition_day(table: str, partition: str) -> datetime | None:
+    """Return the UTC day of a day partition of a table.
+
+    Returns None if the partition is not a day partition.
+    """
+    prefix = f"{table}_p"
+    if not partition.startswith(prefix):
+        return None
+    try:
+        day = datetime.strptime(partition[len(prefix) :], PARTITION_DAY_FORMAT)
+    except ValueError:
+        return None
+    return day.replace(tzinfo=dt_util.UTC)
+
+
 def async_migration_in_progress(hass: HomeAssistant) -> bool:
     """Determine if a migration is in progress.
 
@@ -779,3 +851,19 @@ def resolve_period(
             end_time += offset
 
     return (start_time, end_time)
+
+
+def take(take_num: int, iterable: Iterable) -> list[Any]:
+    """Return first n items of the iterable as a list.
+
+    From itertools recipes
+    """
+    return list(islice(iterable, take_num))
+
+
+def chunked(iterable: Iterable, chunked_num: int) -> Iterable[Any]:
+    """Break *iterable* into lists of length *n*.
+
+    From more-itertools
+    """
+    return iter(functools.partial(take, chunked_num, iter(iterable)), [])
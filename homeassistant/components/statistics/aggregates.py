@@ -0,0 +1,184 @@
+"""Incrementally updated aggregates of the samples of a statistics sensor."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import pairwise
+import math
+
+
+class SampleAggregates:
+    """Aggregates of a window of samples which are updated incrementally.
+
+    Samples are added at the end of the window and removed from its start,
+    so each change costs O(1), or O(log n) plus a memmove for the sorted
+    values, instead of recomputing the characteristics over all samples.
+
+    The mean and variance are kept with Welford's algorithm, the minimum
+    and maximum with monotonic queues and the median and percentiles from
+    a sorted list of the values. Sums over consecutive samples are kept
+    for the averages over time and the differences. Once as many samples
+    were removed as are in the window, these running sums are recomputed
+    from the samples, so rounding errors of the removals do not build up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregates of an empty window."""
+        self.count = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        # The sum of the trapezoids and the steps between consecutive samples
+        self.area_linear = 0.0
+        self.area_step = 0.0
+        self.sum_differences = 0.0
+        self.sum_differences_nonnegative = 0.0
+        self._sorted: list[float] = []
+        # (index, value, age) of the samples which can still become the
+        # maximum or minimum, the front is the oldest maximum or minimum
+        self._max: deque[tuple[int, float, datetime]] = deque()
+        self._min: deque[tuple[int, float, datetime]] = deque()
+        self._first_index = 0
+        self._next_index = 0
+        self._removed = 0
+
+    def add(
+        self,
+        value: float,
+        age: datetime,
+        previous: tuple[float, datetime] | None,
+    ) -> None:
+        """Add a sample at the end of the window.
+
+        previous is the value and age of the last sample in the window.
+        """
+        self.count += 1
+        self.sum += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        insort(self._sorted, value)
+
+        index = self._next_index
+        self._next_index += 1
+        while self._max and self._max[-1][1] < value:
+            self._max.pop()
+        self._max.append((index, value, age))
+        while self._min and self._min[-1][1] > value:
+            self._min.pop()
+        self._min.append((index, value, age))
+
+        if previous is not None:
+            self._add_pair(previous[0], previous[1], value, age, 1)
+
+    def remove(
+        self,
+        value: float,
+        age: datetime,
+        following: tuple[float, datetime] | None,
+    ) -> None:
+        """Remove the sample at the start of the window.
+
+        following is the value and age of the sample after it, if any.
+        """
+        if following is not None:
+            self._add_pair(value, age, following[0], following[1], -1)
+
+        self.count -= 1
+        self._removed += 1
+        if not self.count:
+            self.sum = self.mean = self._m2 = 0.0
+            self.area_linear = self.area_step = 0.0
+            self.sum_differences = self.sum_differences_nonnegative = 0.0
+        else:
+            self.sum -= value
+            delta = value - self.mean
+            self.mean -= delta / self.count
+            self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+        del self._sorted[bisect_left(self._sorted, value)]
+
+        if self._max[0][0] == self._first_index:
+            self._max.popleft()
+        if self._min[0][0] == self._first_index:
+            self._min.popleft()
+        self._first_index += 1
+
+    @property
+    def needs_resum(self) -> bool:
+        """Return if the running sums should be recomputed."""
+        return self._removed >= self.count > 0
+
+    def resum(self, samples: Iterable[tuple[float, datetime]]) -> None:
+        """Recompute the running sums from the samples in the window."""
+        samples = list(samples)
+        values = [value for value, _ in samples]
+        self.sum = math.fsum(values)
+        self.mean = self.sum / self.count
+        self._m2 = math.fsum((value - self.mean) ** 2 for value in values)
+        self.area_linear = self.area_step = 0.0
+        self.sum_differences = self.sum_differences_nonnegative = 0.0
+        for (value, age), (next_value, next_age) in pairwise(samples):
+            self._add_pair(value, age, next_value, next_age, 1)
+        self._removed = 0
+
+    def _add_pair(
+        self,
+        value: float,
+        age: datetime,
+        next_value: float,
+        next_age: datetime,
+        sign: int,
+    ) -> None:
+        """Add or remove the sums of two consecutive samples."""
+        seconds = (next_age - age).total_seconds()
+        self.area_linear += sign * 0.5 * (value + next_value) * seconds
+        self.area_step += sign * value * seconds
+        self.sum_differences += sign * abs(next_value - value)
+        self.sum_differences_nonnegative += sign * (
+            next_value - value if next_value >= value else next_value
+        )
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance, there must be at least two samples."""
+        return self._m2 / (self.count - 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        """Return the sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    @property
+    def max(self) -> tuple[float, datetime]:
+        """Return the maximum and the age of its oldest sample."""
+        _, value, age = self._max[0]
+        return value, age
+
+    @property
+    def min(self) -> tuple[float, datetime]:
+        """Return the minimum and the age of its oldest sample."""
+        _, value, age = self._min[0]
+        return value, age
+
+    @property
+    def median(self) -> float:
+        """Return the median, the same way as statistics.median."""
+        values = self._sorted
+        middle = self.count // 2
+        if self.count % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+    def percentile(self, percentile: int) -> float:
+        """Return a percentile, there must be at least two samples.
+
+        Uses the same exclusive method as statistics.quantiles with n=100.
+        """
+        values = self._sorted
+        count = self.count
+        scaled = percentile * (count + 1)
+        index = min(max(scaled // 100, 1), count - 1)
+        delta = scaled - index * 100
+        return (values[index - 1] * (100 - delta) + values[index] * delta) / 100
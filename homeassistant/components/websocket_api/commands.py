@@ -302,42 +302,30 @@ def handle_subscribe_entities(
         EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
     )
     connection.send_result(msg["id"])
-    data: dict[str, dict[str, dict]] = {
-        messages.ENTITY_EVENT_ADD: {
-            state.entity_id: state.as_compressed_state()
-            for state in states
-            if not entity_ids or state.entity_id in entity_ids
-        }
-    }
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
-    response = messages.event_message(msg["id"], data)
-    try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
-        connection.logger.error(
-            "Unable to serialize to JSON. Bad data found at %s",
-            format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
-            ),
-        )
-    del response
-
-    add_entities = data[messages.ENTITY_EVENT_ADD]
-    cannot_serialize: list[str] = []
-    for entity_id, state_dict in add_entities.items():
+    serialized_states: list[bytes] = []
+    for state in states:
+        if entity_ids and state.entity_id not in entity_ids:
+            continue
         try:
-            JSON_DUMP(state_dict)
+            serialized_states.append(state.as_compressed_state_json())
         except (ValueError, TypeError):
-            cannot_serialize.append(entity_id)
-
-    for entity_id in cannot_serialize:
-        del add_entities[entity_id]
+            connection.logger.error(
+                "Unable to serialize to JSON. Bad data found at %s",
+                format_unserializable_data(
+                    find_paths_unserializable_data(
+                        {state.entity_id: state.as_compressed_state()},
+                        dump=JSON_DUMP,
+                    )
+                ),
+            )
 
-    connection.send_message(JSON_DUMP(messages.event_message(msg["id"], data)))
+    connection.send_message(
+        messages.entities_added_message_json(msg["id"], serialized_states)
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
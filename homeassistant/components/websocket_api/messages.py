@@ -1,6 +1,7 @@
 """Message templates for websocket commands."""
 from __future__ import annotations
 
+from contextlib import suppress
 from functools import lru_cache
 import logging
 from typing import Any, Final
@@ -16,7 +17,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.json import JSON_DUMP, json_bytes
 from homeassistant.util.json import (
     find_paths_unserializable_data,
     format_unserializable_data,
@@ -46,6 +47,11 @@ ENTITY_EVENT_ADD = "a"
 ENTITY_EVENT_REMOVE = "r"
 ENTITY_EVENT_CHANGE = "c"
 
+# Number of serialized events kept for connections that are subscribed to
+# the same events. This must hold a burst of state changes so each event is
+# only serialized once, no matter how many connections are subscribed.
+EVENT_MESSAGE_CACHE_SIZE = 2048
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
@@ -79,7 +85,7 @@ def cached_event_message(iden: int, event: Event) -> str:
     return _cached_event_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
 
 
-@lru_cache(maxsize=128)
+@lru_cache(maxsize=EVENT_MESSAGE_CACHE_SIZE)
 def _cached_event_message(event: Event) -> str:
     """Cache and serialize the event to json.
 
@@ -101,16 +107,45 @@ def cached_state_diff_message(iden: int, event: Event) -> str:
     return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
 
 
-@lru_cache(maxsize=128)
+@lru_cache(maxsize=EVENT_MESSAGE_CACHE_SIZE)
 def _cached_state_diff_message(event: Event) -> str:
     """Cache and serialize the event to json.
 
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
+    if (
+        event.data["old_state"] is None
+        and (event_new_state := event.data["new_state"]) is not None
+    ):
+        # Additions reuse the JSON fragment cached on the state
+        with suppress(ValueError, TypeError):
+            return entities_added_message_json(
+                IDEN_TEMPLATE, [event_new_state.as_compressed_state_json()]
+            )
     return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
 
 
+def entities_added_message_json(
+    iden: JSON_TYPE | int, compressed_states_json: list[bytes]
+) -> str:
+    """Return an event message adding entities as json.
+
+    compressed_states_json are JSON fragments from
+    State.as_compressed_state_json which are joined
+    without serializing the states again.
+    """
+    return b"".join(
+        (
+            b'{"id":',
+            json_bytes(iden),
+            b',"type":"event","event":{"' + ENTITY_EVENT_ADD.encode() + b'":{',
+            b",".join(compressed_states_json),
+            b"}}}",
+        )
+    ).decode("utf-8")
+
+
 def _state_diff_event(event: Event) -> dict:
     """Convert a state_changed event to the minimal version.
 
@@ -76,6 +76,7 @@ from .exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from .helpers.json import json_bytes
 from .util import dt as dt_util, location, ulid as ulid_util
 from .util.async_ import (
     fire_coroutine_threadsafe,
@@ -850,6 +851,10 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # event_type -> event data key -> event data value -> listeners
+        self._keyed_listeners: dict[
+            str, dict[str, dict[Any, list[_FilterableJob]]]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -858,7 +863,13 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, keyed_index in self._keyed_listeners.items():
+            if count := sum(
+                len(jobs) for index in keyed_index.values() for jobs in index.values()
+            ):
+                listeners[event_type] = listeners.get(event_type, 0) + count
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -895,12 +906,15 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        keyed_index = self._keyed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        match_all_listeners = (
+            self._listeners.get(MATCH_ALL)
+            if event_type != EVENT_HOMEASSISTANT_CLOSE
+            else None
+        )
 
         event = Event(event_type, event_data, origin, time_fired, context)
         if not event.context.origin_event:
@@ -908,9 +922,31 @@ class EventBus:
 
         _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        if match_all_listeners:
+            self._async_run_listeners(event, match_all_listeners)
+        if listeners:
+            self._async_run_listeners(event, listeners)
+        if keyed_index is None or not event_data:
             return
+        # Iterate over a snapshot since listeners which run immediately
+        # may add or remove keyed listeners of other data keys
+        for data_key, index in tuple(keyed_index.items()):
+            try:
+                keyed_listeners = index.get(event_data.get(data_key))
+            except TypeError:
+                # Unhashable values can never match a key
+                continue
+            if keyed_listeners:
+                self._async_run_listeners(event, keyed_listeners)
+
+    @callback
+    def _async_run_listeners(
+        self, event: Event, listeners: list[_FilterableJob]
+    ) -> None:
+        """Run the listeners for an event.
 
+        This method must be run in the event loop.
+        """
         for job, event_filter, run_immediately in listeners:
             if event_filter is not None:
                 try:
@@ -954,6 +990,7 @@ class EventBus:
         listener: Callable[[Event], Coroutine[Any, Any, None] | None],
         event_filter: Callable[[Event], bool] | None = None,
         run_immediately: bool = False,
+        match_key: tuple[str, Any] | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -968,21 +1005,58 @@ class EventBus:
         right away instead of using call_soon. Only use this if
         the callback results in scheduling another task.
 
+        An optional match_key, a tuple of an event data key and a value,
+        limits the listener to events where event.data[key] == value.
+        These listeners are stored in an index so firing an event only
+        touches the listeners that match, which is much cheaper than an
+        event_filter when there are many listeners for the same event_type.
+
         This method must be run in the event loop.
         """
         if event_filter is not None and not is_callback(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
         if run_immediately and not is_callback(listener):
             raise HomeAssistantError(f"Event listener {listener} is not a callback")
-        return self._async_listen_filterable_job(
-            event_type, _FilterableJob(HassJob(listener), event_filter, run_immediately)
+        filterable_job = _FilterableJob(
+            HassJob(listener), event_filter, run_immediately
         )
+        if match_key is not None:
+            if event_type == MATCH_ALL:
+                raise HomeAssistantError(
+                    "match_key can not be used when listening to all events"
+                )
+            return self._async_listen_keyed_job(event_type, match_key, filterable_job)
+        return self._async_listen_filterable_job(event_type, filterable_job)
+
+    @callback
+    def _async_listen_keyed_job(
+        self,
+        event_type: str,
+        match_key: tuple[str, Any],
+        filterable_job: _FilterableJob,
+    ) -> CALLBACK_TYPE:
+        data_key, value = match_key
+        index = self._keyed_listeners.setdefault(event_type, {}).setdefault(
+            data_key, {}
+        )
+        # Copy on write so firing can iterate the list without copying it
+        index[value] = [*index.get(value, ()), filterable_job]
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_keyed_listener(event_type, match_key, filterable_job)
+
+        return remove_listener
 
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(filterable_job)
+        # Copy on write so firing can iterate the list without copying it
+        self._listeners[event_type] = [
+            *self._listeners.get(event_type, ()),
+            filterable_job,
+        ]
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -1062,10 +1136,14 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(filterable_job)
+            # Copy on write since async_fire may be iterating the list
+            listeners = self._listeners[event_type][:]
+            listeners.remove(filterable_job)
 
             # delete event_type list if empty
-            if not self._listeners[event_type]:
+            if listeners:
+                self._listeners[event_type] = listeners
+            else:
                 self._listeners.pop(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
@@ -1074,6 +1152,42 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: str,
+        match_key: tuple[str, Any],
+        filterable_job: _FilterableJob,
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        data_key, value = match_key
+        try:
+            index = self._keyed_listeners[event_type][data_key]
+            # Copy on write since async_fire may be iterating the list
+            listeners = index[value][:]
+            listeners.remove(filterable_job)
+        except (KeyError, ValueError):
+            # KeyError is key event_type, data key or value did not exist
+            # ValueError if listener did not exist within the value
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
+            return
+
+        # delete value list and the emptied levels of the index
+        if listeners:
+            index[value] = listeners
+            return
+        del index[value]
+        if not index:
+            keyed_index = self._keyed_listeners[event_type]
+            del keyed_index[data_key]
+            if not keyed_index:
+                del self._keyed_listeners[event_type]
+
 
 _StateT = TypeVar("_StateT", bound="State")
 
@@ -1102,6 +1216,7 @@ class State:
         "object_id",
         "_as_dict",
         "_as_compressed_state",
+        "_as_compressed_state_json",
     ]
 
     def __init__(
@@ -1131,13 +1246,20 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        # A ReadOnlyDict can not change so it is shared instead of copied,
+        # this lets listeners recognize unchanged attributes by identity
+        self.attributes = (
+            attributes
+            if isinstance(attributes, ReadOnlyDict)
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
         self._as_compressed_state: dict[str, Any] | None = None
+        self._as_compressed_state_json: bytes | None = None
 
     @property
     def name(self) -> str:
@@ -1199,6 +1321,20 @@ class State:
         self._as_compressed_state = compressed_state
         return compressed_state
 
+    def as_compressed_state_json(self) -> bytes:
+        """Build a JSON fragment of the compressed state for adds.
+
+        The fragment is the "entity_id": compressed_state member of an
+        object so the fragments of many states can be joined with commas.
+
+        Raises TypeError or ValueError if the state cannot be serialized.
+        """
+        if self._as_compressed_state_json is None:
+            self._as_compressed_state_json = json_bytes(
+                {self.entity_id: self.as_compressed_state()}
+            )[1:-1]
+        return self._as_compressed_state_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1471,6 +1607,11 @@ class StateMachine:
         if same_state and same_attr:
             return
 
+        if same_attr:
+            if TYPE_CHECKING:
+                assert old_state is not None
+            attributes = old_state.attributes
+
         now = dt_util.utcnow()
 
         if context is None:
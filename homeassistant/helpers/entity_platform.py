@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 import asyncio
+from bisect import bisect_left
 from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from contextlib import suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger, getLogger
+import math
 from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import urlparse
 
@@ -56,8 +59,20 @@ SLOW_ADD_MIN_TIMEOUT = 500
 
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
+DATA_DOMAIN_ENTITIES = "domain_entities"
+DATA_POLLING_EXECUTOR_SEMAPHORE = "entity_platform_polling_executor"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+# Maximum number of polled entities of all platforms updating in the
+# executor at the same time, on top of one entity per platform
+MAX_PARALLEL_POLLING_EXECUTOR_JOBS = 16
+# Maximum number of the shared executor jobs used by a single platform
+MAX_PLATFORM_POLLING_EXECUTOR_JOBS = 4
+# Fraction of the polling interval the workers of a platform are started over
+POLLING_WORKERS_SPREAD = 0.5
+# Upper bounds in seconds of the buckets of the polling duration histograms
+POLLING_DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, math.inf)
+
 _LOGGER = getLogger(__name__)
 
 
@@ -124,6 +139,10 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry: config_entries.ConfigEntry | None = None
         self.entities: dict[str, Entity] = {}
+        # The entities of all platforms of the domain, maps entity_id -> entity
+        self.domain_entities: dict[str, Entity] = hass.data.setdefault(
+            DATA_DOMAIN_ENTITIES, {}
+        ).setdefault(domain, {})
         self._tasks: list[asyncio.Task[None]] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
@@ -134,6 +153,14 @@ class EntityPlatform:
         self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
+        self._parallel_updates_limit: int | None = None
+        # Polling is scheduled with a multiple of the scan interval
+        # while the updates take longer than the scan interval
+        self._polling_interval = scan_interval
+        # Maps the upper bound in seconds of each bucket -> number of polls
+        self.polling_duration_histogram: dict[float, int] = dict.fromkeys(
+            POLLING_DURATION_BUCKETS, 0
+        )
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
@@ -184,6 +211,7 @@ class EntityPlatform:
 
         if parallel_updates is not None:
             self.parallel_updates = asyncio.Semaphore(parallel_updates)
+            self._parallel_updates_limit = parallel_updates
 
         return self.parallel_updates
 
@@ -462,6 +490,7 @@ class EntityPlatform:
         ):
             return
 
+        self._polling_interval = self.scan_interval
         self._async_unsub_polling = async_track_time_interval(
             self.hass,
             self._update_entity_states,
@@ -699,6 +728,7 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
+        self.domain_entities[entity_id] = entity
 
         if not restored:
             # Reserve the state in the state machine
@@ -711,6 +741,7 @@ class EntityPlatform:
         def remove_entity_cb() -> None:
             """Remove entity from entities dict."""
             self.entities.pop(entity_id)
+            self.domain_entities.pop(entity_id)
 
         entity.async_on_remove(remove_entity_cb)
 
@@ -828,15 +859,115 @@ class EntityPlatform:
             return
 
         async with self._process_updates:
+            start = self.hass.loop.time()
             tasks: list[Coroutine[Any, Any, None]] = []
+            sync_entities: list[Entity] = []
             for entity in self.entities.values():
                 if not entity.should_poll:
                     continue
+                if not hasattr(entity, "async_update") and hasattr(entity, "update"):
+                    sync_entities.append(entity)
+                    continue
                 tasks.append(entity.async_update_ha_state(True))
 
+            if sync_entities:
+                tasks.append(self._async_update_sync_entities(sync_entities))
+
             if tasks:
                 await asyncio.gather(*tasks)
 
+            self._async_polling_done(self.hass.loop.time() - start)
+
+    async def _async_update_sync_entities(self, entities: list[Entity]) -> None:
+        """Update the polled entities which update in the executor.
+
+        The entities are updated by as many workers as parallel updates are
+        allowed. This staggers the updates of a polling tick instead of
+        queuing all of them in the executor at once. The first worker of
+        each platform always runs, so slow or hung updates of other platforms
+        cannot starve it. The other workers take a slot of the executor jobs
+        shared by all platforms, and a platform only uses a few of them.
+        The workers are started one after another over a part of the polling
+        interval, unless the first worker has updated all entities before.
+        """
+        semaphore = _async_get_polling_executor_semaphore(self.hass)
+        pending = iter(entities)
+        all_updated = asyncio.Event()
+
+        async def _async_worker() -> None:
+            """Update entities until all are updated."""
+            try:
+                for entity in pending:
+                    await entity.async_update_ha_state(True)
+            finally:
+                all_updated.set()
+
+        async def _async_shared_worker(delay: float) -> None:
+            """Update entities in a shared slot until all are updated."""
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(all_updated.wait(), delay)
+            for entity in pending:
+                async with semaphore:
+                    await entity.async_update_ha_state(True)
+
+        workers = min(len(entities), 1 + MAX_PLATFORM_POLLING_EXECUTOR_JOBS)
+        if self._parallel_updates_limit is not None:
+            workers = min(workers, self._parallel_updates_limit)
+        spread = self._polling_interval.total_seconds() * POLLING_WORKERS_SPREAD
+        await asyncio.gather(
+            _async_worker(),
+            *(
+                _async_shared_worker(spread * worker / workers)
+                for worker in range(1, workers)
+            ),
+        )
+
+    @callback
+    def _async_polling_done(self, duration: float) -> None:
+        """Record the duration of a poll and adapt the polling interval.
+
+        While polling takes longer than the scan interval, the interval is
+        stretched to the next multiple of the scan interval instead of
+        skipping the ticks which overlap the updates.
+        """
+        bucket = POLLING_DURATION_BUCKETS[
+            bisect_left(POLLING_DURATION_BUCKETS, duration)
+        ]
+        self.polling_duration_histogram[bucket] += 1
+
+        if self._async_unsub_polling is None:
+            return
+
+        scan_interval = self.scan_interval.total_seconds()
+        interval = self.scan_interval
+        if scan_interval and duration > scan_interval:
+            interval = math.ceil(duration / scan_interval) * self.scan_interval
+        if interval == self._polling_interval:
+            return
+
+        self.logger.debug(
+            "Polling %s %s took %.3f seconds, polling every %s",
+            self.platform_name,
+            self.domain,
+            duration,
+            interval,
+        )
+        self._async_unsub_polling()
+        self._polling_interval = interval
+        self._async_unsub_polling = async_track_time_interval(
+            self.hass, self._update_entity_states, interval
+        )
+
+
+@callback
+def _async_get_polling_executor_semaphore(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore limiting the polled updates in the executor."""
+    if (semaphore := hass.data.get(DATA_POLLING_EXECUTOR_SEMAPHORE)) is None:
+        semaphore = hass.data[DATA_POLLING_EXECUTOR_SEMAPHORE] = asyncio.Semaphore(
+            MAX_PARALLEL_POLLING_EXECUTOR_JOBS
+        )
+    return semaphore
+
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
     "current_platform", default=None
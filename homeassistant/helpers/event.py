@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
 import logging
+import math
 from random import randint
 import time
 from typing import Any, Concatenate, ParamSpec, cast
@@ -54,6 +55,12 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TEMPLATE_RENDER_SCHEDULER = "track_template_render_scheduler"
+
+TIMER_WHEEL = "timer_wheel"
+# Number of one second slots in the timer wheel
+TIMER_WHEEL_SLOTS = 3600
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -94,6 +101,35 @@ class TrackTemplate:
     rate_limit: timedelta | None = None
 
 
+@dataclass
+class TemplateRenderStats:
+    """Class for keeping track of the render time of a template.
+
+    renders: Number of times the template was rendered
+    total_time: Total time spent rendering in seconds
+    max_time: Longest render in seconds
+    last_time: Duration of the last render in seconds
+    """
+
+    renders: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        """Return the average render time in seconds."""
+        return self.total_time / self.renders if self.renders else 0.0
+
+    def add_render(self, duration: float) -> None:
+        """Record a render."""
+        self.renders += 1
+        self.total_time += duration
+        self.last_time = duration
+        if duration > self.max_time:
+            self.max_time = duration
+
+
 @dataclass
 class TrackTemplateResult:
     """Class for result of template tracking.
@@ -809,6 +845,132 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRenderScheduler:
+    """Schedule template re-renders from a shared index of state dependencies.
+
+    Every TrackTemplateResultInfo registers the entities and domains its
+    templates depend on in a reverse index. A single state_changed listener
+    looks up the affected trackers and queues the event for them, and all
+    queued re-renders are run in one batch on the next loop iteration.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._registered: dict[TrackTemplateResultInfo, TrackStates] = {}
+        self._all: dict[TrackTemplateResultInfo, None] = {}
+        self._entities: dict[str, dict[TrackTemplateResultInfo, None]] = {}
+        self._domains: dict[str, dict[TrackTemplateResultInfo, None]] = {}
+        self._pending: dict[TrackTemplateResultInfo, list[Event]] = {}
+        self._drain_scheduled = False
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_update(
+        self, tracker: TrackTemplateResultInfo, track_states: TrackStates | None
+    ) -> None:
+        """Replace the state dependencies of a tracker.
+
+        Passing None removes the tracker from the index.
+        """
+        if (last_track_states := self._registered.pop(tracker, None)) is not None:
+            if last_track_states.all_states:
+                del self._all[tracker]
+            else:
+                _remove_from_index(self._entities, last_track_states.entities, tracker)
+                _remove_from_index(self._domains, last_track_states.domains, tracker)
+
+        if track_states is not None and (
+            track_states.all_states or track_states.entities or track_states.domains
+        ):
+            self._registered[tracker] = track_states
+            if track_states.all_states:
+                self._all[tracker] = None
+            else:
+                for entity_id in track_states.entities:
+                    self._entities.setdefault(entity_id, {})[tracker] = None
+                for domain in track_states.domains:
+                    self._domains.setdefault(domain, {})[tracker] = None
+        else:
+            self._pending.pop(tracker, None)
+
+        if self._registered and self._remove_listener is None:
+            self._remove_listener = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+            )
+        elif not self._registered and self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue the event for the trackers that depend on the entity."""
+        entity_id: str = event.data["entity_id"]
+        trackers = self._all
+        if (entity_trackers := self._entities.get(entity_id)) is not None:
+            trackers = trackers | entity_trackers
+        if (
+            self._domains
+            and (domain_trackers := self._domains.get(split_entity_id(entity_id)[0]))
+            is not None
+        ):
+            trackers = trackers | domain_trackers
+        if not trackers:
+            return
+
+        pending = self._pending
+        for tracker in trackers:
+            if (events := pending.get(tracker)) is None:
+                pending[tracker] = [event]
+            else:
+                events.append(event)
+
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.hass.loop.call_soon(self._async_render_pending)
+
+    @callback
+    def _async_render_pending(self) -> None:
+        """Re-render all trackers with queued events."""
+        self._drain_scheduled = False
+        pending = self._pending
+        self._pending = {}
+        for tracker, events in pending.items():
+            for event in events:
+                # The tracker may have been removed by an earlier re-render
+                if tracker not in self._registered:
+                    break
+                try:
+                    tracker._refresh(event)  # pylint: disable=protected-access
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while re-rendering templates for %s", event
+                    )
+
+
+def _remove_from_index(
+    index: dict[str, dict[TrackTemplateResultInfo, None]],
+    keys: Iterable[str],
+    tracker: TrackTemplateResultInfo,
+) -> None:
+    """Remove a tracker from the index entries of the keys."""
+    for key in keys:
+        trackers = index[key]
+        del trackers[tracker]
+        if not trackers:
+            del index[key]
+
+
+@callback
+def _async_template_render_scheduler(hass: HomeAssistant) -> _TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    if (scheduler := hass.data.get(TRACK_TEMPLATE_RENDER_SCHEDULER)) is None:
+        scheduler = hass.data[
+            TRACK_TEMPLATE_RENDER_SCHEDULER
+        ] = _TemplateRenderScheduler(hass)
+    return cast(_TemplateRenderScheduler, scheduler)
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -832,7 +994,8 @@ class TrackTemplateResultInfo:
 
         self._rate_limit = KeyedRateLimit(hass)
         self._info: dict[Template, RenderInfo] = {}
-        self._track_state_changes: _TrackStateChangeFiltered | None = None
+        self._render_stats: dict[Template, TemplateRenderStats] = {}
+        self._track_states: TrackStates | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
 
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
@@ -844,8 +1007,8 @@ class TrackTemplateResultInfo:
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._async_render_to_info(
+                template, variables, strict
             )
 
             # If the super template did not render to True, don't update other templates
@@ -865,8 +1028,8 @@ class TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._async_render_to_info(
+                template, variables, strict
             )
 
             if info.exception:
@@ -878,8 +1041,8 @@ class TrackTemplateResultInfo:
                     exc_info=info.exception,
                 )
 
-        self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+        self._async_update_track_states(
+            _render_infos_to_track_states(self._info.values())
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -895,12 +1058,37 @@ class TrackTemplateResultInfo:
     @property
     def listeners(self) -> dict[str, bool | set[str]]:
         """State changes that will cause a re-render."""
-        assert self._track_state_changes
+        track_states = self._track_states
+        assert track_states
         return {
-            **self._track_state_changes.listeners,
+            _ALL_LISTENER: track_states.all_states,
+            _ENTITIES_LISTENER: track_states.entities,
+            _DOMAINS_LISTENER: track_states.domains,
             "time": bool(self._time_listeners),
         }
 
+    @property
+    def render_stats(self) -> dict[Template, TemplateRenderStats]:
+        """Render time statistics of each template."""
+        return self._render_stats
+
+    @callback
+    def _async_update_track_states(self, track_states: TrackStates) -> None:
+        """Register the state changes that will cause a re-render."""
+        self._track_states = track_states
+        _async_template_render_scheduler(self.hass).async_update(self, track_states)
+
+    def _async_render_to_info(
+        self, template: Template, variables: TemplateVarsType, strict: bool = False
+    ) -> RenderInfo:
+        """Render a template and record how long it took."""
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables, strict=strict)
+        if (stats := self._render_stats.get(template)) is None:
+            stats = self._render_stats[template] = TemplateRenderStats()
+        stats.add_render(time.perf_counter() - start)
+        return info
+
     @callback
     def _setup_time_listener(self, template: Template, has_time: bool) -> None:
         if not has_time:
@@ -934,8 +1122,8 @@ class TrackTemplateResultInfo:
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
-        assert self._track_state_changes
-        self._track_state_changes.async_remove()
+        assert self._track_states
+        _async_template_render_scheduler(self.hass).async_update(self, None)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -989,8 +1177,8 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._async_render_to_info(
+            template, track_template_.variables
         )
 
         try:
@@ -1096,8 +1284,8 @@ class TrackTemplateResultInfo:
                 info_changed |= _apply_update(update, track_template_.template)
 
         if info_changed:
-            assert self._track_state_changes
-            self._track_state_changes.async_update_listeners(
+            assert self._track_states
+            self._async_update_track_states(
                 _render_infos_to_track_states(
                     [
                         _suppress_domain_all_in_render_info(info)
@@ -1290,6 +1478,178 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _TimerWheelEntry:
+    """A job scheduled in the timer wheel."""
+
+    __slots__ = ("tick", "job", "arg", "coalesce")
+
+    def __init__(
+        self,
+        tick: int,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+        arg: datetime | None,
+        coalesce: bool,
+    ) -> None:
+        """Initialize the entry."""
+        self.tick = tick
+        self.job = job
+        self.arg = arg
+        self.coalesce = coalesce
+
+
+class _TimerWheel:
+    """Hashed timer wheel with a resolution of one second.
+
+    Timers are stored in one of TIMER_WHEEL_SLOTS slots by the second they
+    are due in, so scheduling and cancelling a timer is O(1). Only a single
+    TimerHandle is kept in the event loop, armed for the next second which
+    has a timer due, and all timers due in that second are run together.
+
+    Timers run in the first second after they are due, so they can
+    be up to one second late but never fire early.
+    """
+
+    def __init__(self, hass: HomeAssistant, slots: int = TIMER_WHEEL_SLOTS) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self._slots: list[dict[_TimerWheelEntry, None]] = [{} for _ in range(slots)]
+        self._count = 0
+        # Lower bound of the tick of all entries in the wheel
+        self._min_tick: int | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_tick: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of scheduled timers."""
+        return self._count
+
+    @callback
+    def async_schedule(
+        self,
+        timestamp: float,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+        arg: datetime | None = None,
+        coalesce: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Run a job once the timestamp has passed.
+
+        The job is called with arg, or with the time it runs if arg is None.
+
+        If coalesce is True, the job runs only once when it was scheduled
+        more than once with coalesce for the same second.
+        """
+        tick = math.ceil(timestamp)
+        entry = _TimerWheelEntry(tick, job, arg, coalesce)
+        slot = self._slots[tick % len(self._slots)]
+        slot[entry] = None
+        self._count += 1
+        if self._min_tick is None or tick < self._min_tick:
+            self._min_tick = tick
+        if self._handle_tick is None or tick < self._handle_tick:
+            self._async_arm(tick)
+
+        @callback
+        def cancel_timer() -> None:
+            """Remove the timer from the wheel."""
+            if slot.pop(entry, False) is None:
+                self._count -= 1
+                if not self._count:
+                    self._async_disarm()
+
+        return cancel_timer
+
+    @callback
+    def _async_arm(self, tick: int) -> None:
+        """Arm the loop timer for a tick."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_tick = tick
+        self._handle = self.hass.loop.call_later(
+            tick - time.time(), self._async_run_due
+        )
+
+    @callback
+    def _async_disarm(self) -> None:
+        """Cancel the loop timer."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._handle_tick = None
+        self._min_tick = None
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run all timers that are due and arm the timer for the next ones."""
+        self._handle = None
+        self._handle_tick = None
+        now_tick = math.floor(time_tracker_timestamp())
+        due = self._async_pop_due(now_tick)
+        if self._count:
+            self._async_arm(self._async_next_tick(now_tick))
+        else:
+            self._min_tick = None
+        if not due:
+            return
+
+        utc_now = time_tracker_utcnow()
+        # A plain callable gets a new HassJob each time it is scheduled,
+        # so the jobs are coalesced on their target
+        coalesced: set[tuple[Callable[..., Any], int]] = set()
+        for entry in due:
+            if entry.coalesce:
+                if (key := (entry.job.target, entry.tick)) in coalesced:
+                    continue
+                coalesced.add(key)
+            try:
+                self.hass.async_run_hass_job(
+                    entry.job, utc_now if entry.arg is None else entry.arg
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer %s", entry.job)
+
+    @callback
+    def _async_pop_due(self, now_tick: int) -> list[_TimerWheelEntry]:
+        """Remove and return the entries due at or before now_tick."""
+        if self._min_tick is None or self._min_tick > now_tick:
+            return []
+        slots = self._slots
+        num_slots = len(slots)
+        due: list[_TimerWheelEntry] = []
+        for tick in range(max(self._min_tick, now_tick - num_slots + 1), now_tick + 1):
+            slot = slots[tick % num_slots]
+            if not slot:
+                continue
+            for entry in [entry for entry in slot if entry.tick <= now_tick]:
+                del slot[entry]
+                due.append(entry)
+        self._count -= len(due)
+        self._min_tick = now_tick + 1
+        due.sort(key=lambda entry: entry.tick)
+        return due
+
+    @callback
+    def _async_next_tick(self, now_tick: int) -> int:
+        """Return the next tick with an entry due."""
+        slots = self._slots
+        num_slots = len(slots)
+        for tick in range(now_tick + 1, now_tick + num_slots + 1):
+            slot = slots[tick % num_slots]
+            if slot and any(entry.tick <= tick for entry in slot):
+                self._min_tick = tick
+                return tick
+        # All entries are more than one round away
+        self._min_tick = tick = min(entry.tick for slot in slots for entry in slot)
+        return tick
+
+
+@callback
+def _async_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel."""
+    if (wheel := hass.data.get(TIMER_WHEEL)) is None:
+        wheel = hass.data[TIMER_WHEEL] = _TimerWheel(hass)
+    return cast(_TimerWheel, wheel)
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -1297,12 +1657,24 @@ def async_track_point_in_utc_time(
     action: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     | Callable[[datetime], Coroutine[Any, Any, None] | None],
     point_in_time: datetime,
+    coarse: bool = False,
 ) -> CALLBACK_TYPE:
-    """Add a listener that fires once after a specific point in UTC time."""
+    """Add a listener that fires once after a specific point in UTC time.
+
+    If coarse is True, the listener is scheduled in the timer wheel
+    and can fire up to one second late.
+    """
     # Ensure point_in_time is UTC
     utc_point_in_time = dt_util.as_utc(point_in_time)
     expected_fire_timestamp = dt_util.utc_to_timestamp(utc_point_in_time)
 
+    if coarse:
+        return _async_timer_wheel(hass).async_schedule(
+            expected_fire_timestamp,
+            action if isinstance(action, HassJob) else HassJob(action),
+            utc_point_in_time,
+        )
+
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
     cancel_callback: asyncio.TimerHandle | None = None
@@ -1347,11 +1719,25 @@ def async_call_later(
     delay: float | timedelta,
     action: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     | Callable[[datetime], Coroutine[Any, Any, None] | None],
+    coarse: bool = False,
+    coalesce: bool = False,
 ) -> CALLBACK_TYPE:
-    """Add a listener that is called in <delay>."""
+    """Add a listener that is called in <delay>.
+
+    If coarse is True, the listener is scheduled in the timer wheel and
+    can be called up to one second late. If coalesce is also True, a job
+    scheduled more than once for the same second is only called once.
+    """
     if isinstance(delay, timedelta):
         delay = delay.total_seconds()
 
+    if coarse:
+        return _async_timer_wheel(hass).async_schedule(
+            time.time() + delay,
+            action if isinstance(action, HassJob) else HassJob(action),
+            coalesce=coalesce,
+        )
+
     @callback
     def run_action(job: HassJob[[datetime], Coroutine[Any, Any, None] | None]) -> None:
         """Call the action."""
@@ -1378,8 +1764,13 @@ def async_track_time_interval(
     hass: HomeAssistant,
     action: Callable[[datetime], Coroutine[Any, Any, None] | None],
     interval: timedelta,
+    coarse: bool = False,
 ) -> CALLBACK_TYPE:
-    """Add a listener that fires repetitively at every timedelta interval."""
+    """Add a listener that fires repetitively at every timedelta interval.
+
+    If coarse is True, the listener is scheduled in the timer wheel
+    and can fire up to one second late.
+    """
     remove: CALLBACK_TYPE
     interval_listener_job: HassJob[[datetime], None]
 
@@ -1396,12 +1787,14 @@ def async_track_time_interval(
         nonlocal interval_listener_job
 
         remove = async_track_point_in_utc_time(
-            hass, interval_listener_job, next_interval()
+            hass, interval_listener_job, next_interval(), coarse
         )
         hass.async_run_hass_job(job, now)
 
     interval_listener_job = HassJob(interval_listener)
-    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
+    remove = async_track_point_in_utc_time(
+        hass, interval_listener_job, next_interval(), coarse
+    )
 
     def remove_listener() -> None:
         """Remove interval listener."""
@@ -24,11 +24,20 @@ DATA_RESTORE_STATE_TASK = "restore_state_task"
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "core.restore_state"
+STORAGE_KEY_CHANGES = "core.restore_state_changes"
 STORAGE_VERSION = 1
 
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
 
+# How long between saving all states to disk, in between only the states
+# which changed since are saved. This also refreshes the last seen time of
+# the states which did not change, so it must be well below the expiration.
+STATE_COMPACTION_INTERVAL = timedelta(days=1)
+
+# Share of the states which may change before all states are saved again
+STATE_COMPACTION_RATIO = 0.25
+
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
@@ -105,11 +114,15 @@ class RestoreStateData:
         """Get the singleton instance of this data helper."""
         data = RestoreStateData(hass)
 
+        # The last full dump and the changes saved since are two files,
+        # read concurrently so the startup waits for a single round of reads
         try:
-            stored_states = await data.store.async_load()
+            stored_states, stored_changes = await asyncio.gather(
+                data.store.async_load(), data.changes_store.async_load()
+            )
         except HomeAssistantError as exc:
             _LOGGER.error("Error loading last states", exc_info=exc)
-            stored_states = None
+            stored_states = stored_changes = None
 
         if stored_states is None:
             _LOGGER.debug("Not creating cache - no saved states found")
@@ -120,6 +133,8 @@ class RestoreStateData:
                 for item in stored_states
                 if valid_entity_id(item["state"]["entity_id"])
             }
+            if stored_changes is not None:
+                _async_apply_stored_changes(data.last_states, stored_changes)
             _LOGGER.debug("Created cache with %s", list(data.last_states))
 
         async def hass_start(hass: HomeAssistant) -> None:
@@ -142,8 +157,17 @@ class RestoreStateData:
         self.store = Store[list[dict[str, Any]]](
             hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
         )
+        self.changes_store = Store[dict[str, Any]](
+            hass, STORAGE_VERSION, STORAGE_KEY_CHANGES, encoder=JSONEncoder
+        )
         self.last_states: dict[str, StoredState] = {}
         self.entities: dict[str, RestoreEntity] = {}
+        self._last_full_dump: datetime | None = None
+        # The state and extra data of each dumped state, to find the changes
+        self._dumped_states: dict[str, tuple[State, dict[str, Any] | None]] = {}
+        # The states changed and removed since the last full dump
+        self._changed_states: dict[str, dict[str, Any]] = {}
+        self._removed_states: dict[str, str] = {}
 
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
@@ -190,17 +214,70 @@ class RestoreStateData:
         return stored_states
 
     async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
-        _LOGGER.debug("Dumping states")
-        try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+        """Save the current state machine to storage.
+
+        Only the states which changed since the last full dump are saved,
+        until enough of them changed or the full dump is too old.
+        """
+        now = dt_util.utcnow()
+        stored_states = self.async_get_stored_states()
+        dumped_states: dict[str, tuple[State, dict[str, Any] | None]] = {}
+        changed_states = self._changed_states.copy()
+        removed_states = self._removed_states.copy()
+
+        for stored_state in stored_states:
+            entity_id = stored_state.state.entity_id
+            extra_data = (
+                stored_state.extra_data.as_dict() if stored_state.extra_data else None
             )
-        except HomeAssistantError as exc:
-            _LOGGER.error("Error saving current states", exc_info=exc)
+            dumped_states[entity_id] = (stored_state.state, extra_data)
+            if (dumped := self._dumped_states.get(entity_id)) is not None and (
+                dumped[0] is stored_state.state and dumped[1] == extra_data
+            ):
+                continue
+            changed_states[entity_id] = stored_state.as_dict()
+            removed_states.pop(entity_id, None)
+
+        for entity_id in self._dumped_states.keys() - dumped_states.keys():
+            changed_states.pop(entity_id, None)
+            removed_states[entity_id] = now.isoformat()
+
+        if (
+            self._last_full_dump is None
+            or now - self._last_full_dump >= STATE_COMPACTION_INTERVAL
+            or len(changed_states) + len(removed_states)
+            > len(stored_states) * STATE_COMPACTION_RATIO
+        ):
+            _LOGGER.debug("Dumping states")
+            try:
+                await self.store.async_save(
+                    [stored_state.as_dict() for stored_state in stored_states]
+                )
+                await self.changes_store.async_save({"states": [], "removed": {}})
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving current states", exc_info=exc)
+                return
+            self._last_full_dump = now
+            changed_states = {}
+            removed_states = {}
+        else:
+            _LOGGER.debug(
+                "Dumping %s changed states", len(changed_states) + len(removed_states)
+            )
+            try:
+                await self.changes_store.async_save(
+                    {
+                        "states": list(changed_states.values()),
+                        "removed": removed_states,
+                    }
+                )
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving current states", exc_info=exc)
+                return
+
+        self._dumped_states = dumped_states
+        self._changed_states = changed_states
+        self._removed_states = removed_states
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -254,6 +331,31 @@ class RestoreStateData:
         self.entities.pop(entity_id)
 
 
+@callback
+def _async_apply_stored_changes(
+    last_states: dict[str, StoredState], stored_changes: dict[str, Any]
+) -> None:
+    """Apply the changes saved since the last full dump to the last states.
+
+    A change only applies if it is newer than the state of the full dump, in
+    case the full dump was saved but the changes were not cleared.
+    """
+    for item in stored_changes["states"]:
+        if not valid_entity_id(entity_id := item["state"]["entity_id"]):
+            continue
+        stored_state = StoredState.from_dict(item)
+        if (
+            last_state := last_states.get(entity_id)
+        ) is None or last_state.last_seen < stored_state.last_seen:
+            last_states[entity_id] = stored_state
+
+    for entity_id, removed in stored_changes["removed"].items():
+        if (last_state := last_states.get(entity_id)) is not None and (
+            last_state.last_seen < datetime.fromisoformat(removed)
+        ):
+            del last_states[entity_id]
+
+
 def _encode(value: Any) -> Any:
     """Little helper to JSON encode a value."""
     try:
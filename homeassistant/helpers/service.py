@@ -362,32 +362,44 @@ def async_extract_referenced_entity_ids(
 
     # Find devices for targeted areas
     selected.referenced_devices.update(selector.device_ids)
-    for device_entry in dev_reg.devices.values():
-        if device_entry.area_id in selector.area_ids:
-            selected.referenced_devices.add(device_entry.id)
+    for area_id in selector.area_ids:
+        selected.referenced_devices.update(
+            device_entry.id
+            for device_entry in dev_reg.devices.get_devices_for_area_id(area_id)
+        )
 
     if not selector.area_ids and not selected.referenced_devices:
         return selected
 
-    for ent_entry in ent_reg.entities.values():
-        # Do not add entities which are hidden or which are config
-        # or diagnostic entities.
-        if ent_entry.entity_category is not None or ent_entry.hidden_by is not None:
-            continue
+    entities = ent_reg.entities
+    # Add entities whose area matches a targeted area
+    for area_id in selector.area_ids:
+        selected.indirectly_referenced.update(
+            ent_entry.entity_id
+            for ent_entry in entities.get_entries_for_area_id(area_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if ent_entry.entity_category is None and ent_entry.hidden_by is None
+        )
 
-        if (
-            # The entity's area matches a targeted area
-            ent_entry.area_id in selector.area_ids
-            # The entity's device matches a device referenced by an area and the entity
-            # has no explicitly set area
-            or (
-                not ent_entry.area_id
-                and ent_entry.device_id in selected.referenced_devices
-            )
-            # The entity's device matches a targeted device
-            or ent_entry.device_id in selector.device_ids
+    # Add entities whose device is referenced
+    for device_id in selected.referenced_devices:
+        for ent_entry in entities.get_entries_for_device_id(
+            device_id, include_disabled_entities=True
         ):
-            selected.indirectly_referenced.add(ent_entry.entity_id)
+            # Do not add entities which are hidden or which are config
+            # or diagnostic entities.
+            if ent_entry.entity_category is not None or ent_entry.hidden_by is not None:
+                continue
+
+            if (
+                # The entity's device matches a device referenced by an area and the
+                # entity has no explicitly set area
+                not ent_entry.area_id
+                # The entity's device matches a targeted device
+                or device_id in selector.device_ids
+            ):
+                selected.indirectly_referenced.add(ent_entry.entity_id)
 
     return selected
 
@@ -536,14 +548,17 @@ def async_set_service_schema(
 @bind_hass
 async def entity_service_call(  # noqa: C901
     hass: HomeAssistant,
-    platforms: Iterable[EntityPlatform],
+    platforms: Iterable[EntityPlatform] | dict[str, Entity],
     func: str | Callable[..., Any],
     call: ServiceCall,
     required_features: Iterable[int] | None = None,
 ) -> None:
     """Handle an entity service call.
 
-    Calls all platforms simultaneously.
+    Calls all platforms simultaneously. The platforms can also be passed as
+    a dict which maps entity_id -> entity, so the targeted entities are
+    looked up directly instead of searched on every platform. The targeted
+    entities of a platform are called in the order of their entity_id.
     """
     if call.context.user_id:
         user = await hass.auth.async_get_user(call.context.user_id)
@@ -576,56 +591,58 @@ async def entity_service_call(  # noqa: C901
     else:
         data = call
 
-    # Check the permissions
-
     # A list with entities to call the service on.
     entity_candidates: list[Entity] = []
 
-    if entity_perms is None:
+    if isinstance(platforms, dict):
+        # The entities are indexed by entity_id
+        if target_all_entities:
+            entity_candidates.extend(platforms.values())
+        else:
+            assert all_referenced is not None
+            entity_candidates.extend(
+                [
+                    entity
+                    for entity_id in sorted(all_referenced)
+                    if (entity := platforms.get(entity_id)) is not None
+                ]
+            )
+    else:
+        sorted_referenced: list[str] | None = None
         for platform in platforms:
             if target_all_entities:
                 entity_candidates.extend(platform.entities.values())
             else:
                 assert all_referenced is not None
+                if sorted_referenced is None:
+                    sorted_referenced = sorted(all_referenced)
+                platform_entities = platform.entities
                 entity_candidates.extend(
                     [
                         entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in all_referenced
+                        for entity_id in sorted_referenced
+                        if (entity := platform_entities.get(entity_id)) is not None
                     ]
                 )
 
-    elif target_all_entities:
+    # Check the permissions
+    if entity_perms is not None and target_all_entities:
         # If we target all entities, we will select all entities the user
         # is allowed to control.
-        for platform in platforms:
-            entity_candidates.extend(
-                [
-                    entity
-                    for entity in platform.entities.values()
-                    if entity_perms(entity.entity_id, POLICY_CONTROL)
-                ]
-            )
-
-    else:
-        assert all_referenced is not None
-
-        for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-                if entity.entity_id not in all_referenced:
-                    continue
-
-                if not entity_perms(entity.entity_id, POLICY_CONTROL):
-                    raise Unauthorized(
-                        context=call.context,
-                        entity_id=entity.entity_id,
-                        permission=POLICY_CONTROL,
-                    )
-
-                platform_entities.append(entity)
+        entity_candidates = [
+            entity
+            for entity in entity_candidates
+            if entity_perms(entity.entity_id, POLICY_CONTROL)
+        ]
 
-            entity_candidates.extend(platform_entities)
+    elif entity_perms is not None:
+        for entity in entity_candidates:
+            if not entity_perms(entity.entity_id, POLICY_CONTROL):
+                raise Unauthorized(
+                    context=call.context,
+                    entity_id=entity.entity_id,
+                    permission=POLICY_CONTROL,
+                )
 
     if not target_all_entities:
         assert referenced is not None
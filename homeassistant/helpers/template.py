@@ -10,8 +10,11 @@ from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
+import importlib.util
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter, contains
 import random
@@ -19,6 +22,8 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
+import time
 from types import CodeType
 from typing import (
     Any,
@@ -39,6 +44,7 @@ import jinja2
 from jinja2 import pass_context, pass_environment, pass_eval_context
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
+from lru import LRU  # pylint: disable=no-name-in-module
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -47,11 +53,14 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -72,6 +81,7 @@ from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
 from .json import JSON_DECODE_EXCEPTIONS, json_loads
+from .storage import Store
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -84,6 +94,14 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 60
+BYTECODE_CACHE_MAX_TEMPLATES = 10000
+# Number of compiled templates each environment keeps alive
+COMPILED_TEMPLATE_CACHE_SIZE = 4096
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -2025,6 +2043,98 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class TemplateBytecodeCache:
+    """Persist the compiled code of templates across restarts.
+
+    The code is stored by a hash of the template source and the kind of
+    environment which compiled it. The stored code is dropped when Home
+    Assistant or the Python bytecode format changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+        self._store: Store[dict[str, Any]] = Store(
+            hass, BYTECODE_CACHE_STORAGE_VERSION, BYTECODE_CACHE_STORAGE_KEY
+        )
+        self._version = f"{__version__}-{importlib.util.MAGIC_NUMBER.hex()}"
+        # Base64 encoded marshaled code ordered by last use, templates
+        # are compiled in the event loop and in the executor
+        self._templates: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    async def async_load(self) -> None:
+        """Load the stored bytecode."""
+        data = await self._store.async_load()
+        if isinstance(data, dict) and data.get("version") == self._version:
+            self._templates = data["templates"]
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STARTED, self._async_log_stats
+        )
+
+    @callback
+    def _async_log_stats(self, _event: Event) -> None:
+        """Log how many templates were compiled during startup."""
+        _LOGGER.debug(
+            (
+                "Loaded %s templates from the bytecode cache, compiled %s"
+                " templates in %.3f seconds"
+            ),
+            self.hits,
+            self.misses,
+            self.compile_time,
+        )
+
+    @staticmethod
+    def _key(kind: str, source: str) -> str:
+        """Return the key of a template."""
+        return hashlib.sha256(f"{kind}\0{source}".encode()).hexdigest()
+
+    def get(self, kind: str, source: str) -> CodeType | None:
+        """Return the stored code of a template."""
+        key = self._key(kind, source)
+        with self._lock:
+            if (encoded := self._templates.pop(key, None)) is not None:
+                self._templates[key] = encoded
+        if encoded is not None:
+            try:
+                code = marshal.loads(base64.b64decode(encoded))
+            except (EOFError, TypeError, ValueError):
+                pass
+            else:
+                self.hits += 1
+                return cast(CodeType, code)
+        self.misses += 1
+        return None
+
+    def add(self, kind: str, source: str, code: CodeType, compile_time: float) -> None:
+        """Store the code of a template."""
+        encoded = base64.b64encode(marshal.dumps(code)).decode()
+        self.compile_time += compile_time
+        with self._lock:
+            self._templates[self._key(kind, source)] = encoded
+            while len(self._templates) > BYTECODE_CACHE_MAX_TEMPLATES:
+                del self._templates[next(iter(self._templates))]
+        self.hass.loop.call_soon_threadsafe(
+            self._store.async_delay_save, self._data_to_save, BYTECODE_CACHE_SAVE_DELAY
+        )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        with self._lock:
+            return {"version": self._version, "templates": dict(self._templates)}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the persisted template bytecode."""
+    bytecode_cache = TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -2040,6 +2150,14 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | str | None
         ] = weakref.WeakValueDictionary()
+        # Keep the most recently used templates compiled even if
+        # nothing else references them
+        self._recent_templates: dict[
+            str | jinja2.nodes.Template, CodeType | str | None
+        ] = LRU(COMPILED_TEMPLATE_CACHE_SIZE)
+        self._bytecode_kind = (
+            "limited" if limited else "strict" if strict else "default"
+        )
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2287,9 +2405,27 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             )
 
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_cached(source)
+        self._recent_templates[source] = cached
 
         return cached
 
+    def _compile_cached(self, source: str | jinja2.nodes.Template) -> CodeType:
+        """Compile the template or load its code from the bytecode cache."""
+        if (
+            self.hass is None
+            or not isinstance(source, str)
+            or (bytecode_cache := self.hass.data.get(_BYTECODE_CACHE)) is None
+        ):
+            return cast(CodeType, super().compile(source))
+
+        if (code := bytecode_cache.get(self._bytecode_kind, source)) is None:
+            start = time.monotonic()
+            code = cast(CodeType, super().compile(source))
+            bytecode_cache.add(
+                self._bytecode_kind, source, code, time.monotonic() - start
+            )
+        return code
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
@@ -4,12 +4,13 @@ from __future__ import annotations
 from abc import abstractmethod
 import asyncio
 from collections.abc import Awaitable, Callable, Coroutine, Generator
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
-from random import randint
 from time import monotonic
 from typing import Any, Generic, Protocol, TypeVar
 import urllib.error
+import zlib
 
 import aiohttp
 import requests
@@ -21,7 +22,7 @@ from homeassistant.exceptions import (
     ConfigEntryError,
     ConfigEntryNotReady,
 )
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import UTC, utcnow
 
 from . import entity, event
 from .debounce import Debouncer
@@ -29,6 +30,16 @@ from .debounce import Debouncer
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
 
+DATA_REFRESH_SCHEDULER = "update_coordinator_refresh_scheduler"
+# Width of the phases within the update interval the refreshes are spread
+# over, the refreshes of coordinators in the same phase share a timer. A
+# refresh is followed by the next one at most this much before the update
+# interval passed.
+REFRESH_PHASE_WIDTH = timedelta(milliseconds=100)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
 _T = TypeVar("_T")
 _BaseDataUpdateCoordinatorT = TypeVar(
     "_BaseDataUpdateCoordinatorT", bound="BaseDataUpdateCoordinatorProtocol"
@@ -42,6 +53,112 @@ class UpdateFailed(Exception):
     """Raised when an update has failed."""
 
 
+@dataclass
+class RefreshStatistics:
+    """Statistics of the refreshes of a coordinator."""
+
+    refreshes: int = 0
+    failures: int = 0
+    # Only counted by coordinators which do not always update their listeners
+    unchanged: int = 0
+    last_duration: float | None = None
+    total_duration: float = 0.0
+
+    @property
+    def unchanged_ratio(self) -> float | None:
+        """Return the ratio of the refreshes which did not change the data."""
+        if not self.refreshes:
+            return None
+        return self.unchanged / self.refreshes
+
+
+class _RefreshScheduler:
+    """Schedule the refreshes of all coordinators.
+
+    Refreshes which are due at the same time share a single timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._ticks: dict[datetime, dict[CALLBACK_TYPE, HassJob[[datetime], Any]]] = {}
+        self._unsub_ticks: dict[datetime, CALLBACK_TYPE] = {}
+        self._sequences: dict[tuple[str | None, str], int] = {}
+
+    @callback
+    def async_next_sequence(self, entry_id: str | None, name: str) -> int:
+        """Return the number of coordinators created before for an entry."""
+        sequence = self._sequences.get((entry_id, name), 0)
+        self._sequences[(entry_id, name)] = sequence + 1
+        return sequence
+
+    @callback
+    def async_schedule(
+        self, point_in_time: datetime, job: HassJob[[datetime], Any]
+    ) -> CALLBACK_TYPE:
+        """Run a job at point_in_time and return a callback to cancel it."""
+        if (jobs := self._ticks.get(point_in_time)) is None:
+            jobs = self._ticks[point_in_time] = {}
+
+            @callback
+            def _async_tick(now: datetime) -> None:
+                """Run the jobs which are due."""
+                del self._ticks[point_in_time]
+                del self._unsub_ticks[point_in_time]
+                due_jobs = list(jobs.values())
+                jobs.clear()
+                for due_job in due_jobs:
+                    self.hass.async_run_hass_job(due_job, now)
+
+            self._unsub_ticks[point_in_time] = event.async_track_point_in_utc_time(
+                self.hass, _async_tick, point_in_time
+            )
+
+        @callback
+        def cancel() -> None:
+            """Cancel the job."""
+            if jobs.pop(cancel, None) is None or jobs:
+                return
+            del self._ticks[point_in_time]
+            self._unsub_ticks.pop(point_in_time)()
+
+        jobs[cancel] = job
+        return cancel
+
+
+def _next_refresh(
+    phase_hash: int,
+    update_interval: timedelta,
+    last_refresh: datetime | None = None,
+) -> datetime:
+    """Return the next refresh of a phase.
+
+    The refreshes of a phase happen every update_interval at a stable
+    offset picked by phase_hash, so coordinators started together are
+    spread over the whole interval. The next refresh is the first one at
+    least update_interval minus REFRESH_PHASE_WIDTH after last_refresh,
+    and after now.
+    """
+    interval = max(update_interval // _MICROSECOND, 1)
+    phases = max(update_interval // REFRESH_PHASE_WIDTH, 1)
+    offset = phase_hash % phases * (interval // phases)
+    slack = min(REFRESH_PHASE_WIDTH // _MICROSECOND, interval // 2)
+    now = (utcnow() - _EPOCH) // _MICROSECOND
+    earliest = now + 1
+    if last_refresh is not None:
+        last = (last_refresh - _EPOCH) // _MICROSECOND
+        earliest = max(last + interval - slack, earliest)
+    return _EPOCH + (earliest + (offset - earliest) % interval) * _MICROSECOND
+
+
+@callback
+def _async_get_refresh_scheduler(hass: HomeAssistant) -> _RefreshScheduler:
+    """Return the scheduler of the refreshes of all coordinators."""
+    if (scheduler := hass.data.get(DATA_REFRESH_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_REFRESH_SCHEDULER] = _RefreshScheduler(hass)
+    return scheduler
+
+
 class BaseDataUpdateCoordinatorProtocol(Protocol):
     """Base protocol type for DataUpdateCoordinator."""
 
@@ -64,14 +181,21 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
         update_interval: timedelta | None = None,
         update_method: Callable[[], Awaitable[_T]] | None = None,
         request_refresh_debouncer: Debouncer[Coroutine[Any, Any, None]] | None = None,
+        always_update: bool = True,
     ) -> None:
-        """Initialize global data updater."""
+        """Initialize global data updater.
+
+        If always_update is False, the listeners are only updated when the
+        refreshed data is not equal to the previous data.
+        """
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.always_update = always_update
         self.config_entry = config_entries.current_entry.get()
+        self.refresh_statistics = RefreshStatistics()
 
         # It's None before the first successful update.
         # Components should call async_config_entry_first_refresh
@@ -80,11 +204,17 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
         # when it was already checked during setup.
         self.data: _T = None  # type: ignore[assignment]
 
-        # Pick a random microsecond to stagger the refreshes
-        # and avoid a thundering herd.
-        self._microsecond = randint(
-            event.RANDOM_MICROSECOND_MIN, event.RANDOM_MICROSECOND_MAX
+        # Pick a phase within the update interval to stagger the refreshes
+        # and avoid a thundering herd, also between coordinators of the same
+        # config entry and name. The phase is kept across restarts.
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        sequence = _async_get_refresh_scheduler(hass).async_next_sequence(
+            entry_id, name
         )
+        self._refresh_phase_hash = zlib.crc32(f"{entry_id}_{name}_{sequence}".encode())
+        # When the last refresh started, the next one is an update interval
+        # later.
+        self._last_refresh: datetime | None = None
 
         self._listeners: dict[CALLBACK_TYPE, tuple[CALLBACK_TYPE, object | None]] = {}
         self._job = HassJob(self._handle_refresh_interval)
@@ -160,25 +290,31 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
             self._unsub_refresh()
             self._unsub_refresh = None
 
-        # We _floor_ utcnow to create a schedule on a rounded second,
-        # minimizing the time between the point and the real activation.
-        # That way we obtain a constant update frequency,
-        # as long as the update process takes less than 500ms
+        # We schedule the refreshes on a fixed grid of the update interval,
+        # shifted by the phase of the coordinator. That way we obtain a
+        # constant update frequency, as long as the update process takes
+        # less than the update interval. After a manual refresh the next one
+        # is at the first grid point at least the update interval minus
+        # REFRESH_PHASE_WIDTH later, so they do not run right after another.
         #
-        # We do not align everything to happen at microsecond 0
+        # We do not align every coordinator to the same point in time
         # since it increases the risk of a thundering herd
         # when multiple coordinators are scheduled to update at the same time.
         #
         # https://github.com/home-assistant/core/issues/82231
-        self._unsub_refresh = event.async_track_point_in_utc_time(
-            self.hass,
+        self._unsub_refresh = _async_get_refresh_scheduler(self.hass).async_schedule(
+            _next_refresh(
+                self._refresh_phase_hash,
+                self.update_interval,
+                self._last_refresh,
+            ),
             self._job,
-            utcnow().replace(microsecond=self._microsecond) + self.update_interval,
         )
 
-    async def _handle_refresh_interval(self, _now: datetime) -> None:
+    async def _handle_refresh_interval(self, now: datetime) -> None:
         """Handle a refresh interval occurrence."""
         self._unsub_refresh = None
+        self._last_refresh = now
         await self._async_refresh(log_failures=True, scheduled=True)
 
     async def async_request_refresh(self) -> None:
@@ -231,9 +367,12 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
         if scheduled and self.hass.is_stopping:
             return
 
-        if log_timing := self.logger.isEnabledFor(logging.DEBUG):
-            start = monotonic()
+        if not scheduled:
+            self._last_refresh = utcnow()
+        start = monotonic()
         auth_failed = False
+        previous_update_success = self.last_update_success
+        previous_data = self.data
 
         try:
             self.data = await self._async_update_data()
@@ -317,16 +456,30 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
                 self.logger.info("Fetching %s data recovered", self.name)
 
         finally:
-            if log_timing:
-                self.logger.debug(
-                    "Finished fetching %s data in %.3f seconds (success: %s)",
-                    self.name,
-                    monotonic() - start,
-                    self.last_update_success,
-                )
+            duration = monotonic() - start
+            statistics = self.refresh_statistics
+            statistics.refreshes += 1
+            statistics.last_duration = duration
+            statistics.total_duration += duration
+            if not self.last_update_success:
+                statistics.failures += 1
+            self.logger.debug(
+                "Finished fetching %s data in %.3f seconds (success: %s)",
+                self.name,
+                duration,
+                self.last_update_success,
+            )
             if not auth_failed and self._listeners and not self.hass.is_stopping:
                 self._schedule_refresh()
 
+        if (
+            not self.always_update
+            and previous_update_success == self.last_update_success
+            and previous_data == self.data
+        ):
+            self.refresh_statistics.unchanged += 1
+            return
+
         self.async_update_listeners()
 
     @callback
@@ -349,6 +502,7 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_T]):
 
         self.data = data
         self.last_update_success = True
+        self._last_refresh = utcnow()
         self.logger.debug(
             "Manually updated %s data",
             self.name,
@@ -2,6 +2,7 @@
 from datetime import timedelta
 from unittest.mock import patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import config as hass_config
@@ -34,6 +35,7 @@ from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
 from tests.common import assert_setup_component, get_fixture_path
+from tests.components.recorder.common import async_wait_recording_done
 
 
 @pytest.fixture(name="values")
@@ -130,11 +132,10 @@ async def test_chain_history(
         }
 
     with patch(
-        "homeassistant.components.recorder.history.state_changes_during_period",
-        return_value=fake_states,
-    ), patch(
-        "homeassistant.components.recorder.history.get_last_state_changes",
-        return_value=fake_states,
+        "homeassistant.components.recorder.history.state_changes_during_period_many",
+        side_effect=lambda hass, requests: [
+            fake_states.get(request.entity_id, []) for request in requests
+        ],
     ):
         with assert_setup_component(1, "sensor"):
             assert await async_setup_component(hass, "sensor", config)
@@ -234,11 +235,10 @@ async def test_history_time(recorder_mock: Recorder, hass: HomeAssistant) -> Non
         ]
     }
     with patch(
-        "homeassistant.components.recorder.history.state_changes_during_period",
-        return_value=fake_states,
-    ), patch(
-        "homeassistant.components.recorder.history.get_last_state_changes",
-        return_value=fake_states,
+        "homeassistant.components.recorder.history.state_changes_during_period_many",
+        side_effect=lambda hass, requests: [
+            fake_states.get(request.entity_id, []) for request in requests
+        ],
     ):
         with assert_setup_component(1, "sensor"):
             assert await async_setup_component(hass, "sensor", config)
@@ -249,6 +249,36 @@ async def test_history_time(recorder_mock: Recorder, hass: HomeAssistant) -> Non
         assert state.state == "18.0"
 
 
+async def test_history_time_start_state(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test the state at the start of the time window is loaded from history."""
+    config = {
+        "sensor": {
+            "platform": "filter",
+            "name": "test",
+            "entity_id": "sensor.test_monitored",
+            "filters": [
+                {"filter": "time_simple_moving_average", "window_size": "01:00"}
+            ],
+        },
+    }
+
+    # The source did not change during the time window
+    freezer.move_to(dt_util.utcnow() - timedelta(hours=2))
+    hass.states.async_set("sensor.test_monitored", "20")
+    await async_wait_recording_done(hass)
+    freezer.move_to(dt_util.utcnow() + timedelta(hours=2))
+
+    with assert_setup_component(1, "sensor"):
+        assert await async_setup_component(hass, "sensor", config)
+        await hass.async_block_till_done()
+
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state.state == "20.0"
+
+
 async def test_setup(recorder_mock: Recorder, hass: HomeAssistant) -> None:
     """Test if filter attributes are inherited."""
     config = {
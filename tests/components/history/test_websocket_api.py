@@ -527,6 +527,92 @@ async def test_history_stream_historical_only(recorder_mock, hass, hass_ws_clien
     }
 
 
+async def test_history_stream_historical_in_chunks(recorder_mock, hass, hass_ws_client):
+    """Test historical states are streamed in several messages."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    last_updated = {}
+    for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+        hass.states.async_set(entity_id, "on")
+        last_updated[entity_id] = hass.states.get(entity_id).last_updated.timestamp()
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    with patch.object(websocket_api, "STREAM_MESSAGE_SIZE", 1):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "entity_ids": ["sensor.one", "sensor.two", "sensor.three"],
+                "include_start_time_state": False,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        # Each entity is sent in its own message as soon as it has been read
+        streamed = {}
+        end_times = []
+        for _ in range(3):
+            response = await client.receive_json()
+            assert response["id"] == 1
+            assert response["type"] == "event"
+            assert response["event"]["start_time"] == now.timestamp()
+            assert len(response["event"]["states"]) == 1
+            streamed.update(response["event"]["states"])
+            end_times.append(response["event"]["end_time"])
+
+    assert streamed == {
+        entity_id: [{"a": {}, "lu": entity_last_updated, "s": "on"}]
+        for entity_id, entity_last_updated in last_updated.items()
+    }
+    assert end_times[-1] == last_updated["sensor.three"]
+
+
+async def test_history_during_period_max_points(recorder_mock, hass, hass_ws_client):
+    """Test history_during_period reduces numeric states to max_points."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    values = [str(value) for value in range(20)]
+    values[10] = "100"
+    for value in values:
+        hass.states.async_set("sensor.power", value)
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(minutes=1)).isoformat(),
+            "entity_ids": ["sensor.power"],
+            "minimal_response": True,
+            "max_points": 4,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    # All states are in the first period, only the first and the last
+    # states and the minimum and maximum states in between are kept
+    assert [state["s"] for state in response["result"]["sensor.power"]] == [
+        "0",
+        "1",
+        "100",
+        "19",
+    ]
+
+
 async def test_history_stream_significant_domain_historical_only(
     recorder_mock, hass, hass_ws_client
 ):
@@ -17,6 +17,8 @@ from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook.models import LazyEventPartialState
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
+from homeassistant.components.recorder.db_schema import Events, States
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -709,6 +711,61 @@ async def test_logbook_entity_filter_with_automations(recorder_mock, hass, hass_
     assert json_dict[0]["entity_id"] == entity_id_second
 
 
+async def test_logbook_during_id_migration(recorder_mock, hass, hass_client):
+    """Test the logbook selects rows by strings while the ids are migrated."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook", "automation")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+    instance = recorder.get_instance(hass)
+    instance.event_type_manager.active = False
+    instance.states_meta_manager.active = False
+
+    entity_id_test = "alarm_control_panel.area_001"
+    hass.states.async_set(entity_id_test, STATE_OFF)
+    hass.states.async_set(entity_id_test, STATE_ON)
+    hass.bus.async_fire(
+        EVENT_AUTOMATION_TRIGGERED,
+        {ATTR_NAME: "Mock automation", ATTR_ENTITY_ID: "automation.mock_automation"},
+    )
+    await async_wait_recording_done(hass)
+
+    def _unset_ids() -> None:
+        """Unset the ids like on rows the migration has not reached yet."""
+        with session_scope(hass=hass) as session:
+            session.query(States).update({States.metadata_id: None})
+            session.query(Events).update({Events.event_type_id: None})
+
+    await instance.async_add_executor_job(_unset_ids)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+    end_time = start + timedelta(hours=24)
+
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}?end_time={end_time}"
+    )
+    assert response.status == HTTPStatus.OK
+    json_dict = await response.json()
+    assert [entry["entity_id"] for entry in json_dict] == [
+        entity_id_test,
+        "automation.mock_automation",
+    ]
+
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}?end_time={end_time}&entity={entity_id_test}"
+    )
+    assert response.status == HTTPStatus.OK
+    json_dict = await response.json()
+    assert len(json_dict) == 1
+    assert json_dict[0]["entity_id"] == entity_id_test
+    assert json_dict[0]["state"] == STATE_ON
+
+
 async def test_logbook_entity_no_longer_in_state_machine(
     recorder_mock, hass, hass_client
 ):
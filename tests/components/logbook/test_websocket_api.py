@@ -1783,6 +1783,107 @@ async def test_subscribe_unsubscribe_logbook_stream_big_query(
     ) == listeners_without_writes(init_listeners)
 
 
+@patch("homeassistant.components.logbook.processor.STREAM_CHUNK_SIZE", 2)
+async def test_logbook_stream_historical_in_chunks(recorder_mock, hass, hass_ws_client):
+    """Test historical events are sent in chunks as soon as they are read."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+
+    last_updated = []
+    for state in (STATE_ON, STATE_OFF, STATE_ON, STATE_OFF, STATE_ON):
+        hass.states.async_set("binary_sensor.is_light", state)
+        last_updated.append(hass.states.get("binary_sensor.is_light").last_updated)
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    websocket_client = await hass_ws_client()
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "logbook/event_stream",
+            "start_time": now.isoformat(),
+            "end_time": end_time.isoformat(),
+            "entity_ids": ["binary_sensor.is_light"],
+        }
+    )
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert msg["id"] == 7
+    assert msg["type"] == TYPE_RESULT
+    assert msg["success"]
+
+    # Each chunk is sent as a partial message as soon as it has been read
+    # and the last one is sent without partial set
+    messages = []
+    while True:
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert msg["type"] == "event"
+        messages.append(msg["event"])
+        if not msg["event"].get("partial"):
+            break
+
+    assert len(messages) > 1
+    # The first state has no old state so it is not in the logbook
+    assert [event for message in messages for event in message["events"]] == [
+        {
+            "entity_id": "binary_sensor.is_light",
+            "state": state,
+            "when": state_last_updated.timestamp(),
+        }
+        for state, state_last_updated in zip(
+            ("off", "on", "off", "on"), last_updated[1:]
+        )
+    ]
+
+
+@patch("homeassistant.components.logbook.processor.STREAM_CHUNK_SIZE", 2)
+async def test_get_events_in_chunks(recorder_mock, hass, hass_ws_client):
+    """Test get_events combines the events of all chunks in one result."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+
+    last_updated = []
+    for state in (STATE_ON, STATE_OFF, STATE_ON, STATE_OFF, STATE_ON):
+        hass.states.async_set("binary_sensor.is_light", state)
+        last_updated.append(hass.states.get("binary_sensor.is_light").last_updated)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": now.isoformat(),
+            "entity_ids": ["binary_sensor.is_light"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["result"] == [
+        {
+            "entity_id": "binary_sensor.is_light",
+            "state": state,
+            "when": state_last_updated.timestamp(),
+        }
+        for state, state_last_updated in zip(
+            ("off", "on", "off", "on"), last_updated[1:]
+        )
+    ]
+
+
 @patch("homeassistant.components.logbook.websocket_api.EVENT_COALESCE_TIME", 0)
 async def test_subscribe_unsubscribe_logbook_stream_device(
     recorder_mock, hass, hass_ws_client
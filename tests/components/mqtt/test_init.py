@@ -1194,6 +1194,41 @@ async def test_subscribe_special_characters(
     assert calls[0][0].payload == payload
 
 
+async def test_subscribe_overlapping_wildcards_and_unsubscribe(
+    hass, mqtt_mock_entry_no_yaml_config
+):
+    """Test subscriptions with overlapping wildcards are removed independently."""
+    await mqtt_mock_entry_no_yaml_config()
+    calls_level = MagicMock()
+    calls_subtree = MagicMock()
+    calls_exact = MagicMock()
+
+    unsub_level = await mqtt.async_subscribe(hass, "test/+/state", calls_level)
+    unsub_subtree = await mqtt.async_subscribe(hass, "test/#", calls_subtree)
+    await mqtt.async_subscribe(hass, "test/light/state", calls_exact)
+
+    async_fire_mqtt_message(hass, "test/light/state", "on")
+    await hass.async_block_till_done()
+    assert calls_level.call_count == 1
+    assert calls_subtree.call_count == 1
+    assert calls_exact.call_count == 1
+
+    unsub_level()
+    async_fire_mqtt_message(hass, "test/light/state", "off")
+    async_fire_mqtt_message(hass, "test", "off")
+    await hass.async_block_till_done()
+    assert calls_level.call_count == 1
+    assert calls_subtree.call_count == 3
+    assert calls_exact.call_count == 2
+
+    unsub_subtree()
+    async_fire_mqtt_message(hass, "test/light/state", "on")
+    await hass.async_block_till_done()
+    assert calls_level.call_count == 1
+    assert calls_subtree.call_count == 3
+    assert calls_exact.call_count == 3
+
+
 async def test_subscribe_same_topic(
     hass, mqtt_client_mock, mqtt_mock_entry_no_yaml_config
 ):
@@ -1442,6 +1477,64 @@ async def test_handle_message_callback(
     assert callbacks[0].payload == "test-payload"
 
 
+async def test_handle_message_callback_batch(
+    hass, mqtt_mock_entry_no_yaml_config, mqtt_client_mock
+):
+    """Test messages received in the same loop iteration are handled as a batch."""
+    callbacks = []
+
+    def _callback(args):
+        callbacks.append(args)
+
+    await mqtt_mock_entry_no_yaml_config()
+    mqtt_client_mock.on_connect(mqtt_client_mock, None, None, 0)
+    await mqtt.async_subscribe(hass, "some-topic/+", _callback)
+    for idx in range(3):
+        msg = ReceiveMessage(f"some-topic/{idx}", b"test-payload", 1, False)
+        mqtt_client_mock.on_message(mock_mqtt, None, msg)
+
+    await hass.async_block_till_done()
+    assert [msg.topic for msg in callbacks] == [
+        "some-topic/0",
+        "some-topic/1",
+        "some-topic/2",
+    ]
+    # The client in hass.data is a mock wrapping the client paho calls back
+    stats = mqtt_client_mock.on_message.__self__.receive_batch_stats
+    assert stats.batches == 1
+    assert stats.messages == 3
+    assert stats.last_batch_size == 3
+    assert stats.max_batch_size == 3
+    assert stats.max_latency >= stats.last_latency >= 0
+
+
+async def test_handle_message_callback_batch_exception(
+    hass, caplog, mqtt_mock_entry_no_yaml_config, mqtt_client_mock
+):
+    """Test a failing callback does not abort the rest of the batch."""
+    callbacks = []
+
+    @callback
+    def _callback(msg):
+        if msg.topic == "some-topic/1":
+            raise ValueError("Callback failed")
+        callbacks.append(msg)
+
+    await mqtt_mock_entry_no_yaml_config()
+    mqtt_client_mock.on_connect(mqtt_client_mock, None, None, 0)
+    await mqtt.async_subscribe(hass, "some-topic/+", _callback)
+    for idx in range(3):
+        msg = ReceiveMessage(f"some-topic/{idx}", b"test-payload", 1, False)
+        mqtt_client_mock.on_message(mock_mqtt, None, msg)
+
+    await hass.async_block_till_done()
+    assert [msg.topic for msg in callbacks] == ["some-topic/0", "some-topic/2"]
+    assert "Exception while handling message on some-topic/1" in caplog.text
+    stats = mqtt_client_mock.on_message.__self__.receive_batch_stats
+    assert stats.batches == 1
+    assert stats.messages == 3
+
+
 async def test_setup_override_configuration(hass, caplog, tmp_path):
     """Test override setup from configuration entry."""
     calls_username_password_set = []
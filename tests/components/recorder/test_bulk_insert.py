@@ -0,0 +1,125 @@
+"""The tests for the recorder bulk inserter."""
+from unittest.mock import patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder.bulk_insert import BulkInserter
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.util import session_scope
+
+from .common import wait_recording_done
+
+BULK_INSERT_CONFIG = {
+    recorder.CONF_BULK_INSERT: True,
+    # Commit only when the tests trigger it so rows are batched
+    recorder.CONF_COMMIT_INTERVAL: 30,
+}
+
+
+def _wait_bulk_insert_done(hass):
+    """Wait for the recorder to process the events and commit them."""
+    wait_recording_done(hass)
+    # The commit is only triggered when the recorder already has pending
+    # rows, so trigger it again now that all events have been processed
+    wait_recording_done(hass)
+
+
+def test_bulk_insert_states(hass_recorder):
+    """Test states are inserted in bulk with old states and attributes."""
+    hass = hass_recorder(BULK_INSERT_CONFIG)
+    instance = recorder.get_instance(hass)
+    assert instance._bulk_inserter is not None
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 1})
+    hass.states.set("test.one", "off", {"attr": 2})
+    hass.states.set("test.one", "on", {"attr": 1})
+    _wait_bulk_insert_done(hass)
+    hass.states.set("test.one", "off", {"attr": 2})
+    hass.states.set("test.two", "off", {"attr": 3})
+    _wait_bulk_insert_done(hass)
+    assert not instance._bulk_inserter.has_pending
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.states_meta_rel.entity_id, state.state) for state in states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.one", "on"),
+            ("test.one", "off"),
+            ("test.two", "off"),
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[2].state_id
+        assert states[4].old_state_id == states[3].state_id
+        assert states[5].old_state_id == states[1].state_id
+
+        attributes = {
+            row.attributes_id: row.to_native() for row in session.query(StateAttributes)
+        }
+        assert len(attributes) == 3
+        assert [attributes[state.attributes_id] for state in states] == [
+            {"attr": 1},
+            {"attr": 1},
+            {"attr": 2},
+            {"attr": 1},
+            {"attr": 2},
+            {"attr": 3},
+        ]
+
+
+def test_bulk_insert_events(hass_recorder):
+    """Test events are inserted in bulk with shared event data."""
+    hass = hass_recorder(BULK_INSERT_CONFIG)
+
+    for _ in range(3):
+        hass.bus.fire("bulk_event", {"de": "dupe"})
+    hass.bus.fire("bulk_event", {"other": "data"})
+    hass.bus.fire("bulk_event")
+    _wait_bulk_insert_done(hass)
+    hass.bus.fire("bulk_event", {"de": "dupe"})
+    _wait_bulk_insert_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(
+            session.query(Events)
+            .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "bulk_event")
+            .order_by(Events.event_id)
+        )
+        assert len(events) == 6
+        event_data = {row.data_id: row.to_native() for row in session.query(EventData)}
+        assert [
+            event_data[event.data_id] if event.data_id else None for event in events
+        ] == [
+            {"de": "dupe"},
+            {"de": "dupe"},
+            {"de": "dupe"},
+            {"other": "data"},
+            None,
+            {"de": "dupe"},
+        ]
+        assert events[0].data_id == events[5].data_id
+
+
+def test_bulk_insert_disabled_by_default(hass_recorder):
+    """Test the event session is used when bulk insert is not enabled."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    assert instance._bulk_inserter is None
+
+    with patch.object(BulkInserter, "write") as write:
+        hass.states.set("test.one", "on", {})
+        wait_recording_done(hass)
+
+    assert not write.called
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 1
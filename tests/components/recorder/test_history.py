@@ -17,6 +17,7 @@ from homeassistant.components.recorder.db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.models import (
     LazyState,
@@ -93,6 +94,7 @@ def _add_db_entries(
             session.add(
                 States(
                     entity_id=entity_id,
+                    states_meta_rel=StatesMeta(entity_id=entity_id),
                     state="on",
                     attributes='{"name":"the light"}',
                     last_changed=None,
@@ -317,6 +319,126 @@ def test_state_changes_during_period_descending(hass_recorder):
     )
 
 
+def test_state_changes_during_period_many(hass_recorder):
+    """Test the state changes of many entities in one query."""
+    hass = hass_recorder()
+
+    def set_state(entity_id, state):
+        """Set the state."""
+        hass.states.set(entity_id, state, {"any": 1})
+        wait_recording_done(hass)
+        return hass.states.get(entity_id)
+
+    start = dt_util.utcnow()
+    point = start + timedelta(seconds=1)
+
+    with patch(
+        "homeassistant.components.recorder.core.dt_util.utcnow", return_value=start
+    ):
+        old_states = [
+            set_state("sensor.one", "1"),
+            set_state("sensor.two", "1"),
+        ]
+
+    with patch(
+        "homeassistant.components.recorder.core.dt_util.utcnow", return_value=point
+    ):
+        one = [set_state("sensor.one", str(value)) for value in range(2, 5)]
+        two = [set_state("sensor.two", str(value)) for value in range(2, 4)]
+
+    results = history.state_changes_during_period_many(
+        hass,
+        [
+            history.StateChangesRequest("sensor.one", start - timedelta(seconds=1)),
+            history.StateChangesRequest("sensor.one", start),
+            history.StateChangesRequest("sensor.two", start, limit=1),
+            history.StateChangesRequest(
+                "sensor.two", start - timedelta(seconds=1), limit=2
+            ),
+            history.StateChangesRequest("sensor.missing", start),
+            history.StateChangesRequest(
+                "sensor.one",
+                start + timedelta(milliseconds=500),
+                include_start_time_state=True,
+            ),
+            history.StateChangesRequest(
+                "sensor.two",
+                point + timedelta(seconds=1),
+                include_start_time_state=True,
+            ),
+        ],
+    )
+
+    assert_multiple_states_equal_without_context([old_states[0], *one], results[0])
+    assert_multiple_states_equal_without_context(one, results[1])
+    assert_multiple_states_equal_without_context(two[-1:], results[2])
+    assert_multiple_states_equal_without_context(two, results[3])
+    assert results[4] == []
+    # The state at the start time is returned like state_changes_during_period does
+    assert results[5][0].state == "1"
+    assert_multiple_states_equal_without_context(
+        history.state_changes_during_period(
+            hass, start + timedelta(milliseconds=500), entity_id="sensor.one"
+        )["sensor.one"],
+        results[5],
+    )
+    assert [state.state for state in results[6]] == ["3"]
+    assert_multiple_states_equal_without_context(
+        history.state_changes_during_period(
+            hass, point + timedelta(seconds=1), entity_id="sensor.two"
+        )["sensor.two"],
+        results[6],
+    )
+
+
+def test_state_changes_during_period_many_own_start_and_limit(hass_recorder):
+    """Test each request of the combined query keeps its own start and limit."""
+    hass = hass_recorder()
+
+    def set_state(entity_id, state):
+        """Set the state."""
+        hass.states.set(entity_id, state, {"any": 1})
+        wait_recording_done(hass)
+        return hass.states.get(entity_id)
+
+    start = dt_util.utcnow()
+    point = start + timedelta(seconds=10)
+
+    with patch(
+        "homeassistant.components.recorder.core.dt_util.utcnow", return_value=start
+    ):
+        one = [set_state("sensor.one", str(value)) for value in range(1, 4)]
+        set_state("sensor.two", "1")
+
+    with patch(
+        "homeassistant.components.recorder.core.dt_util.utcnow", return_value=point
+    ):
+        two = [set_state("sensor.two", str(value)) for value in range(2, 4)]
+
+    epoch = dt_util.utc_from_timestamp(0)
+    results = history.state_changes_during_period_many(
+        hass,
+        [
+            history.StateChangesRequest("sensor.one", epoch, limit=2),
+            history.StateChangesRequest("sensor.two", point - timedelta(seconds=1)),
+        ],
+    )
+
+    assert_multiple_states_equal_without_context(one[-2:], results[0])
+    assert_multiple_states_equal_without_context(two, results[1])
+
+    # Each request is a part of the union with its own start and limit,
+    # instead of numbering all rows after the oldest start time
+    stmt = str(
+        history._state_changes_many_stmt(
+            [(0, 1, epoch.timestamp(), 2), (1, 2, point.timestamp(), None)]
+        )
+    )
+    assert stmt.count("UNION ALL") == 1
+    assert stmt.count("LIMIT") == 1
+    assert "row_number" not in stmt
+
+
 def test_get_last_state_changes(hass_recorder):
     """Test number of state changes."""
     hass = hass_recorder()
@@ -464,6 +586,85 @@ def test_get_significant_states_minimal_response(hass_recorder):
     )
 
 
+@pytest.mark.parametrize(
+    ("start_offset", "entity_ids"),
+    [
+        (0, None),
+        (1.5, None),
+        (1.5, ["media_player.test", "thermostat.test", "script.can_cancel_this_one"]),
+        (2.5, ["media_player.test"]),
+    ],
+)
+@pytest.mark.parametrize("minimal_response", [False, True])
+@pytest.mark.parametrize("no_attributes", [False, True])
+@pytest.mark.parametrize("significant_changes_only", [False, True])
+def test_stream_significant_states(
+    hass_recorder,
+    start_offset,
+    entity_ids,
+    minimal_response,
+    no_attributes,
+    significant_changes_only,
+):
+    """Test streaming states gives the same result as the compressed format."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    start_time = zero + timedelta(seconds=start_offset)
+    args = (
+        hass,
+        start_time,
+        four,
+        entity_ids,
+        None,
+        True,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    )
+    expected = history.get_significant_states(*args, compressed_state_format=True)
+
+    # Use a small chunk size so the states of entities span several chunks
+    streamed = list(history.stream_significant_states(*args, chunk_size=2))
+
+    assert json.loads(
+        b"{" + b",".join(fragment for _, fragment, _ in streamed) + b"}"
+    ) == json.loads(json.dumps(expected))
+    for entity_id, _, last_updated_ts in streamed:
+        assert last_updated_ts == expected[entity_id][-1]["lu"]
+
+
+def test_stream_significant_states_max_points(hass_recorder):
+    """Test numeric states are reduced to the min and max of each period."""
+    hass = hass_recorder()
+    zero = dt_util.utcnow()
+    values = ["1", "5", "2", "unavailable", "3", "9", "4", "0", "7", "6"]
+    for idx, value in enumerate(values):
+        with patch(
+            "homeassistant.components.recorder.core.dt_util.utcnow",
+            return_value=zero + timedelta(seconds=idx + 1),
+        ):
+            hass.states.set("sensor.power", value)
+            wait_recording_done(hass)
+    end = zero + timedelta(seconds=11)
+
+    def _stream_states(max_points):
+        (fragment,) = (
+            fragment
+            for _, fragment, _ in history.stream_significant_states(
+                hass, zero, end, ["sensor.power"], max_points=max_points
+            )
+        )
+        return [
+            state["s"] for state in json.loads(b"{" + fragment + b"}")["sensor.power"]
+        ]
+
+    assert _stream_states(None) == values
+    assert _stream_states(10) == values
+    # Two periods of 5.5 seconds, the first and last states
+    # and states that are not numeric are always kept
+    assert _stream_states(4) == ["1", "5", "2", "unavailable", "3", "9", "0", "6"]
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 def test_get_significant_states_with_initial(time_zone, hass_recorder):
     """Test that only significant states are returned.
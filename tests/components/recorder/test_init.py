@@ -43,6 +43,11 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsRuns,
 )
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.queries import (
+    find_shared_attributes_ids,
+    select_event_type_ids,
+    select_metadata_ids,
+)
 from homeassistant.components.recorder.services import (
     SERVICE_DISABLE,
     SERVICE_ENABLE,
@@ -150,6 +155,22 @@ async def test_canceled_before_startup_finishes(
     )
 
 
+async def test_partition_tables_not_supported_with_sqlite(
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Test table partitioning is skipped for databases other than PostgreSQL."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_PARTITION_TABLES: True}
+    )
+    await async_wait_recording_done(hass)
+
+    assert instance.partition_tables is True
+    assert instance.tables_partitioned is False
+    assert "Table partitioning is only supported with PostgreSQL" in caplog.text
+
+
 async def test_shutdown_closes_connections(recorder_mock, hass):
     """Test shutdown closes connections."""
 
@@ -456,7 +477,7 @@ def test_saving_event(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .filter(Events.event_type_id.in_(select_event_type_ids((event_type,))))
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -694,11 +715,11 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
@@ -1201,10 +1222,10 @@ def test_saving_sets_old_state(hass_recorder):
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1228,8 +1249,8 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1277,7 +1298,11 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     event = events[0]
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events).filter(
+                Events.event_type_id.in_(select_event_type_ids((event_type,)))
+            )
+        )
         assert len(db_events) == 0
 
     assert hass.services.call(
@@ -1299,7 +1324,7 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .filter(Events.event_type_id.in_(select_event_type_ids((event_type,))))
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -1496,7 +1521,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids(("hello",)))
+                )
+            )
             assert len(db_events) == idx + 1, data
 
     for data in (
@@ -1507,7 +1536,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids(("hello",)))
+                )
+            )
             # Keep referring idx + 1, as no new events are being added
             assert len(db_events) == idx + 1, data
 
@@ -1528,7 +1561,11 @@ async def test_database_lock_and_unlock(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids((event_type,)))
+                )
+            )
 
     instance = get_instance(hass)
 
@@ -1570,7 +1607,11 @@ async def test_database_lock_and_overflow(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids((event_type,)))
+                )
+            )
 
     instance = get_instance(hass)
 
@@ -1696,7 +1737,7 @@ def test_deduplication_event_data_inside_commit_interval(hass_recorder, caplog):
     with session_scope(hass=hass) as session:
         events = list(
             session.query(Events)
-            .filter(Events.event_type == "this_event")
+            .filter(Events.event_type_id.in_(select_event_type_ids(("this_event",))))
             .outerjoin(EventData, (Events.data_id == EventData.data_id))
         )
         assert len(events) == 20
@@ -1731,7 +1772,7 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .filter(States.metadata_id.in_(select_metadata_ids((entity_id,))))
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1742,6 +1783,130 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
         assert first_attributes_id == last_attributes_id
 
 
+async def test_shared_ids_caches_are_warmed_up(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+) -> None:
+    """Test the attributes and data ids of the latest rows are loaded at startup."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("test.recorder", "on", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_data": 5})
+    await async_wait_recording_done(hass)
+
+    def _clear_and_warm_up_caches() -> None:
+        instance._state_attributes_ids.clear()
+        instance._event_data_ids.clear()
+        with session_scope(hass=hass) as session:
+            instance._warm_up_shared_ids_caches(session)
+
+    await instance.async_add_executor_job(_clear_and_warm_up_caches)
+    assert '{"test_attr":5}' in instance._state_attributes_ids
+    assert '{"test_data":5}' in instance._event_data_ids
+
+
+async def test_uncached_shared_attrs_are_found_with_one_query(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+) -> None:
+    """Test attributes missing from the cache are looked up once per commit."""
+    instance = await async_setup_recorder_instance(hass)
+
+    for attr in range(3):
+        hass.states.async_set(f"test.recorder_{attr}", "on", {"test_attr": attr})
+    await async_wait_recording_done(hass)
+
+    await instance.async_add_executor_job(instance._state_attributes_ids.clear)
+    with patch(
+        "homeassistant.components.recorder.core.find_shared_attributes_ids",
+        wraps=find_shared_attributes_ids,
+    ) as find_ids_mock:
+        for attr in range(3):
+            hass.states.async_set(f"test.recorder_{attr}", "off", {"test_attr": attr})
+        hass.states.async_set("test.recorder_0", "on", {"test_attr": 0})
+        await async_wait_recording_done(hass)
+    assert find_ids_mock.call_count == 1
+
+    def _count_state_attributes() -> int:
+        with session_scope(hass=hass) as session:
+            return session.query(StateAttributes).count()
+
+    assert await instance.async_add_executor_job(_count_state_attributes) == 3
+
+
+def test_shared_ids_lookup_is_retried(hass_recorder):
+    """Test a failed lookup of the shared ids is repeated when the commit is retried."""
+    hass = hass_recorder()
+    instance = get_instance(hass)
+    find_shared_ids_in_db = instance._find_shared_ids_in_db
+    failed_lookups = set()
+
+    def _fail_first_lookup(find_ids, hashes):
+        if find_ids not in failed_lookups:
+            failed_lookups.add(find_ids)
+            raise OperationalError("select the ids", "fake params", "forced to fail")
+        return find_shared_ids_in_db(find_ids, hashes)
+
+    with patch("time.sleep"), patch.object(
+        instance, "_find_shared_ids_in_db", side_effect=_fail_first_lookup
+    ):
+        hass.states.set("test.recorder", "on", {"test_attr": 5})
+        hass.bus.fire("test_event", {"test_data": 5})
+        wait_recording_done(hass)
+
+    assert len(failed_lookups) == 2
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(States)
+            .join(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .filter(StateAttributes.shared_attrs == '{"test_attr":5}')
+            .count()
+            == 1
+        )
+        assert (
+            session.query(Events)
+            .join(EventData, Events.data_id == EventData.data_id)
+            .filter(EventData.shared_data == '{"test_data":5}')
+            .count()
+            == 1
+        )
+
+
+async def test_unchanged_attributes_are_not_serialized_again(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+) -> None:
+    """Test unchanged attributes reuse the shared attributes of the last state."""
+    await async_setup_recorder_instance(hass)
+
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_bytes_from_event",
+        wraps=StateAttributes.shared_attrs_bytes_from_event,
+    ) as shared_attrs_mock:
+        for state in range(3):
+            hass.states.async_set("sensor.power", str(state), {"test_attr": 5})
+        hass.states.async_set("sensor.power", "3", {"test_attr": 6})
+        await async_wait_recording_done(hass)
+    assert shared_attrs_mock.call_count == 2
+
+    def _fetch_attributes() -> list[str]:
+        with session_scope(hass=hass) as session:
+            return [
+                shared_attrs
+                for (shared_attrs,) in session.query(StateAttributes.shared_attrs)
+                .join(States, States.attributes_id == StateAttributes.attributes_id)
+                .filter(States.metadata_id.in_(select_metadata_ids(("sensor.power",))))
+                .order_by(States.state_id)
+            ]
+
+    assert await hass.async_add_executor_job(_fetch_attributes) == [
+        '{"test_attr":5}',
+        '{"test_attr":5}',
+        '{"test_attr":5}',
+        '{"test_attr":6}',
+    ]
+
+
 async def test_async_block_till_done(async_setup_recorder_instance, hass):
     """Test we can block until recordering is done."""
     instance = await async_setup_recorder_instance(hass)
@@ -1755,7 +1920,11 @@ async def test_async_block_till_done(async_setup_recorder_instance, hass):
 
     def _fetch_states():
         with session_scope(hass=hass) as session:
-            return list(session.query(States).filter(States.entity_id == entity_id))
+            return list(
+                session.query(States).filter(
+                    States.metadata_id.in_(select_metadata_ids((entity_id,)))
+                )
+            )
 
     await async_block_recorder(hass, 0.1)
     await instance.async_block_till_done()
@@ -23,16 +23,28 @@ from homeassistant.components import persistent_notification as pn, recorder
 from homeassistant.components.recorder import db_schema, migration
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
+    Events,
+    EventTypes,
     RecorderRuns,
     States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.tasks import (
+    EntityIDMigrationTask,
+    EventTypeIDMigrationTask,
 )
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers import recorder as recorder_helper
 import homeassistant.util.dt as dt_util
 
-from .common import async_wait_recording_done, create_engine_test
+from .common import (
+    async_recorder_block_till_done,
+    async_wait_recording_done,
+    create_engine_test,
+)
 
-from tests.common import async_fire_time_changed
+from tests.common import SetupRecorderInstanceT, async_fire_time_changed
 
 ORIG_TZ = dt_util.DEFAULT_TIME_ZONE
 
@@ -41,7 +53,11 @@ def _get_native_states(hass, entity_id):
     with session_scope(hass=hass) as session:
         return [
             state.to_native()
-            for state in session.query(States).filter(States.entity_id == entity_id)
+            for state in session.query(States)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(
+                (StatesMeta.entity_id == entity_id) | (States.entity_id == entity_id)
+            )
         ]
 
 
@@ -450,6 +466,64 @@ def test_forgiving_add_index_with_other_db_types(caplog, exception_type):
     assert "continuing" in caplog.text
 
 
+@pytest.mark.parametrize(
+    ("legacy_end", "first_day"),
+    [(None, 0), (datetime.datetime(2022, 3, 10, tzinfo=dt_util.UTC).timestamp(), 1)],
+)
+def test_partition_tables_retries_day_partitions(caplog, legacy_end, first_day):
+    """Test day partitions from today are created and failed ones are retried."""
+    today = datetime.datetime(2022, 3, 9, tzinfo=dt_util.UTC)
+    instance = Mock()
+    instance.get_session = Mock(return_value=Mock())
+    created = []
+    fail = True
+
+    def _create_day_partition(session, table, column, start):
+        if fail and start == today + datetime.timedelta(days=first_day):
+            raise OperationalError(
+                "ALTER TABLE states ATTACH PARTITION",
+                [],
+                "updated partition constraint for default partition would be violated",
+            )
+        created.append((table, column, start))
+
+    with patch(
+        "homeassistant.components.recorder.migration.dt_util.utcnow",
+        return_value=today + datetime.timedelta(hours=5),
+    ), patch(
+        "homeassistant.components.recorder.migration.table_is_partitioned",
+        return_value=True,
+    ), patch(
+        "homeassistant.components.recorder.migration.get_partition_end",
+        return_value=legacy_end,
+    ), patch(
+        "homeassistant.components.recorder.migration._create_day_partition",
+        side_effect=_create_day_partition,
+    ):
+        assert migration.partition_tables(instance) is True
+        assert "Could not create the partition of the states table" in caplog.text
+        assert "Could not create the partition of the events table" in caplog.text
+
+        days = [
+            today + datetime.timedelta(days=offset)
+            for offset in range(first_day, migration.PARTITION_DAYS_AHEAD + 1)
+        ]
+        assert created == [
+            (table, column, day)
+            for table, column in db_schema.PARTITIONED_TABLES.items()
+            for day in days[1:]
+        ]
+
+        created.clear()
+        fail = False
+        assert migration.partition_tables(instance) is True
+        assert created == [
+            (table, column, day)
+            for table, column in db_schema.PARTITIONED_TABLES.items()
+            for day in days
+        ]
+
+
 class MockPyODBCProgrammingError(Exception):
     """A mock pyodbc error."""
 
@@ -481,3 +555,132 @@ def test_raise_if_exception_missing_empty_cause_str():
 
     with pytest.raises(ProgrammingError):
         migration.raise_if_exception_missing_str(programming_exc, ["not present"])
+
+
+async def test_migrate_event_type_ids(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+) -> None:
+    """Test we can migrate event_types to the EventTypes table."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+
+    def _insert_events():
+        with session_scope(hass=hass) as session:
+            session.add_all(
+                (
+                    Events(
+                        event_type="event_type_one",
+                        origin_idx=0,
+                        time_fired_ts=1677721632.452529,
+                    ),
+                    Events(
+                        event_type="event_type_one",
+                        origin_idx=0,
+                        time_fired_ts=1677721632.552529,
+                    ),
+                    Events(
+                        event_type="event_type_two",
+                        origin_idx=0,
+                        time_fired_ts=1677721632.552529,
+                    ),
+                )
+            )
+
+    await instance.async_add_executor_job(_insert_events)
+    await async_wait_recording_done(hass)
+
+    instance.event_type_manager.active = False
+    instance.queue_task(EventTypeIDMigrationTask())
+    await async_recorder_block_till_done(hass)
+
+    def _fetch_migrated_events():
+        with session_scope(hass=hass) as session:
+            events = (
+                session.query(Events.event_type, EventTypes.event_type)
+                .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(Events.event_type.in_(["event_type_one", "event_type_two"]))
+                .all()
+            )
+            assert len(events) == 3
+            for legacy_event_type, event_type in events:
+                assert legacy_event_type == event_type
+            return {
+                event_type: event_type_id
+                for event_type_id, event_type in session.query(
+                    EventTypes.event_type_id, EventTypes.event_type
+                )
+            }
+
+    event_type_ids = await instance.async_add_executor_job(_fetch_migrated_events)
+    assert set(event_type_ids) >= {"event_type_one", "event_type_two"}
+    assert instance.event_type_manager.active is True
+
+    def _get_event_type_ids():
+        with session_scope(hass=hass) as session:
+            return instance.event_type_manager.get_many(
+                ("event_type_one", "event_type_two", "missing"), session
+            )
+
+    assert await instance.async_add_executor_job(_get_event_type_ids) == {
+        "event_type_one": event_type_ids["event_type_one"],
+        "event_type_two": event_type_ids["event_type_two"],
+        "missing": None,
+    }
+
+
+async def test_migrate_entity_ids(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+) -> None:
+    """Test we can migrate entity_ids to the StatesMeta table."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+
+    def _insert_states():
+        with session_scope(hass=hass) as session:
+            session.add_all(
+                (
+                    States(
+                        entity_id="sensor.one",
+                        state="one_1",
+                        last_updated_ts=1.452529,
+                    ),
+                    States(
+                        entity_id="sensor.two",
+                        state="two_2",
+                        last_updated_ts=2.252529,
+                    ),
+                    States(
+                        entity_id="sensor.two",
+                        state="two_1",
+                        last_updated_ts=3.152529,
+                    ),
+                )
+            )
+
+    await instance.async_add_executor_job(_insert_states)
+    await async_wait_recording_done(hass)
+
+    instance.states_meta_manager.active = False
+    instance.queue_task(EntityIDMigrationTask())
+    await async_recorder_block_till_done(hass)
+
+    def _fetch_migrated_states():
+        with session_scope(hass=hass) as session:
+            states = (
+                session.query(States.state, StatesMeta.entity_id)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .order_by(States.last_updated_ts)
+                .all()
+            )
+            assert (
+                session.query(States).filter(States.metadata_id.is_(None)).count() == 0
+            )
+            return states
+
+    states = await instance.async_add_executor_job(_fetch_migrated_states)
+    assert [tuple(row) for row in states] == [
+        ("one_1", "sensor.one"),
+        ("two_2", "sensor.two"),
+        ("two_1", "sensor.two"),
+    ]
+    assert instance.states_meta_manager.active is True
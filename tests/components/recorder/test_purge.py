@@ -2,20 +2,25 @@
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, SupportedDialect
+from homeassistant.components.recorder.const import (
+    EVENT_RECORDER_PURGE_PROGRESS,
+    MAX_ROWS_TO_PURGE,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.db_schema import (
     EventData,
     Events,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -24,7 +29,11 @@ from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
-from homeassistant.components.recorder.tasks import PurgeTask
+from homeassistant.components.recorder.tasks import (
+    EntityIDMigrationTask,
+    EventTypeIDMigrationTask,
+    PurgeTask,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
 from homeassistant.core import HomeAssistant
@@ -37,7 +46,7 @@ from .common import (
     async_wait_recording_done,
 )
 
-from tests.common import SetupRecorderInstanceT
+from tests.common import SetupRecorderInstanceT, async_capture_events
 
 
 @pytest.fixture(name="use_sqlite")
@@ -52,6 +61,14 @@ def mock_use_sqlite(request):
         yield
 
 
+async def _async_migrate_legacy_rows(hass: HomeAssistant) -> None:
+    """Migrate rows that were added with only an event_type or entity_id."""
+    instance = recorder.get_instance(hass)
+    instance.queue_task(EventTypeIDMigrationTask())
+    instance.queue_task(EntityIDMigrationTask())
+    await async_recorder_block_till_done(hass)
+
+
 async def test_purge_old_states(
     async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
 ):
@@ -754,6 +771,7 @@ async def test_purge_filtered_states(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    await _async_migrate_legacy_rows(hass)
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
@@ -872,6 +890,7 @@ async def test_purge_filtered_states_to_empty(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    await _async_migrate_legacy_rows(hass)
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
@@ -890,6 +909,8 @@ async def test_purge_filtered_states_to_empty(
         state_attributes = session.query(StateAttributes)
         assert states.count() == 0
         assert state_attributes.count() == 0
+        # The entity_id is no longer referenced by any state
+        assert session.query(StatesMeta).count() == 0
 
     # Do it again to make sure nothing changes
     # Why do we do this? Should we check the end result?
@@ -947,6 +968,7 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    await _async_migrate_legacy_rows(hass)
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
@@ -1010,6 +1032,7 @@ async def test_purge_filtered_events(
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
+    await _async_migrate_legacy_rows(hass)
 
     with session_scope(hass=hass) as session:
         events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
@@ -1127,6 +1150,7 @@ async def test_purge_filtered_events_state_changed(
 
     service_data = {"keep_days": 10, "apply_filter": True}
     _add_db_entries(hass)
+    await _async_migrate_legacy_rows(hass)
 
     with session_scope(hass=hass) as session:
         events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
@@ -1232,6 +1256,7 @@ async def test_purge_entities(
 
     _add_purge_records(hass)
     _add_keep_records(hass)
+    await _async_migrate_legacy_rows(hass)
 
     # Confirm standard service call
     with session_scope(hass=hass) as session:
@@ -1250,6 +1275,7 @@ async def test_purge_entities(
         assert states_sensor_kept.count() == 10
 
     _add_purge_records(hass)
+    await _async_migrate_legacy_rows(hass)
 
     # Confirm each parameter purges only the associated records
     with session_scope(hass=hass) as session:
@@ -1280,6 +1306,7 @@ async def test_purge_entities(
         assert states_sensor_kept.count() == 10
 
     _add_purge_records(hass)
+    await _async_migrate_legacy_rows(hass)
 
     # Confirm calling service without arguments matches all records (default filter behaviour)
     with session_scope(hass=hass) as session:
@@ -1589,6 +1616,110 @@ async def test_purge_many_old_events(
         assert event_datas.count() == 0
 
 
+async def test_bulk_purge_old_states(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test deleting old states and unused attributes with set-based deletes."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_BULK_PURGE: True}
+    )
+    progress_events = async_capture_events(hass, EVENT_RECORDER_PURGE_PROGRESS)
+
+    await _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        state_attributes = session.query(StateAttributes)
+        assert states.count() == 6
+        assert state_attributes.count() == 3
+
+        finished = purge_old_data(
+            instance, dt_util.utcnow() - timedelta(days=4), repack=False
+        )
+        assert finished
+        assert states.count() == 2
+        assert state_attributes.count() == 1
+        assert "test.recorder2" in instance._old_states
+
+        states_after_purge = session.query(States)
+        assert states_after_purge[1].old_state_id == states_after_purge[0].state_id
+        assert states_after_purge[0].old_state_id is None
+
+        finished = purge_old_data(instance, dt_util.utcnow(), repack=False)
+        assert finished
+        assert states.count() == 0
+        assert state_attributes.count() == 0
+        assert "test.recorder2" not in instance._old_states
+
+    await async_wait_recording_done(hass)
+    assert len(progress_events) == 2
+    assert progress_events[0].data == {
+        "states": 4,
+        "events": 0,
+        "state_attributes": 2,
+        "event_data": 0,
+        "rows_per_second": ANY,
+        "remaining": False,
+    }
+    assert progress_events[1].data["states"] == 2
+    assert progress_events[1].data["state_attributes"] == 1
+
+
+async def test_bulk_purge_old_events_in_batches(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test deleting old events and unused event data with set-based deletes."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_BULK_PURGE: True}
+    )
+
+    await _add_test_events(hass, MAX_ROWS_TO_PURGE)
+    await _add_events_with_event_data(hass)
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        event_datas = session.query(EventData).filter(
+            EventData.shared_data.like('%"EVENT_TEST%')
+        )
+        assert events.count() == MAX_ROWS_TO_PURGE * 6 + 6
+        assert event_datas.count() == 6
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        # The events added first are older than the events with event data
+        # that were added after them. Events with the same time as the last
+        # event of the batch are purged with the batch.
+        finished = purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=1,
+        )
+        assert not finished
+        assert events.count() == MAX_ROWS_TO_PURGE * 4 + 6
+        assert event_datas.count() == 6
+
+        finished = purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=1,
+        )
+        assert not finished
+        assert events.count() == MAX_ROWS_TO_PURGE * 2 + 4
+        assert event_datas.count() == 4
+
+        finished = purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=1,
+        )
+        assert finished
+        assert events.count() == MAX_ROWS_TO_PURGE * 2 + 2
+        assert event_datas.count() == 2
+
+
 async def test_purge_can_mix_legacy_and_new_format(
     async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
 ):
@@ -13,7 +13,12 @@ from sqlalchemy.orm import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder import history, statistics
 from homeassistant.components.recorder.const import SQLITE_URL_PREFIX
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDay,
+    StatisticsMonth,
+    StatisticsRuns,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import process_timestamp
 from homeassistant.components.recorder.statistics import (
     STATISTIC_UNIT_TO_UNIT_CONVERTER,
@@ -29,6 +34,10 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     list_statistic_ids,
 )
+from homeassistant.components.recorder.tasks import (
+    CompileMissingStatisticsTask,
+    StatisticsTask,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.sensor import UNIT_CONVERTERS
 from homeassistant.const import UnitOfTemperature
@@ -306,6 +315,135 @@ def test_compile_periodic_statistics_exception(
     }
 
 
+@pytest.mark.parametrize("reset_accumulator", [False, True])
+def test_compile_missing_statistics_hourly(hass_recorder, reset_accumulator):
+    """Test hourly statistics compiled when catching up match the 5-minute rows."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    setup_component(hass, "sensor", {})
+    zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=3
+    )
+
+    def get_fake_stats(_hass, start, _end):
+        if reset_accumulator and start == zero + timedelta(minutes=25):
+            # The hour is now compiled from the database instead
+            instance.statistics_accumulator.reset()
+        minutes = (start - zero).total_seconds() / 60
+        return statistics.PlatformCompiledStatistics(
+            [
+                {
+                    "meta": {
+                        "has_mean": True,
+                        "has_sum": True,
+                        "name": None,
+                        "source": "recorder",
+                        "statistic_id": "sensor.test1",
+                        "unit_of_measurement": "dogs",
+                    },
+                    "stat": {
+                        "start": start,
+                        "mean": minutes,
+                        "min": minutes - 1,
+                        "max": minutes + 1,
+                        "state": minutes * 2,
+                        "sum": minutes * 3,
+                    },
+                }
+            ],
+            get_metadata(_hass, statistic_ids=["sensor.test1"]),
+        )
+
+    with patch(
+        "homeassistant.components.sensor.recorder.compile_statistics",
+        side_effect=get_fake_stats,
+    ), patch.object(
+        statistics,
+        "_compile_hourly_statistics_summary_mean_stmt",
+        wraps=statistics._compile_hourly_statistics_summary_mean_stmt,
+    ) as summary_mean_stmt:
+        instance.queue_task(
+            CompileMissingStatisticsTask(zero, zero + timedelta(hours=1), False)
+        )
+        instance.queue_task(
+            CompileMissingStatisticsTask(
+                zero + timedelta(hours=1), zero + timedelta(hours=2), True
+            )
+        )
+        wait_recording_done(hass)
+
+    assert summary_mean_stmt.call_count == (1 if reset_accumulator else 0)
+    assert (
+        len(statistics_during_period(hass, zero, period="5minute")["sensor.test1"])
+        == 24
+    )
+    stats = statistics_during_period(hass, zero, period="hour")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": process_timestamp(zero),
+                "end": process_timestamp(zero + timedelta(hours=1)),
+                "mean": pytest.approx(27.5),
+                "min": pytest.approx(-1.0),
+                "max": pytest.approx(56.0),
+                "last_reset": None,
+                "state": pytest.approx(110.0),
+                "sum": pytest.approx(165.0),
+            },
+            {
+                "start": process_timestamp(zero + timedelta(hours=1)),
+                "end": process_timestamp(zero + timedelta(hours=2)),
+                "mean": pytest.approx(87.5),
+                "min": pytest.approx(59.0),
+                "max": pytest.approx(116.0),
+                "last_reset": None,
+                "state": pytest.approx(230.0),
+                "sum": pytest.approx(345.0),
+            },
+        ]
+    }
+
+
+def test_compile_missing_statistics_before_new_period(hass_recorder):
+    """Test missed periods are compiled before a new period queued meanwhile."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)
+    now = dt_util.utcnow()
+    last_period = now.replace(
+        minute=now.minute - now.minute % 5, second=0, microsecond=0
+    )
+    zero = last_period - timedelta(hours=2)
+    compiled_periods = []
+
+    def get_fake_stats(_hass, start, _end):
+        if not compiled_periods:
+            # The periodic statistics task of a new period is queued while
+            # the missed periods are compiled
+            instance.queue_task(StatisticsTask(last_period, False))
+        compiled_periods.append(start)
+        return statistics.PlatformCompiledStatistics([], {})
+
+    with session_scope(hass=hass) as session:
+        session.query(StatisticsRuns).delete()
+        session.add(StatisticsRuns(start=zero - timedelta(minutes=5)))
+
+    with patch(
+        "homeassistant.components.sensor.recorder.compile_statistics",
+        side_effect=get_fake_stats,
+    ):
+        with patch.object(dt_util, "utcnow", return_value=now), session_scope(
+            hass=hass
+        ) as session:
+            instance._schedule_compile_missing_statistics(session)
+        # The periodic statistics task may be queued after the first wait
+        wait_recording_done(hass)
+        wait_recording_done(hass)
+
+    assert compiled_periods == [zero + timedelta(minutes=5 * i) for i in range(25)]
+
+
 def test_rename_entity(hass_recorder):
     """Test statistics is migrated when entity_id is changed."""
     hass = hass_recorder()
@@ -1203,6 +1341,139 @@ def test_monthly_statistics(hass_recorder, caplog, timezone):
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+def _statistics_with_and_without_rollups(hass, start_time, end_time, period):
+    """Return statistics read with the rollup tables and from the hourly table."""
+    instance = recorder.get_instance(hass)
+    assert instance.statistics_rollups_active
+    with_rollups = statistics_during_period(hass, start_time, end_time, period=period)
+    instance.statistics_rollups_active = False
+    try:
+        without_rollups = statistics_during_period(
+            hass, start_time, end_time, period=period
+        )
+    finally:
+        instance.statistics_rollups_active = True
+    return with_rollups, without_rollups
+
+
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2021-08-01 00:00:00+00:00")
+def test_statistics_rollups(hass_recorder, timezone):
+    """Test statistics read from the rollup tables match the hourly statistics."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone(timezone))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    external_statistics = [
+        {
+            "start": period1 + timedelta(hours=hour),
+            "last_reset": None,
+            "max": hour % 7 + 1,
+            "mean": hour % 5,
+            "min": -(hour % 3),
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(24 * 75)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    start_time = dt_util.as_utc(dt_util.parse_datetime("2021-09-03 05:00:00"))
+    end_time = dt_util.as_utc(dt_util.parse_datetime("2021-11-10 17:00:00"))
+    for period in ("day", "week", "month"):
+        with_rollups, without_rollups = _statistics_with_and_without_rollups(
+            hass, start_time, end_time, period
+        )
+        assert with_rollups == without_rollups
+        assert with_rollups["test:total_energy_import"]
+
+    # Adjusting the sum updates the rollups
+    recorder.get_instance(hass).async_adjust_statistics(
+        "test:total_energy_import",
+        dt_util.as_utc(dt_util.parse_datetime("2021-10-15 12:00:00")),
+        100,
+        "kWh",
+    )
+    wait_recording_done(hass)
+    for period in ("day", "week", "month"):
+        with_rollups, without_rollups = _statistics_with_and_without_rollups(
+            hass, start_time, None, period
+        )
+        assert with_rollups == without_rollups
+
+    # Importing statistics updates the rollups
+    async_add_external_statistics(
+        hass,
+        external_metadata,
+        [{**external_statistics[24 * 40], "mean": 1000, "max": 1000}],
+    )
+    wait_recording_done(hass)
+    for period in ("day", "week", "month"):
+        with_rollups, without_rollups = _statistics_with_and_without_rollups(
+            hass, start_time, None, period
+        )
+        assert with_rollups == without_rollups
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+def test_statistics_rollups_rebuilt(hass_recorder):
+    """Test missing statistics rollups are rebuilt in the background."""
+    hass = hass_recorder()
+    wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.statistics_rollups_active
+
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    external_statistics = [
+        {"start": period1 + timedelta(hours=hour), "state": hour, "sum": hour}
+        for hour in range(24 * 3)
+    ]
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsDay).count() == 3
+        assert session.query(StatisticsMonth).count() == 1
+        session.query(StatisticsDay).delete()
+        session.query(StatisticsMonth).delete()
+
+    hass.add_job(instance.async_rebuild_statistics_rollups)
+    wait_recording_done(hass)
+    assert not instance.statistics_rollups_active
+    wait_recording_done(hass)
+    assert instance.statistics_rollups_active
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsDay).count() == 3
+        assert session.query(StatisticsMonth).count() == 1
+
+    with_rollups, without_rollups = _statistics_with_and_without_rollups(
+        hass, period1, None, "day"
+    )
+    assert with_rollups == without_rollups
+    assert len(with_rollups["test:total_energy_import"]) == 3
+
+
 def test_delete_duplicates_no_duplicates(hass_recorder, caplog):
     """Test removal of duplicated statistics."""
     hass = hass_recorder()
@@ -855,6 +855,34 @@ def test_is_second_sunday():
     assert is_second_sunday(datetime(2022, 1, 10, 0, 0, 0, tzinfo=dt_util.UTC)) is False
 
 
+def test_partition_name_and_day():
+    """Test the names of day partitions map to their UTC day."""
+    day = datetime(2022, 3, 9, 0, 0, 0, tzinfo=dt_util.UTC)
+    assert util.partition_name("states", day) == "states_p20220309"
+    assert util.partition_day("states", "states_p20220309") == day
+    assert util.partition_day("events", "states_p20220309") is None
+    assert util.partition_day("states", "states_legacy") is None
+    assert util.partition_day("states", "states_default") is None
+    assert util.partition_day("states", "states_pinvalid") is None
+
+
+@pytest.mark.parametrize(
+    ("bound", "end"),
+    [
+        ("FOR VALUES FROM (MINVALUE) TO ('1646870400')", 1646870400.0),
+        ("FOR VALUES FROM ('1646784000') TO ('1646870400.5')", 1646870400.5),
+        ("FOR VALUES FROM ('1646784000') TO (MAXVALUE)", None),
+        ("DEFAULT", None),
+        (None, None),
+    ],
+)
+def test_get_partition_end(bound, end):
+    """Test the upper bound of a range partition is read from its bound."""
+    session = Mock()
+    session.execute.return_value.scalar.return_value = bound
+    assert util.get_partition_end(session, "states_legacy") == end
+
+
 def test_build_mysqldb_conv():
     """Test building the MySQLdb connect conv param."""
     mock_converters = Mock(conversions={"original": "preserved"})
@@ -897,8 +925,9 @@ def test_execute_stmt_lambda_element(hass_recorder):
 
     with session_scope(hass=hass) as session:
         # No time window, we always get a list
+        metadata_id = instance.states_meta_manager.get("sensor.on", session)
         stmt = history._get_single_entity_states_stmt(
-            instance.schema_version, dt_util.utcnow(), "sensor.on", False
+            instance.schema_version, dt_util.utcnow(), "sensor.on", metadata_id, False
         )
         rows = util.execute_stmt_lambda_element(session, stmt)
         assert isinstance(rows, list)
@@ -0,0 +1,92 @@
+"""The tests for the incremental aggregates of the statistics sensor."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.aggregates import SampleAggregates
+from homeassistant.util import dt as dt_util
+
+VALUES_NUMERIC = [17, 20, 15.2, 5, 3.8, 9.2, 6.7, 14, 6, 20, -3, 6]
+
+
+def _assert_aggregates(
+    aggregates: SampleAggregates, values: list[float], ages: list[datetime]
+) -> None:
+    """Assert the aggregates match the characteristics computed from scratch."""
+    assert aggregates.count == len(values)
+    assert aggregates.sum == pytest.approx(sum(values))
+    assert aggregates.mean == pytest.approx(statistics.mean(values))
+    assert aggregates.median == statistics.median(values)
+    assert aggregates.max == (max(values), ages[values.index(max(values))])
+    assert aggregates.min == (min(values), ages[values.index(min(values))])
+    if len(values) < 2:
+        return
+    assert aggregates.variance == pytest.approx(statistics.variance(values))
+    assert aggregates.standard_deviation == pytest.approx(statistics.stdev(values))
+    percentiles = statistics.quantiles(values, n=100, method="exclusive")
+    for percentile in (1, 10, 50, 90, 99):
+        assert aggregates.percentile(percentile) == pytest.approx(
+            percentiles[percentile - 1]
+        )
+    pairs = list(zip(values, values[1:]))
+    seconds = [(j - i).total_seconds() for i, j in zip(ages, ages[1:])]
+    assert aggregates.sum_differences == pytest.approx(
+        sum(abs(j - i) for i, j in pairs)
+    )
+    assert aggregates.sum_differences_nonnegative == pytest.approx(
+        sum(j - i if j >= i else j for i, j in pairs)
+    )
+    assert aggregates.area_linear == pytest.approx(
+        sum(0.5 * (i + j) * dt for (i, j), dt in zip(pairs, seconds))
+    )
+    assert aggregates.area_step == pytest.approx(
+        sum(i * dt for (i, _), dt in zip(pairs, seconds))
+    )
+
+
+def test_sliding_window() -> None:
+    """Test the aggregates of a window of samples sliding over the values."""
+    aggregates = SampleAggregates()
+    start = dt_util.utcnow()
+    values: list[float] = []
+    ages: list[datetime] = []
+
+    for idx, value in enumerate(VALUES_NUMERIC):
+        age = start + timedelta(seconds=idx * idx)
+        aggregates.add(value, age, (values[-1], ages[-1]) if values else None)
+        values.append(value)
+        ages.append(age)
+        if len(values) > 5:
+            aggregates.remove(values.pop(0), ages.pop(0), (values[0], ages[0]))
+        _assert_aggregates(aggregates, values, ages)
+
+    while len(values) > 1:
+        aggregates.remove(values.pop(0), ages.pop(0), (values[0], ages[0]))
+        _assert_aggregates(aggregates, values, ages)
+
+    aggregates.remove(values.pop(0), ages.pop(0), None)
+    assert aggregates.count == 0
+    assert aggregates.sum == 0
+    assert aggregates.area_linear == 0
+
+
+def test_resum_after_window_turnover() -> None:
+    """Test the running sums are recomputed once the window turned over."""
+    aggregates = SampleAggregates()
+    start = dt_util.utcnow()
+    samples = [(1e16, start), (1.0, start + timedelta(seconds=1))]
+    aggregates.add(*samples[0], None)
+    aggregates.add(*samples[1], samples[0])
+    aggregates.remove(*samples[0], samples[1])
+    # Removing 1e16 from the sum lost the precision of the remaining sample
+    assert aggregates.sum != 1.0
+    assert aggregates.needs_resum
+
+    aggregates.resum(samples[1:])
+    assert not aggregates.needs_resum
+    _assert_aggregates(aggregates, [1.0], [samples[1][1]])
+    assert aggregates.sum == 1.0
+    assert aggregates.area_linear == 0.0
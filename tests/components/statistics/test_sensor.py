@@ -163,6 +163,52 @@ async def test_sensor_defaults_numeric(hass: HomeAssistant):
     assert new_state.attributes.get("source_value_valid") is False
 
 
+async def test_sensor_non_finite_values(hass: HomeAssistant):
+    """Test nan and inf source values are rejected like unparsable values."""
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": [
+                {
+                    "platform": "statistics",
+                    "name": "test",
+                    "entity_id": "sensor.test_monitored",
+                    "state_characteristic": "mean",
+                    "sampling_size": 3,
+                },
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    for value in ("1", "nan", "2", "inf", "-inf", "3"):
+        hass.states.async_set(
+            "sensor.test_monitored",
+            value,
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.test")
+        assert state is not None
+        assert state.attributes.get("source_value_valid") is (
+            value not in ("nan", "inf", "-inf")
+        )
+
+    assert state.state == "2.0"
+
+    for value in ("4", "5"):
+        hass.states.async_set(
+            "sensor.test_monitored",
+            value,
+            {ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS},
+        )
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert state.state == "4.0"
+
+
 async def test_sensor_defaults_binary(hass: HomeAssistant):
     """Test the general behavior of the sensor, with binary source sensor."""
     assert await async_setup_component(
@@ -2,11 +2,15 @@
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _cached_state_diff_message as lru_state_diff_cache,
     cached_event_message,
+    cached_state_diff_message,
+    entities_added_message_json,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import callback
+from homeassistant.helpers.json import json_loads
 
 
 async def test_cached_event_message(hass):
@@ -78,6 +82,82 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_diff_message(hass):
+    """Test state diff messages are cached and reuse the state JSON."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"color": "red"})
+    hass.states.async_set("light.window", "off", {"color": "red"})
+    await hass.async_block_till_done()
+
+    lru_state_diff_cache.cache_clear()
+    state = hass.states.get("light.window")
+    added_state = events[0].data["new_state"]
+
+    assert json_loads(cached_state_diff_message(2, events[0])) == {
+        "id": 2,
+        "type": "event",
+        "event": {"a": {"light.window": added_state.as_compressed_state()}},
+    }
+    assert json_loads(cached_state_diff_message(3, events[1])) == {
+        "id": 3,
+        "type": "event",
+        "event": {
+            "c": {
+                "light.window": {
+                    "+": {
+                        "s": "off",
+                        "lc": state.last_changed.timestamp(),
+                        "c": state.context.id,
+                    }
+                }
+            }
+        },
+    }
+
+    # A burst of events is serialized only once for all connections
+    for _ in range(200):
+        hass.states.async_set("light.window", "on", {"color": "red"}, True)
+    await hass.async_block_till_done()
+    for iden in (4, 5):
+        for event in events[2:]:
+            cached_state_diff_message(iden, event)
+    cache_info = lru_state_diff_cache.cache_info()
+    assert cache_info.misses == 202
+    assert cache_info.hits == 200
+
+
+async def test_entities_added_message_json(hass):
+    """Test building an entities added message from state JSON fragments."""
+    hass.states.async_set("light.window", "on", {"color": "red"})
+    hass.states.async_set("light.door", "off")
+    states = hass.states.async_all()
+
+    assert json_loads(
+        entities_added_message_json(
+            5, [state.as_compressed_state_json() for state in states]
+        )
+    ) == {
+        "id": 5,
+        "type": "event",
+        "event": {
+            "a": {state.entity_id: state.as_compressed_state() for state in states}
+        },
+    }
+    assert json_loads(entities_added_message_json(5, [])) == {
+        "id": 5,
+        "type": "event",
+        "event": {"a": {}},
+    }
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
@@ -648,6 +648,43 @@ async def test_deleted_device_removing_config_entries(hass, registry, update_eve
     assert entry3.id != entry4.id
 
 
+async def test_entries_for_area_and_config_entry(registry):
+    """Test the devices are indexed by area and config entry."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "0123")},
+        manufacturer="manufacturer",
+        model="model",
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="456",
+        identifiers={("bridgeid", "4567")},
+        manufacturer="manufacturer",
+        model="model",
+    )
+
+    entry = registry.async_update_device(entry.id, area_id="12345A")
+    entry2 = registry.async_update_device(
+        entry2.id, area_id="12345A", add_config_entry_id="123"
+    )
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry, entry2]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [
+        entry,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry2]
+
+    entry = registry.async_update_device(entry.id, area_id="67890B")
+    entry2 = registry.async_update_device(entry2.id, remove_config_entry_id="123")
+    assert device_registry.async_entries_for_area(registry, "12345A") == [entry2]
+    assert device_registry.async_entries_for_area(registry, "67890B") == [entry]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [entry]
+
+    registry.async_remove_device(entry.id)
+    assert device_registry.async_entries_for_area(registry, "67890B") == []
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+
+
 async def test_removing_area_id(registry):
     """Make sure we can clear area id."""
     entry = registry.async_get_or_create(
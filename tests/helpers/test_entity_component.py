@@ -361,9 +361,12 @@ async def test_unload_entry_resets_platform(hass):
     await hass.async_block_till_done()
 
     assert len(hass.states.async_entity_ids()) == 1
+    entity_id = hass.states.async_entity_ids()[0]
+    assert component.get_entity(entity_id) is not None
 
     assert await component.async_unload_entry(entry)
     assert len(hass.states.async_entity_ids()) == 0
+    assert component.get_entity(entity_id) is None
 
 
 async def test_unload_entry_fails_if_never_loaded(hass):
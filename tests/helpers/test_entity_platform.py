@@ -2,6 +2,8 @@
 import asyncio
 from datetime import timedelta
 import logging
+import threading
+import time
 from unittest.mock import ANY, Mock, patch
 
 import pytest
@@ -109,6 +111,151 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_sync_updates_share_executor_limit(hass):
+    """Test polled sync updates share a limit of executor jobs.
+
+    Each platform updates one entity outside of the shared limit.
+    """
+    running = 0
+    max_running = 0
+    updated = 0
+    lock = threading.Lock()
+
+    def update():
+        """Mock a slow sync update."""
+        nonlocal running, max_running, updated
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+            updated += 1
+
+    with patch(
+        "homeassistant.helpers.entity_platform.MAX_PARALLEL_POLLING_EXECUTOR_JOBS", 1
+    ):
+        for idx in range(2):
+            platform = MockEntityPlatform(hass, platform_name=f"platform_{idx}")
+            entities = [MockEntity(should_poll=True) for _ in range(3)]
+            for entity in entities:
+                entity.update = update
+            await platform.async_add_entities(entities)
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+        await hass.async_block_till_done()
+
+    assert updated == 6
+    assert max_running <= 3
+
+
+async def test_polling_sync_updates_not_starved_by_hung_platform(hass):
+    """Test hung sync updates of a platform do not block other platforms."""
+    release = threading.Event()
+    hung = 0
+    lock = threading.Lock()
+
+    def hung_update():
+        """Mock a sync update which hangs until released."""
+        nonlocal hung
+        with lock:
+            hung += 1
+        release.wait(10)
+
+    hung_platform = MockEntityPlatform(hass, platform_name="hung_platform")
+    hung_entities = [MockEntity(should_poll=True) for _ in range(10)]
+    for entity in hung_entities:
+        entity.update = hung_update
+    await hung_platform.async_add_entities(hung_entities)
+
+    updated = []
+    platform = MockEntityPlatform(hass, platform_name="platform")
+    entity = MockEntity(should_poll=True)
+    entity.update = lambda: updated.append(True)
+    await platform.async_add_entities([entity])
+
+    with patch(
+        "homeassistant.helpers.entity_platform.MAX_PARALLEL_POLLING_EXECUTOR_JOBS", 2
+    ), patch(
+        "homeassistant.helpers.entity_platform.POLLING_WORKERS_SPREAD", 0
+    ), patch.object(
+        hung_platform, "_parallel_updates_limit", None
+    ):
+        hung_task = hass.async_create_task(
+            hung_platform._async_update_sync_entities(hung_entities)
+        )
+        # The hung platform takes its own worker and all shared slots
+        for _ in range(100):
+            if hung == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert hung == 3
+
+        await asyncio.wait_for(platform._async_update_sync_entities([entity]), 5)
+        assert updated == [True]
+
+        release.set()
+        await hung_task
+
+
+async def test_polling_sync_updates_spread_over_interval(hass):
+    """Test the sync updates of a polling tick do not all start at once."""
+    started = []
+    lock = threading.Lock()
+
+    def update():
+        """Mock a slow sync update."""
+        with lock:
+            started.append(time.monotonic())
+        time.sleep(0.5)
+
+    platform = MockEntityPlatform(hass, scan_interval=timedelta(seconds=0.4))
+    entities = [MockEntity(should_poll=True) for _ in range(4)]
+    for entity in entities:
+        entity.update = update
+    await platform.async_add_entities(entities)
+
+    start = time.monotonic()
+    await platform._async_update_sync_entities(entities)
+    duration = time.monotonic() - start
+
+    # The workers are started over half of the polling interval
+    assert len(started) == 4
+    started.sort()
+    assert all(later - earlier >= 0.04 for earlier, later in zip(started, started[1:]))
+    assert started[-1] - started[0] < 0.5
+    # The updates still run in parallel
+    assert duration < 1
+
+
+async def test_polling_interval_adapts_to_update_duration(hass):
+    """Test the polling interval is stretched while polling takes long."""
+    entity_platform = MockEntityPlatform(hass, scan_interval=timedelta(seconds=20))
+    poll_ent = MockEntity(should_poll=True)
+    poll_ent.async_update = Mock()
+    await entity_platform.async_add_entities([poll_ent])
+
+    entity_platform._async_polling_done(45)
+    assert entity_platform.polling_duration_histogram[60.0] == 1
+
+    poll_ent.async_update.reset_mock()
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert not poll_ent.async_update.called
+
+    async_fire_time_changed(hass, now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert poll_ent.async_update.called
+    assert entity_platform.polling_duration_histogram[0.1] == 1
+
+    # The scan interval is used again once polling is fast
+    poll_ent.async_update.reset_mock()
+    async_fire_time_changed(hass, now + timedelta(seconds=80))
+    await hass.async_block_till_done()
+    assert poll_ent.async_update.called
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
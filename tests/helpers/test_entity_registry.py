@@ -1,6 +1,7 @@
 """Tests for the Entity Registry."""
 from unittest.mock import patch
 
+import attr
 import pytest
 import voluptuous as vol
 
@@ -1318,6 +1319,54 @@ def test_entity_registry_items():
     assert entities.get_entry(entry2.id) is None
 
 
+def test_entity_registry_items_secondary_indexes():
+    """Test the EntityRegistryItems indexes by config entry, device and area."""
+    entities = er.EntityRegistryItems()
+    entry1 = er.RegistryEntry(
+        "test.entity1",
+        "1234",
+        "hue",
+        area_id="area",
+        config_entry_id="config_entry",
+        device_id="device",
+    )
+    entry2 = er.RegistryEntry(
+        "test.entity2",
+        "2345",
+        "hue",
+        config_entry_id="config_entry",
+        device_id="device",
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    entities["test.entity1"] = entry1
+    entities["test.entity2"] = entry2
+
+    assert entities.get_entries_for_config_entry_id("config_entry") == [
+        entry1,
+        entry2,
+    ]
+    assert entities.get_entries_for_device_id("device") == [entry1]
+    assert entities.get_entries_for_device_id(
+        "device", include_disabled_entities=True
+    ) == [entry1, entry2]
+    assert entities.get_entries_for_area_id("area") == [entry1]
+
+    entry1 = entities["test.entity1"] = attr.evolve(
+        entry1, area_id="other_area", device_id=None
+    )
+    assert entities.get_entries_for_area_id("area") == []
+    assert entities.get_entries_for_area_id("other_area") == [entry1]
+    assert entities.get_entries_for_device_id(
+        "device", include_disabled_entities=True
+    ) == [entry2]
+
+    del entities["test.entity1"]
+    del entities["test.entity2"]
+    assert entities.get_entries_for_config_entry_id("config_entry") == []
+    assert entities.get_entries_for_device_id("device") == []
+    assert entities.get_entries_for_area_id("other_area") == []
+
+
 async def test_disabled_by_str_not_allowed(hass):
     """Test we need to pass disabled by type."""
     reg = er.async_get(hass)
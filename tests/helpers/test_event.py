@@ -14,7 +14,7 @@ import jinja2
 import pytest
 
 from homeassistant.components import sun
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
@@ -2126,6 +2126,58 @@ async def test_track_template_result_iterator(hass):
     assert filter_runs == ["", "sensor.new"]
 
 
+async def test_track_template_result_batched_rerender(hass):
+    """Test templates depending on the same entity re-render in one batch."""
+    listeners_before = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    refreshes = []
+
+    @callback
+    def refresh_listener(event, updates):
+        refreshes.append(updates.pop().result)
+
+    infos = [
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template("{{ states('sensor.test') }}", hass), None)],
+            refresh_listener,
+        )
+        for _ in range(200)
+    ]
+    info_all = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states | count }}", hass), None)],
+        refresh_listener,
+    )
+    await hass.async_block_till_done()
+
+    # All trackers share a single state_changed listener
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners_before + 1
+
+    hass.states.async_set("sensor.test", "5")
+    # All trackers are re-rendered in the same loop iteration
+    await asyncio.sleep(0)
+    assert sorted(refreshes) == [1] + [5] * 200
+
+    hass.states.async_set("sensor.other", "1")
+    await hass.async_block_till_done()
+    assert refreshes[201:] == [2]
+
+    stats = infos[0].render_stats[Template("{{ states('sensor.test') }}", hass)]
+    assert stats.renders == 2
+    assert stats.total_time >= stats.max_time >= stats.last_time > 0
+    assert stats.average_time == stats.total_time / 2
+    assert info_all.render_stats[Template("{{ states | count }}", hass)].renders == 3
+
+    for info in infos:
+        info.async_remove()
+    info_all.async_remove()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners_before
+
+    hass.states.async_set("sensor.test", "6")
+    await hass.async_block_till_done()
+    assert len(refreshes) == 202
+
+
 async def test_track_template_result_errors(hass, caplog):
     """Test tracking template with errors in the template."""
     template_syntax_error = Template("{{states.switch", hass)
@@ -4137,6 +4189,86 @@ async def test_async_call_later_cancel(hass):
             assert await future, "callback not canceled"
 
 
+async def test_async_call_later_coarse(hass):
+    """Test coarse timers are run together from the timer wheel."""
+    calls = []
+
+    def loop_timers():
+        return sum(not handle.cancelled() for handle in hass.loop._scheduled)
+
+    timers_before = loop_timers()
+
+    @callback
+    def action(now: datetime):
+        calls.append(now)
+
+    job = ha.HassJob(action)
+    now = dt_util.utcnow()
+    async_call_later(hass, 5, action, coarse=True)
+    async_call_later(hass, 5, job, coarse=True, coalesce=True)
+    async_call_later(hass, 5, job, coarse=True, coalesce=True)
+    remove = async_call_later(hass, 5, action, coarse=True)
+    async_call_later(hass, 10, action, coarse=True)
+    point = now + timedelta(seconds=7)
+    async_track_point_in_utc_time(hass, action, point, coarse=True)
+    remove_interval = async_track_time_interval(
+        hass, action, timedelta(seconds=30), coarse=True
+    )
+
+    # All timers share a single loop timer
+    assert loop_timers() == timers_before + 1
+    remove()
+
+    # Coarse timers never fire early
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=4.9))
+    await hass.async_block_till_done()
+    assert calls == []
+
+    fire_time = now + timedelta(seconds=6)
+    async_fire_time_changed_exact(hass, fire_time)
+    await hass.async_block_till_done()
+    assert calls == [fire_time, fire_time]
+
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=9))
+    await hass.async_block_till_done()
+    assert calls[2:] == [point]
+
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert len(calls) == 5
+
+    remove_interval()
+    assert loop_timers() == timers_before
+    async_fire_time_changed(hass, now + timedelta(seconds=62))
+    await hass.async_block_till_done()
+    assert len(calls) == 5
+
+
+async def test_async_call_later_coarse_coalesce_callable(hass):
+    """Test coarse timers of the same callable are coalesced per second."""
+    calls = []
+
+    @callback
+    def action(now: datetime):
+        calls.append(now)
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.helpers.event.time.time", return_value=now.timestamp()):
+        async_call_later(hass, 5, action, coarse=True, coalesce=True)
+        async_call_later(hass, 5, action, coarse=True, coalesce=True)
+        async_call_later(hass, 5, action, coarse=True)
+        async_call_later(hass, 6, action, coarse=True, coalesce=True)
+
+    fire_time = now + timedelta(seconds=7)
+    async_fire_time_changed_exact(hass, fire_time)
+    await hass.async_block_till_done()
+    assert calls == [fire_time, fire_time, fire_time]
+
+
 async def test_track_state_change_event_chain_multple_entity(hass):
     """Test that adding a new state tracker inside a tracker does not fire right away."""
     tracker_called = []
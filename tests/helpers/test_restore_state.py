@@ -8,7 +8,9 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE_TASK,
+    STATE_COMPACTION_INTERVAL,
     STORAGE_KEY,
+    STORAGE_KEY_CHANGES,
     RestoreEntity,
     RestoreStateData,
     StoredState,
@@ -278,6 +280,107 @@ async def test_dump_data(hass):
     assert written_states[1]["state"]["state"] == "off"
 
 
+async def test_dump_changed_states(hass):
+    """Test that only the changed states are dumped between full dumps."""
+    states = [State(f"input_boolean.b{idx}", "on") for idx in range(12)]
+    for state in states:
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = state.entity_id
+        await entity.async_internal_added_to_hass()
+
+    data = await RestoreStateData.async_get_instance(hass)
+
+    with patch.object(data.store, "async_save") as mock_write_data, patch.object(
+        data.changes_store, "async_save"
+    ) as mock_write_changes, patch.object(
+        hass.states, "async_all", return_value=states
+    ):
+        await data.async_dump_states()
+
+    # The first dump saves all states
+    assert len(mock_write_data.mock_calls[0][1][0]) == 12
+    assert mock_write_changes.mock_calls[0][1][0] == {"states": [], "removed": {}}
+
+    states[1] = State("input_boolean.b1", "off")
+    data.async_restore_entity_removed("input_boolean.b2", None)
+    states.pop(2)
+
+    with patch.object(data.store, "async_save") as mock_write_data, patch.object(
+        data.changes_store, "async_save"
+    ) as mock_write_changes, patch.object(
+        hass.states, "async_all", return_value=states
+    ):
+        await data.async_dump_states()
+
+    assert not mock_write_data.called
+    changes = mock_write_changes.mock_calls[0][1][0]
+    assert len(changes["states"]) == 1
+    assert changes["states"][0]["state"]["entity_id"] == "input_boolean.b1"
+    assert changes["states"][0]["state"]["state"] == "off"
+    assert list(changes["removed"]) == ["input_boolean.b2"]
+
+    # Unchanged states are dumped in full once the full dump is too old
+    with patch.object(data.store, "async_save") as mock_write_data, patch.object(
+        data.changes_store, "async_save"
+    ) as mock_write_changes, patch.object(
+        hass.states, "async_all", return_value=states
+    ), patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=dt_util.utcnow() + STATE_COMPACTION_INTERVAL,
+    ):
+        await data.async_dump_states()
+
+    written_states = mock_write_data.mock_calls[0][1][0]
+    assert len(written_states) == 11
+    assert written_states[1]["state"]["state"] == "off"
+    assert mock_write_changes.mock_calls[0][1][0] == {"states": [], "removed": {}}
+
+
+async def test_load_changed_states(hass, hass_storage):
+    """Test that the dumped changes are applied to the full dump on load."""
+    now = dt_util.utcnow()
+    before = now - timedelta(minutes=15)
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            StoredState(State(f"input_boolean.b{idx}", "on"), None, before).as_dict()
+            for idx in range(4)
+        ],
+    }
+    hass_storage[STORAGE_KEY_CHANGES] = {
+        "version": 1,
+        "key": STORAGE_KEY_CHANGES,
+        "data": {
+            "states": [
+                StoredState(State("input_boolean.b0", "off"), None, now).as_dict(),
+                # Changes older than the full dump are ignored
+                StoredState(
+                    State("input_boolean.b1", "off"), None, before - timedelta(days=1)
+                ).as_dict(),
+                StoredState(State("input_boolean.b4", "off"), None, now).as_dict(),
+            ],
+            "removed": {
+                "input_boolean.b2": now.isoformat(),
+                "input_boolean.b3": (before - timedelta(days=1)).isoformat(),
+            },
+        },
+    }
+
+    data = await RestoreStateData.async_get_instance(hass)
+
+    assert {
+        entity_id: stored_state.state.state
+        for entity_id, stored_state in data.last_states.items()
+    } == {
+        "input_boolean.b0": "off",
+        "input_boolean.b1": "on",
+        "input_boolean.b3": "on",
+        "input_boolean.b4": "off",
+    }
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
@@ -783,6 +783,60 @@ async def test_call_no_context_target_specific(
     assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.kitchen"
 
 
+async def test_call_target_specific_entities_by_entity_id(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check we can target specified entities of entities indexed by entity_id."""
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.kitchen", "light.non-existing"]},
+        ),
+    )
+
+    assert len(mock_handle_entity_call.mock_calls) == 1
+    assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.kitchen"
+
+    mock_handle_entity_call.reset_mock()
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        Mock(),
+        ha.ServiceCall("test_domain", "test_service", {"entity_id": "all"}),
+    )
+
+    assert [call[1][1] for call in mock_handle_entity_call.mock_calls] == list(
+        mock_entities.values()
+    )
+
+
+async def test_call_target_specific_entities_in_order(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check targeted entities are called in the order of their entity_id."""
+    call = ha.ServiceCall(
+        "test_domain",
+        "test_service",
+        {"entity_id": ["light.living_room", "light.kitchen", "light.bedroom"]},
+    )
+    expected = [
+        mock_entities["light.bedroom"],
+        mock_entities["light.kitchen"],
+        mock_entities["light.living_room"],
+    ]
+
+    for platforms in (mock_entities, [Mock(entities=mock_entities)]):
+        mock_handle_entity_call.reset_mock()
+        await service.entity_service_call(hass, platforms, Mock(), call)
+        assert [
+            mock_call[1][1] for mock_call in mock_handle_entity_call.mock_calls
+        ] == expected
+
+
 async def test_call_with_match_all(
     hass, mock_handle_entity_call, mock_entities, caplog
 ):
@@ -38,6 +38,7 @@ from homeassistant.util.unit_system import UnitSystem
 
 from tests.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     mock_area_registry,
     mock_device_registry,
     mock_registry,
@@ -3744,9 +3745,49 @@ async def test_cache_garbage_collection() -> None:
     del tpl
     assert template._NO_HASS_ENV.template_cache.get(template_string)
     del tpl2
+    # The most recently used templates are kept alive
+    assert template._NO_HASS_ENV.template_cache.get(template_string)
+    template._NO_HASS_ENV._recent_templates.clear()
     assert not template._NO_HASS_ENV.template_cache.get(template_string)
 
 
+async def test_bytecode_cache(hass: HomeAssistant, hass_storage) -> None:
+    """Test compiled templates are persisted in the bytecode cache."""
+    await template.async_load_bytecode_cache(hass)
+    bytecode_cache = hass.data[template._BYTECODE_CACHE]
+
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.hits == 0
+    assert bytecode_cache.misses == 1
+
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=template.BYTECODE_CACHE_SAVE_DELAY),
+    )
+    await hass.async_block_till_done()
+    stored = hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]
+    assert len(stored["templates"]) == 1
+
+    # Simulate a restart
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_bytecode_cache(hass)
+    bytecode_cache = hass.data[template._BYTECODE_CACHE]
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.hits == 1
+    assert bytecode_cache.misses == 0
+
+    # Code compiled by another version is not used
+    stored["version"] = "2000.1.0"
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_bytecode_cache(hass)
+    bytecode_cache = hass.data[template._BYTECODE_CACHE]
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.hits == 0
+    assert bytecode_cache.misses == 1
+
+
 def test_is_template_string() -> None:
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
@@ -216,7 +216,8 @@ async def test_update_interval(hass, crd):
     await hass.async_block_till_done()
     assert crd.data == 1
 
-    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    # The next refresh is an update interval after the previous one
+    async_fire_time_changed(hass, utcnow() + 2 * crd.update_interval)
     await hass.async_block_till_done()
     assert crd.data == 2
 
@@ -431,3 +432,179 @@ async def test_async_set_update_error(crd, caplog):
     assert crd.last_update_success is False
     assert "Client Failure #2" not in caplog.text
     update_callback.assert_called_once()
+
+
+async def test_always_update_false(hass):
+    """Test listeners are only updated when the data changes."""
+    update_method = AsyncMock(return_value=1)
+    crd = update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name="test",
+        update_method=update_method,
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        always_update=False,
+    )
+    update_callback = Mock()
+    crd.async_add_listener(update_callback)
+
+    await crd.async_refresh()
+    update_callback.assert_called_once()
+    update_callback.reset_mock()
+
+    await crd.async_refresh()
+    update_callback.assert_not_called()
+
+    update_method.side_effect = update_coordinator.UpdateFailed
+    await crd.async_refresh()
+    update_callback.assert_called_once()
+    update_callback.reset_mock()
+
+    await crd.async_refresh()
+    update_callback.assert_not_called()
+
+    update_method.side_effect = None
+    update_method.return_value = 2
+    await crd.async_refresh()
+    update_callback.assert_called_once()
+    assert crd.data == 2
+
+    statistics = crd.refresh_statistics
+    assert statistics.refreshes == 5
+    assert statistics.failures == 2
+    assert statistics.unchanged == 2
+    assert statistics.unchanged_ratio == 0.4
+    assert statistics.last_duration is not None
+    assert statistics.total_duration >= statistics.last_duration
+
+
+async def test_refresh_statistics(crd):
+    """Test the refreshes of a coordinator are counted."""
+    assert crd.refresh_statistics.unchanged_ratio is None
+    await crd.async_refresh()
+    await crd.async_refresh()
+
+    statistics = crd.refresh_statistics
+    assert statistics.refreshes == 2
+    assert statistics.failures == 0
+    assert statistics.unchanged == 0
+    assert statistics.unchanged_ratio == 0
+
+
+async def test_refreshes_share_timer(hass):
+    """Test the refreshes due at the same time share a timer."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2._refresh_phase_hash = crd._refresh_phase_hash
+
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow", return_value=utcnow()
+    ), patch(
+        "homeassistant.helpers.event.async_track_point_in_utc_time",
+        wraps=update_coordinator.event.async_track_point_in_utc_time,
+    ) as mock_track:
+        unsub = crd.async_add_listener(Mock())
+        unsub2 = crd2.async_add_listener(Mock())
+    assert mock_track.call_count == 1
+
+    async_fire_time_changed(hass, utcnow() + crd.update_interval)
+    await hass.async_block_till_done()
+    assert crd.data == 1
+    assert crd2.data == 1
+
+    # The timer is kept until the last refresh due at that time is cancelled
+    unsub()
+    async_fire_time_changed(hass, utcnow() + 2 * crd.update_interval)
+    await hass.async_block_till_done()
+    assert crd.data == 1
+    assert crd2.data == 2
+
+    unsub2()
+    assert not hass.data[update_coordinator.DATA_REFRESH_SCHEDULER]._ticks
+
+
+async def test_refreshes_spread_over_update_interval(hass):
+    """Test the refreshes of coordinators started together are spread out."""
+    now = utcnow()
+    # The coordinators have the same name and config entry
+    coordinators = [get_crd(hass, DEFAULT_UPDATE_INTERVAL) for _ in range(20)]
+    next_refreshes = set()
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        for crd in coordinators:
+            next_refresh = update_coordinator._next_refresh(
+                crd._refresh_phase_hash, crd.update_interval
+            )
+            assert now < next_refresh <= now + crd.update_interval
+            next_refreshes.add(next_refresh)
+
+    assert len(next_refreshes) > 10
+    assert max(next_refreshes) - min(next_refreshes) > timedelta(seconds=5)
+
+    # The refreshes of a phase are update_interval apart
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow", return_value=next_refresh
+    ):
+        assert (
+            update_coordinator._next_refresh(
+                crd._refresh_phase_hash, crd.update_interval
+            )
+            == next_refresh + crd.update_interval
+        )
+
+
+async def test_manual_refresh_before_tick(hass):
+    """Test a manual refresh just before a tick pushes back the next refresh."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.async_add_listener(Mock())
+    scheduler = hass.data[update_coordinator.DATA_REFRESH_SCHEDULER]
+    (tick,) = scheduler._ticks
+
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow",
+        return_value=tick - timedelta(milliseconds=10),
+    ):
+        await crd.async_refresh()
+    assert crd.data == 1
+    assert list(scheduler._ticks) == [tick + crd.update_interval]
+
+    async_fire_time_changed(hass, tick)
+    await hass.async_block_till_done()
+    assert crd.data == 1
+
+    # A scheduled refresh keeps the next one on its tick
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow",
+        return_value=tick + crd.update_interval + timedelta(milliseconds=500),
+    ):
+        async_fire_time_changed(hass, tick + crd.update_interval)
+        await hass.async_block_till_done()
+    assert crd.data == 2
+    assert list(scheduler._ticks) == [tick + 2 * crd.update_interval]
+
+
+async def test_first_refresh_delays_scheduled_refresh(hass):
+    """Test the scheduled refresh is not right after the first refresh."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    now = utcnow()
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        await crd.async_config_entry_first_refresh()
+        crd.async_add_listener(Mock())
+
+    (tick,) = hass.data[update_coordinator.DATA_REFRESH_SCHEDULER]._ticks
+    assert (
+        now + crd.update_interval - update_coordinator.REFRESH_PHASE_WIDTH
+        <= tick
+        < now + 2 * crd.update_interval
+    )
+
+
+async def test_refresh_phase_stable_across_restarts(hass):
+    """Test the refresh phase only depends on the creation order."""
+    phases = [get_crd(hass, DEFAULT_UPDATE_INTERVAL)._refresh_phase_hash]
+    phases.append(get_crd(hass, DEFAULT_UPDATE_INTERVAL)._refresh_phase_hash)
+    assert phases[0] != phases[1]
+
+    del hass.data[update_coordinator.DATA_REFRESH_SCHEDULER]
+    assert [
+        get_crd(hass, DEFAULT_UPDATE_INTERVAL)._refresh_phase_hash for _ in phases
+    ] == phases
@@ -34,6 +34,7 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.core import State
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
@@ -451,6 +452,24 @@ def test_state_as_compressed_state_unique_last_updated():
     assert state.as_compressed_state() is as_compressed_state
 
 
+def test_state_as_compressed_state_json():
+    """Test a State as a compressed state JSON fragment."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        context=ha.Context(id="01H0D6K3RFJAYAV2093ZW30PCW"),
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    expected = b'"happy.happy":{"s":"on","a":{"pig":"dog"},"c":"01H0D6K3RFJAYAV2093ZW30PCW","lc":471355200.0}'
+    as_compressed_state_json = state.as_compressed_state_json()
+    assert as_compressed_state_json == expected
+    # 2nd time to verify cache
+    assert state.as_compressed_state_json() is as_compressed_state_json
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -499,6 +518,179 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test we can listen to events with a matching event data key."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen(
+        "test", listener, match_key=("entity_id", "light.kitchen")
+    )
+    unsub_other = hass.bus.async_listen(
+        "test", listener, match_key=("entity_id", "light.bedroom")
+    )
+    assert hass.bus.async_listeners()["test"] == 2
+
+    hass.bus.async_fire("test", {"entity_id": "light.living_room"})
+    hass.bus.async_fire("test", {"other": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data == {"entity_id": "light.kitchen"}
+
+    unsub()
+    assert hass.bus.async_listeners()["test"] == 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bedroom"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+    assert calls[1].data == {"entity_id": "light.bedroom"}
+
+    unsub_other()
+    assert "test" not in hass.bus.async_listeners()
+
+    # Should do nothing now
+    unsub()
+
+
+async def test_eventbus_keyed_listener_with_filter(hass):
+    """Test keyed listeners are combined with filters and other listeners."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("keyed", event.data))
+
+    @ha.callback
+    def plain_listener(event):
+        """Mock listener."""
+        calls.append(("plain", event.data))
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data["filtered"]
+
+    hass.bus.async_listen(
+        "test",
+        listener,
+        event_filter=filter,
+        run_immediately=True,
+        match_key=("entity_id", "light.kitchen"),
+    )
+    hass.bus.async_listen("test", plain_listener, run_immediately=True)
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": True})
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": False})
+
+    assert calls == [
+        ("plain", {"entity_id": "light.kitchen", "filtered": True}),
+        ("plain", {"entity_id": "light.kitchen", "filtered": False}),
+        ("keyed", {"entity_id": "light.kitchen", "filtered": False}),
+    ]
+
+
+async def test_eventbus_keyed_listener_unsubscribe_while_firing(hass):
+    """Test a keyed listener can unsubscribe itself while the event fires."""
+    calls = []
+    unsubs = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+        unsubs.pop(0)()
+
+    for _ in range(2):
+        unsubs.append(
+            hass.bus.async_listen(
+                "test",
+                listener,
+                run_immediately=True,
+                match_key=("entity_id", "light.kitchen"),
+            )
+        )
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+
+    assert len(calls) == 2
+    assert "test" not in hass.bus.async_listeners()
+
+
+async def test_eventbus_keyed_listener_subscribe_while_firing(hass):
+    """Test keyed listeners of other data keys can change while the event fires."""
+    calls = []
+    unsubs = []
+
+    @ha.callback
+    def other_listener(event):
+        """Mock listener."""
+        calls.append(("other", event.data))
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("keyed", event.data))
+        unsubs.pop(0)()
+        unsubs.append(
+            hass.bus.async_listen(
+                "test",
+                other_listener,
+                run_immediately=True,
+                match_key=("device_id", "abc"),
+            )
+        )
+
+    unsubs.append(
+        hass.bus.async_listen(
+            "test",
+            listener,
+            run_immediately=True,
+            match_key=("entity_id", "light.kitchen"),
+        )
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "device_id": "abc"})
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "device_id": "abc"})
+
+    assert calls == [
+        ("keyed", {"entity_id": "light.kitchen", "device_id": "abc"}),
+        ("other", {"entity_id": "light.kitchen", "device_id": "abc"}),
+    ]
+    assert hass.bus.async_listeners()["test"] == 1
+
+    unsubs.pop(0)()
+    assert "test" not in hass.bus.async_listeners()
+
+
+async def test_eventbus_keyed_listener_match_all(hass):
+    """Test match_key can not be used with MATCH_ALL."""
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen(
+            MATCH_ALL, listener, match_key=("entity_id", "light.kitchen")
+        )
+
+
 async def test_eventbus_run_immediately(hass):
     """Test we can call events immediately."""
     calls = []
@@ -517,6 +709,37 @@ async def test_eventbus_run_immediately(hass):
     unsub()
 
 
+async def test_eventbus_listen_during_fire(hass):
+    """Test listeners added while firing do not get the current event."""
+    calls = []
+    added_calls = []
+
+    @ha.callback
+    def added_listener(event):
+        """Mock listener added while firing."""
+        added_calls.append(event)
+
+    @ha.callback
+    def listener(event):
+        """Mock listener adding listeners."""
+        calls.append(event)
+        if len(calls) == 1:
+            hass.bus.async_listen("test", added_listener, run_immediately=True)
+            hass.bus.async_listen_once("test", added_listener)
+
+    hass.bus.async_listen("test", listener, run_immediately=True)
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert added_calls == []
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert len(added_calls) == 2
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -799,6 +1022,22 @@ async def test_statemachine_last_changed_not_updated_on_same_state(hass):
     assert state.last_changed == state2.last_changed
 
 
+async def test_statemachine_reuses_unchanged_attributes(hass):
+    """Test the attributes of the old state are reused when they do not change."""
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    state = hass.states.get("sensor.power")
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    state2 = hass.states.get("sensor.power")
+    assert state2.state == "2"
+    assert state2.attributes is state.attributes
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "kW"})
+    state3 = hass.states.get("sensor.power")
+    assert state3.attributes is not state2.attributes
+    assert state3.attributes == {"unit_of_measurement": "kW"}
+
+
 async def test_statemachine_force_update(hass):
     """Test force update option."""
     hass.states.async_set("light.bowl", "on", {})